@@ -0,0 +1 @@
+"""Benchmarks of the gamma_burst hot paths, see ``conftest.py`` to run them."""
@@ -0,0 +1,59 @@
+"""Shared fixtures of the benchmarks.
+
+Curve lengths go from 1k to 10M points; lengths above
+``GAMMA_BURST_BENCHMARK_MAX_POINTS`` (1M by default) are skipped so that a
+default run fits in memory and in a few minutes.
+
+``pdm run benchmark`` saves the results of the current commit in
+``.benchmarks``, ``pdm run benchmark-compare`` compares a new run with the
+last saved one and fails on a mean slowdown above 10%.
+"""
+
+import os
+from pathlib import Path
+
+import matplotlib
+import pytest
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.cache_manager import CacheManager
+from tests.test_gamma_burst.data import StubSource, make_burst_analyser_data
+
+MAX_POINTS_ENV = 'GAMMA_BURST_BENCHMARK_MAX_POINTS'
+CURVE_LENGTHS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+CATALOG_SIZES = (1, 10, 100)
+
+matplotlib.use('Agg')
+
+
+@pytest.fixture(params=CURVE_LENGTHS, ids=lambda nb_points: f'{nb_points}pts')
+def nb_points(request: pytest.FixtureRequest) -> int:
+    """Length of the finest light curve."""
+    max_points = int(os.environ.get(MAX_POINTS_ENV, '1000000'))
+    if request.param > max_points:
+        pytest.skip(f'{request.param} points above {MAX_POINTS_ENV}={max_points}')
+    return request.param
+
+
+@pytest.fixture(params=CATALOG_SIZES, ids=lambda nb_grbs: f'{nb_grbs}grbs')
+def catalog_size(request: pytest.FixtureRequest) -> int:
+    """Return the number of bursts processed together."""
+    return request.param
+
+
+@pytest.fixture
+def burst_data(nb_points: int) -> dict:
+    """Burst Analyser product whose ``TimeBins_64ms`` binning has ``nb_points`` bins."""
+    return make_burst_analyser_data(nb_points)
+
+
+@pytest.fixture
+def analyser(nb_points: int, tmp_path: Path) -> BurstAnalyser:
+    """Burst analyser whose data are already loaded from its cache."""
+    analyser = BurstAnalyser(
+        'GRB 101225A',
+        client=StubSource(nb_points=nb_points),
+        cache=CacheManager(tmp_path / '.gamma_burst', max_bytes=None),
+    )
+    analyser.burst_analyser_data['BAT']['TimeBins_64ms']['BATBand']
+    return analyser
@@ -0,0 +1,64 @@
+"""Benchmarks of the light curve and spectral computations."""
+
+import numpy as np
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from gamma_burst.burst_analyser import BurstAnalyser, calculate_fft
+from gamma_burst.duration import compute_duration
+from gamma_burst.spectral_models import band, energy_grid, power_law
+from gamma_burst.timing import lomb_scargle_power_spectrum
+
+
+def test_retrieve_time_and_count_rate(benchmark: BenchmarkFixture, analyser: BurstAnalyser, nb_points: int) -> None:
+    """Benchmark the lookup of a time window of the finest binning."""
+    time_scale = (0.0, 0.032 * nb_points)
+    benchmark(analyser.retrieve_time_and_count_rate, 'TimeBins_64ms', time_scale)
+
+
+def test_compute_duration(benchmark: BenchmarkFixture, analyser: BurstAnalyser) -> None:
+    """Benchmark the durations of the finest binning."""
+    benchmark(analyser.compute_duration, 'TimeBins_64ms')
+
+
+def test_compute_duration_catalog(benchmark: BenchmarkFixture, catalog_size: int) -> None:
+    """Benchmark the durations of a catalog of light curves, one at a time."""
+    rng = np.random.default_rng(0)
+    time = np.arange(10_000) * 0.064
+    fluxes = np.exp(-0.5 * ((time - 320) / rng.uniform(5, 50, (catalog_size, 1))) ** 2)
+    benchmark(lambda: [compute_duration(time, flux) for flux in fluxes])
+
+
+def test_calculate_fft(benchmark: BenchmarkFixture, analyser: BurstAnalyser) -> None:
+    """Benchmark the FFT of the finest binning."""
+    time, count_rate = analyser.retrieve_time_and_count_rate('TimeBins_64ms')
+    benchmark(calculate_fft, time, count_rate)
+
+
+def test_lomb_scargle_gapped(benchmark: BenchmarkFixture, nb_points: int) -> None:
+    """Benchmark the power spectrum of a gapped 64 ms light curve."""
+    time = np.arange(nb_points) * 0.064
+    time = time[(time < 0.3 * time[-1]) | (time > 0.4 * time[-1])]
+    rate = np.random.default_rng(0).poisson(6.4, len(time)) / 0.064
+    benchmark(lomb_scargle_power_spectrum, time, rate)
+
+
+def test_power_law_spectra(benchmark: BenchmarkFixture, analyser: BurstAnalyser) -> None:
+    """Benchmark the power law spectra of every bin of the finest binning."""
+    energy = energy_grid(15, 150, 64)
+    benchmark(analyser.compute_spectra, 'TimeBins_64ms', energy, (0.0, 0.064 * 10_000))
+
+
+def test_band_catalog(benchmark: BenchmarkFixture, catalog_size: int) -> None:
+    """Benchmark the Band spectra of a catalog in one call."""
+    rng = np.random.default_rng(0)
+    energy = energy_grid(8, 40_000, 1_000)
+    alpha, beta = rng.uniform(-1.5, -0.5, catalog_size), rng.uniform(-3, -2, catalog_size)
+    epeak = rng.uniform(100, 1_000, catalog_size)
+    benchmark(band, energy, 1.0, alpha, beta, epeak)
+
+
+def test_power_law_catalog(benchmark: BenchmarkFixture, catalog_size: int) -> None:
+    """Benchmark the power law spectra of a catalog in one call."""
+    energy = energy_grid(0.3, 10, 1_000)
+    index = np.linspace(-2.5, -1.5, catalog_size)
+    benchmark(power_law, energy, 1.0, index)
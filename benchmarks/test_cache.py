@@ -0,0 +1,38 @@
+"""Benchmarks of the cache load and save paths."""
+
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from gamma_burst.cache_policy import load_pickle, save_pickle
+from gamma_burst.columnar_store import open_columnar_store, write_columnar_store
+
+
+def test_save_pickle(benchmark: BenchmarkFixture, burst_data: dict, tmp_path: Path) -> None:
+    """Benchmark pickling a Burst Analyser product."""
+    benchmark(save_pickle, burst_data, tmp_path / 'data.pkl')
+
+
+def test_load_pickle(benchmark: BenchmarkFixture, burst_data: dict, tmp_path: Path) -> None:
+    """Benchmark unpickling a Burst Analyser product."""
+    save_pickle(burst_data, tmp_path / 'data.pkl')
+    benchmark(load_pickle, tmp_path / 'data.pkl')
+
+
+def test_write_columnar_store(benchmark: BenchmarkFixture, burst_data: dict, tmp_path: Path) -> None:
+    """Benchmark writing a Burst Analyser product to a columnar store."""
+    benchmark(write_columnar_store, burst_data, tmp_path / 'store')
+
+
+@pytest.mark.parametrize('read_table', [False, True], ids=['open', 'read_table'])
+def test_open_columnar_store(benchmark: BenchmarkFixture, burst_data: dict, tmp_path: Path, read_table: bool) -> None:
+    """Benchmark opening a columnar store, then reading a table if ``read_table``."""
+    write_columnar_store(burst_data, tmp_path / 'store')
+
+    def load() -> None:
+        data = open_columnar_store(tmp_path / 'store')
+        if read_table:
+            data['BAT']['TimeBins_64ms']['BATBand']['Flux'].to_numpy().sum()
+
+    benchmark(load)
@@ -0,0 +1,32 @@
+"""Benchmarks of the plot rendering."""
+
+import io
+
+from matplotlib.figure import Figure
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from gamma_burst.burst_analyser import BurstAnalyser
+
+
+def test_plot_light_curve(benchmark: BenchmarkFixture, analyser: BurstAnalyser) -> None:
+    """Benchmark rendering a light curve of the finest binning."""
+    figure = Figure()
+
+    def render() -> None:
+        figure.clear()
+        analyser.plot_light_curve_binning('TimeBins_64ms', ax=figure.add_subplot())
+        figure.savefig(io.BytesIO(), format='png')
+
+    benchmark.pedantic(render, rounds=3, warmup_rounds=1)
+
+
+def test_plot_cumulated_flux(benchmark: BenchmarkFixture, analyser: BurstAnalyser) -> None:
+    """Benchmark rendering the cumulated flux of the finest binning."""
+    figure = Figure()
+
+    def render() -> None:
+        figure.clear()
+        analyser.plot_time_and_cumulated_flux('TimeBins_64ms', ax=figure.add_subplot())
+        figure.savefig(io.BytesIO(), format='png')
+
+    benchmark.pedantic(render, rounds=3, warmup_rounds=1)
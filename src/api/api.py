@@ -0,0 +1,436 @@
+"""HTTP API serving the light curves, spectra and derived quantities of GRBs.
+
+Started by the Docker image with ``uvicorn api:app --app-dir src/api/``.
+
+Products are loaded once per GRB and kept in a bounded in-process cache, so
+dashboards polling the same bursts only pay the computation of the
+requested window. Loading and computations run in the thread pool, never on
+the event loop. Invalid parameters are answered with a 400 (or 422) error,
+unknown modes, binnings and spectra with a 404 error, and any other failure
+with a 500 error.
+
+Tabular responses are negotiated with the ``Accept`` header:
+
+- ``application/vnd.apache.arrow.stream``: Arrow IPC stream (needs ``pyarrow``),
+- ``application/x-npz``: NumPy ``.npz`` archive, one array per column,
+- anything else: JSON object of columns, gzip-compressed when the client accepts it.
+
+``/metrics`` exports the instrumentation of :mod:`gamma_burst.metrics` as
+Prometheus text, or as a JSON report with ``?format=json``.
+"""
+
+import io
+import math
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Annotated, Any, TypeVar, cast
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from gamma_burst import metrics
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import LightCurve
+from gamma_burst.data_source import DataSource
+from gamma_burst.eumerations import Instrument, ObservationMode, PSDNormalisation
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectra import XRTSpectra
+from gamma_burst.spectral_models import energy_grid, power_law
+from gamma_burst.timing import MIN_SEGMENT_SIZE, WINDOWS
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+CACHE_SIZE_ENV = 'GAMMA_BURST_API_CACHE_SIZE'
+DEFAULT_CACHE_SIZE = 64
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+NPZ_MEDIA_TYPE = 'application/x-npz'
+PROMETHEUS_MEDIA_TYPE = 'text/plain; version=0.0.4'
+
+_Product = TypeVar('_Product', BurstAnalyser, XRTLightCurve, XRTSpectra)
+
+
+class ProductCache:
+    """Bounded LRU cache of the products of every GRB, loading each product once."""
+
+    def __init__(self, client: DataSource | None = None, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Create an empty cache.
+
+        Args:
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            max_size (int): Maximum number of products kept.
+
+        """
+        self.client = client
+        self.max_size = max_size
+        self._products: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, str], threading.Lock] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached products."""
+        return len(self._products)
+
+    def get(self, product_class: type[_Product], grb_name: str) -> _Product:
+        """Product of a GRB, built on first request.
+
+        Concurrent requests of a product being loaded wait for it instead of
+        loading it again.
+
+        Args:
+            product_class (type): ``BurstAnalyser``, ``XRTLightCurve`` or ``XRTSpectra``.
+            grb_name (str): GRB's name.
+
+        """
+        key = (product_class.__name__, grb_name)
+        with self._lock:
+            if key in self._products:
+                self._products.move_to_end(key)
+                return cast(_Product, self._products[key])
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._products:
+                    return cast(_Product, self._products[key])
+            product = product_class(grb_name, client=self.client)
+            with self._lock:
+                self._products[key] = product
+                while len(self._products) > self.max_size:
+                    self._products.popitem(last=False)
+                self._key_locks.pop(key, None)
+        return product
+
+
+def _json_values(values: np.ndarray) -> list:
+    """Array as a JSON list, non-finite floats becoming null."""
+    if values.dtype.kind == 'f' and not np.all(np.isfinite(values)):
+        return np.where(np.isfinite(values), values.astype(object), np.array(None)).tolist()
+    return values.tolist()
+
+
+def _json_value(value: object) -> object:
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+
+def columns_response(columns: dict[str, np.ndarray], accept: str) -> Response:
+    """Encode columns of the same length in the media type accepted by the client.
+
+    Args:
+        columns (dict[str, np.ndarray]): Columns by name.
+        accept (str): ``Accept`` header of the request.
+
+    """
+    if ARROW_MEDIA_TYPE in accept:
+        if pa is None:
+            raise HTTPException(status_code=406, detail='Arrow responses need pyarrow')
+        table = pa.table(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), media_type=ARROW_MEDIA_TYPE)
+    if NPZ_MEDIA_TYPE in accept:
+        buffer = io.BytesIO()
+        np.savez(buffer, allow_pickle=False, **columns)
+        return Response(buffer.getvalue(), media_type=NPZ_MEDIA_TYPE)
+    return JSONResponse({name: _json_values(np.asarray(values)) for name, values in columns.items()})
+
+
+def _light_curve_columns(light_curve: LightCurve, rate_name: str) -> dict[str, np.ndarray]:
+    columns = {
+        'Time': light_curve.time,
+        'TimePos': light_curve.time_pos,
+        'TimeNeg': light_curve.time_neg,
+        rate_name: light_curve.rate,
+        f'{rate_name}Pos': light_curve.rate_pos,
+        f'{rate_name}Neg': light_curve.rate_neg,
+    }
+    return {name: values for name, values in columns.items() if values is not None}
+
+
+def _table_columns(table: pd.DataFrame) -> dict[str, np.ndarray]:
+    return {str(name): table[name].to_numpy() for name in table.columns if table[name].dtype.kind in 'biuf'}
+
+
+def _time_scale(time_start: float | None, time_stop: float | None) -> tuple[float, float] | None:
+    if time_start is None and time_stop is None:
+        return None
+    time_scale = (
+        time_start if time_start is not None else -math.inf,
+        time_stop if time_stop is not None else math.inf,
+    )
+    if time_scale[0] > time_scale[1]:
+        raise HTTPException(status_code=400, detail='time_start should not be after time_stop')
+    return time_scale
+
+
+def _light_curves(products: ProductCache, grb_name: str, dataset: str) -> XRTLightCurve:
+    """XRT light curves of a GRB, 404 error if the dataset (e.g. ``'WT_incbad'``) is missing."""
+    light_curves = products.get(XRTLightCurve, grb_name)
+    if dataset not in light_curves.lc_data:
+        raise HTTPException(status_code=404, detail=f'No {dataset} light curve for {grb_name}')
+    return light_curves
+
+
+def _burst_analyser(products: ProductCache, grb_name: str, binning: str, instrument: Instrument) -> BurstAnalyser:
+    """Burst Analyser of a GRB, 404 error if the binning is missing."""
+    if instrument == Instrument.XRT_Sensor:
+        raise HTTPException(status_code=400, detail='Burst Analyser binnings are only available for BAT')
+    burst_analyser = products.get(BurstAnalyser, grb_name)
+    key_index = burst_analyser.key_index
+    if instrument == Instrument.BAT_Sensor:
+        binnings = key_index.binning_set | key_index.snr_set
+    else:
+        binnings = key_index.binning_no_evolution_set | key_index.snr_no_evolution_set
+    if binning not in binnings:
+        raise HTTPException(status_code=404, detail=f'No {instrument} binning {binning} for {grb_name}')
+    return burst_analyser
+
+
+def get_products(request: Request) -> ProductCache:
+    """Product cache of the application serving a request."""
+    products: ProductCache = request.app.state.products
+    return products
+
+
+Products = Annotated[ProductCache, Depends(get_products)]
+router = APIRouter()
+
+
+async def respond(request: Request, compute: Callable[[], dict[str, np.ndarray]]) -> Response:
+    """Compute columns in the thread pool and encode them in the media type accepted by the client."""
+    accept = request.headers.get('accept', '')
+    return await run_in_threadpool(lambda: columns_response(compute(), accept))
+
+
+@router.get('/health')
+async def health(products: Products) -> dict:
+    """Status of the service and number of cached products."""
+    return {'status': 'ok', 'cached_products': len(products)}
+
+
+@router.get('/metrics')
+async def metrics_report(format: str = 'prometheus') -> Response:
+    """Report the recorded metrics, in the Prometheus text format or as JSON."""
+    if format == 'json':
+        return JSONResponse(metrics.report())
+    if format != 'prometheus':
+        raise HTTPException(status_code=400, detail=f'Unknown metrics format {format}, expected prometheus or json')
+    return PlainTextResponse(metrics.to_prometheus(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+@router.get('/grbs/{grb_name}/light_curves/{mode}')
+async def light_curve(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        mode: ObservationMode,
+        time_start: float | None = None,
+        time_stop: float | None = None
+    ) -> Response:
+    """XRT light curve of a mode."""
+    time_scale = _time_scale(time_start, time_stop)
+
+    def compute() -> dict[str, np.ndarray]:
+        light_curve = _light_curves(products, grb_name, mode + '_incbad').light_curve(mode)
+        return _light_curve_columns(light_curve.window(time_scale), 'Rate')
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/hardness_ratios/{mode}')
+async def hardness_ratio(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        mode: ObservationMode,
+        time_start: float | None = None,
+        time_stop: float | None = None
+    ) -> Response:
+    """XRT hardness ratio of a mode."""
+    time_scale = _time_scale(time_start, time_stop)
+
+    def compute() -> dict[str, np.ndarray]:
+        index = _light_curves(products, grb_name, mode + 'HR_incbad').time_index(mode + 'HR_incbad')
+        return _table_columns(index.window(time_scale))
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/burst_analyser/hardness_ratios')
+async def burst_analyser_hardness_ratio(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        time_start: float | None = None,
+        time_stop: float | None = None
+    ) -> Response:
+    """BAT hardness ratio of the Burst Analyser."""
+    time_scale = _time_scale(time_start, time_stop)
+
+    def compute() -> dict[str, np.ndarray]:
+        burst_analyser = products.get(BurstAnalyser, grb_name)
+        if 'HRData' not in burst_analyser.burst_analyser_data.get(Instrument.BAT_Sensor, {}):
+            raise HTTPException(status_code=404, detail=f'No BAT hardness ratio for {grb_name}')
+        index = burst_analyser.time_index(Instrument.BAT_Sensor, 'HRData')
+        return _table_columns(index.window(time_scale))
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/burst_analyser/binnings/{binning}')
+async def burst_analyser_light_curve(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        binning: str,
+        instrument: Instrument = Instrument.BAT_Sensor,
+        time_start: float | None = None,
+        time_stop: float | None = None
+    ) -> Response:
+    """Burst Analyser light curve of a binning."""
+    time_scale = _time_scale(time_start, time_stop)
+
+    def compute() -> dict[str, np.ndarray]:
+        light_curve = _burst_analyser(products, grb_name, binning, instrument).light_curve(binning, instrument)
+        light_curve = light_curve.window(time_scale)
+        return {**_light_curve_columns(light_curve, 'Flux'), 'CountRate': light_curve.count_rate}
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/spectra/{mode}')
+async def spectrum(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        mode: ObservationMode,
+        e_min: Annotated[float, Query(gt=0)] = 0.3,
+        e_max: float = 10.0,
+        nb_points: Annotated[int, Query(ge=1)] = 200,
+        nb_samples: Annotated[int, Query(ge=0)] = 0,
+        seed: int | None = None
+    ) -> Response:
+    """XRT power law spectrum of a mode, with its error band if ``nb_samples`` > 0."""
+    if e_max <= e_min:
+        raise HTTPException(status_code=400, detail='e_max should be greater than e_min')
+    energy = energy_grid(e_min, e_max, nb_points)
+
+    def compute() -> dict[str, np.ndarray]:
+        spectra = products.get(XRTSpectra, grb_name)
+        power_law_fit = spectra.s_data.get('interval0', {}).get(mode, {}).get('PowerLaw')
+        if power_law_fit is None:
+            raise HTTPException(status_code=404, detail=f'No {mode} power law spectrum for {grb_name}')
+        columns = {'Energy': energy, 'Flux': power_law(energy, power_law_fit['ObsFlux'], -power_law_fit['Gamma'])}
+        if nb_samples > 0:
+            band = spectra.compute_error_band(mode, energy, nb_samples, seed=seed)
+            columns.update(Lower=band.lower, Upper=band.upper)
+        return columns
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/power_spectra/{binning}')
+async def power_spectrum(
+        request: Request,
+        products: Products,
+        *,
+        grb_name: str,
+        binning: str,
+        instrument: Instrument = Instrument.BAT_Sensor,
+        time_start: float | None = None,
+        time_stop: float | None = None,
+        segment_size: Annotated[int | None, Query(ge=MIN_SEGMENT_SIZE)] = None,
+        overlap: Annotated[float, Query(ge=0, lt=1)] = 0.0,
+        window: str | None = None,
+        normalisation: PSDNormalisation = PSDNormalisation.Leahy
+    ) -> Response:
+    """Power spectrum of a Burst Analyser light curve, averaged over segments for time binnings only."""
+    time_scale = _time_scale(time_start, time_stop)
+    if window is not None and window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f'Unknown window {window}, should be in {list(WINDOWS)}')
+
+    def compute() -> dict[str, np.ndarray]:
+        burst_analyser = _burst_analyser(products, grb_name, binning, instrument)
+        if segment_size is not None:
+            if 'TimeBins' not in binning:
+                raise HTTPException(status_code=400, detail='Segment averaging needs a time binning')
+            nb_bins = len(burst_analyser.light_curve(binning, instrument).window(time_scale))
+            if segment_size > nb_bins:
+                raise HTTPException(status_code=400, detail=f'Segment size should be at most {nb_bins} bins')
+        spectrum = burst_analyser.compute_power_spectrum(
+            binning,
+            time_scale,
+            instrument,
+            segment_size=segment_size,
+            overlap=overlap,
+            window=window,
+            normalisation=normalisation,
+        )
+        return {'Frequency': spectrum.frequency, 'Power': spectrum.power, 'PowerErr': spectrum.power_err}
+    return await respond(request, compute)
+
+
+@router.get('/grbs/{grb_name}/durations/{binning}')
+async def duration(
+        products: Products,
+        *,
+        grb_name: str,
+        binning: str,
+        instrument: Instrument = Instrument.BAT_Sensor,
+        time_start: float | None = None,
+        time_stop: float | None = None,
+        nb_samples: Annotated[int, Query(ge=0)] = 0,
+        seed: int | None = None
+    ) -> dict:
+    """T90 and T50 of a Burst Analyser light curve."""
+    time_scale = _time_scale(time_start, time_stop)
+
+    def compute() -> dict:
+        result = _burst_analyser(products, grb_name, binning, instrument).compute_duration(
+            binning, time_scale, instrument, nb_samples, seed
+        )
+        values = {
+            't90': result.t90,
+            't90_start': result.t90_start,
+            't90_stop': result.t90_stop,
+            't90_err': result.t90_err,
+            't50': result.t50,
+            't50_start': result.t50_start,
+            't50_stop': result.t50_stop,
+            't50_err': result.t50_err,
+            'total_fluence': result.total_fluence,
+        }
+        return {name: _json_value(float(value)) for name, value in values.items()}
+    return await run_in_threadpool(compute)
+
+
+def create_app(client: DataSource | None = None, cache_size: int | None = None) -> FastAPI:
+    """Build the API.
+
+    The endpoints of :data:`router` reach the product cache of the
+    application, kept in ``app.state.products``, through :func:`get_products`.
+
+    Args:
+        client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+        cache_size (int | None): Number of products kept in memory, read from
+            ``GAMMA_BURST_API_CACHE_SIZE`` if None.
+
+    """
+    if cache_size is None:
+        cache_size = int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE))
+    app = FastAPI(title='gamma_burst')
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.state.products = ProductCache(client, cache_size)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
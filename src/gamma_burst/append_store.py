@@ -0,0 +1,229 @@
+"""Append-only on-disk store for the light curves of bursts still observed.
+
+Refreshing the light curves of an active burst mostly adds rows after the
+last ingested time. This store keeps every table as a list of parts, each
+part holding one ``.npy`` file per column, and records the last ingested
+time of every table in a JSON state, with a digest of its rows. Merging a
+refresh only writes the new rows as a new part; a table whose past rows
+changed (e.g. a reprocessing at the UKSSDC, even keeping the times and the
+number of rows) no longer matches the digest and is rewritten. Non-table
+values are small and rewritten every time.
+
+:class:`WindowedCache` holds products derived from time windows of the
+tables, so that a refresh only invalidates the ones overlapping new data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import pickle
+import shutil
+from collections.abc import Callable, Hashable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STATE_FILE = 'state.json'
+OBJECTS_FILE = 'objects.pkl'
+TABLES_FOLDER = 'tables'
+STORE_VERSION = 1
+MAX_PARTS = 32
+
+_T = TypeVar('_T')
+
+
+def _read_state(folder_path: Path) -> dict:
+    state_file = folder_path / STATE_FILE
+    if not state_file.exists():
+        return {'version': STORE_VERSION, 'tables': {}}
+    with open(state_file) as f:
+        state = json.load(f)
+    if state['version'] != STORE_VERSION:
+        raise ValueError(f"Unsupported append-only store version {state['version']} in {folder_path}")
+    return state
+
+
+def _write_state(folder_path: Path, state: dict) -> None:
+    tmp_path = folder_path / f'.{STATE_FILE}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    tmp_path.replace(folder_path / STATE_FILE)
+
+
+def _rows_digest(table: pd.DataFrame) -> str:
+    """Digest of the values of the rows of a table, in order, whatever its index."""
+    import pandas as pd  # noqa: PLC0415
+    hashes = pd.util.hash_pandas_object(table, index=False).to_numpy()
+    return hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def _write_part(table_path: Path, part: int, table: pd.DataFrame) -> str:
+    part_name = f'p{part}'
+    part_path = table_path / part_name
+    if part_path.exists():
+        shutil.rmtree(part_path)
+    part_path.mkdir(parents=True)
+    for idx, column in enumerate(table.columns):
+        values = table[column].to_numpy()
+        np.save(part_path / f'c{idx}.npy', values, allow_pickle=values.dtype.hasobject)
+    return part_name
+
+
+def _read_table(table_path: Path, entry: dict) -> pd.DataFrame:
+    import pandas as pd  # noqa: PLC0415
+    columns = {}
+    for idx, column in enumerate(entry['columns']):
+        parts = [np.load(table_path / part / f'c{idx}.npy', allow_pickle=True) for part in entry['parts']]
+        columns[column] = np.concatenate(parts) if len(parts) > 1 else parts[0]
+    return pd.DataFrame(columns, copy=False)
+
+
+def _rewrite_table(table_path: Path, table: pd.DataFrame, time_column: str) -> dict:
+    if table_path.exists():
+        shutil.rmtree(table_path)
+    table = table.reset_index(drop=True)
+    time = table[time_column].to_numpy(dtype=float)
+    return {
+        'columns': [str(column) for column in table.columns],
+        'parts': [_write_part(table_path, 0, table)],
+        'nb_parts_written': 1,
+        'nb_rows': len(table),
+        'last_time': float(time.max()) if len(time) else -math.inf,
+        'digest': _rows_digest(table),
+    }
+
+
+def append_tables(data: Mapping, folder_path: Path, time_column: str = 'Time') -> dict[str, float]:
+    """Merge fresh light curve data into a store, writing only the new rows.
+
+    Args:
+        data (Mapping): Light curve dictionary as returned by ``udg.getLightCurves``.
+        folder_path (Path): Store folder, created if missing.
+        time_column (str): Column holding the times of the tables.
+
+    Returns:
+        dict[str, float]: Earliest changed time of every table with new or
+            modified rows, ``-inf`` for tables rewritten from their start.
+
+    """
+    import pandas as pd  # noqa: PLC0415
+    folder_path.mkdir(parents=True, exist_ok=True)
+    state = _read_state(folder_path)
+    tables = {key: value for key, value in data.items() if isinstance(value, pd.DataFrame) and time_column in value}
+    objects = {key: value for key, value in data.items() if key not in tables}
+    changes: dict[str, float] = {}
+
+    for name, table in tables.items():
+        table_path = folder_path / TABLES_FOLDER / name
+        entry = state['tables'].get(name)
+        time = table[time_column].to_numpy(dtype=float)
+        if entry is not None:
+            is_new = time > entry['last_time']
+            append_only = (
+                [str(column) for column in table.columns] == entry['columns']
+                and int(np.count_nonzero(~is_new)) == entry['nb_rows']
+                and np.all(np.diff(time) >= 0)
+                and _rows_digest(table.loc[~is_new]) == entry.get('digest')
+            )
+            if append_only:
+                if not is_new.any():
+                    continue
+                new_rows = table.loc[is_new]
+                entry['parts'].append(_write_part(table_path, entry['nb_parts_written'], new_rows))
+                entry['nb_parts_written'] += 1
+                entry['nb_rows'] += len(new_rows)
+                entry['last_time'] = float(time[is_new].max())
+                entry['digest'] = _rows_digest(table)
+                changes[name] = float(time[is_new].min())
+                if len(entry['parts']) > MAX_PARTS:
+                    state['tables'][name] = _rewrite_table(table_path, _read_table(table_path, entry), time_column)
+                continue
+        state['tables'][name] = _rewrite_table(table_path, table, time_column)
+        changes[name] = -math.inf
+
+    for name in set(state['tables']) - set(tables):
+        shutil.rmtree(folder_path / TABLES_FOLDER / name, ignore_errors=True)
+        del state['tables'][name]
+        changes[name] = -math.inf
+
+    tmp_path = folder_path / f'.{OBJECTS_FILE}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(objects, f)
+    tmp_path.replace(folder_path / OBJECTS_FILE)
+    _write_state(folder_path, state)
+    return changes
+
+
+def open_append_store(folder_path: Path) -> dict:
+    """Read every table and value of a store into a light curve dictionary."""
+    state = _read_state(folder_path)
+    if not state['tables'] and not (folder_path / OBJECTS_FILE).exists():
+        raise FileNotFoundError(f'No append-only store in {folder_path}')
+    with open(folder_path / OBJECTS_FILE, 'rb') as f:
+        data = pickle.load(f)  # noqa: S301
+    for name, entry in state['tables'].items():
+        data[name] = _read_table(folder_path / TABLES_FOLDER / name, entry)
+    return data
+
+
+def last_times(folder_path: Path) -> dict[str, float]:
+    """Last ingested time of every table of a store."""
+    return {name: entry['last_time'] for name, entry in _read_state(folder_path)['tables'].items()}
+
+
+class WindowedCache:
+    """Products derived from a time window of a table, invalidated by new rows in the window."""
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._entries: dict[tuple[str, tuple[float, float] | None, Hashable], Any] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached products."""
+        return len(self._entries)
+
+    def get(
+            self,
+            table: str,
+            time_scale: tuple[float, float] | None,
+            key: Hashable,
+            compute: Callable[[], _T],
+        ) -> _T:
+        """Serve a derived product, computing it on first access.
+
+        Args:
+            table (str): Table the product is derived from (e.g. ``'WT_incbad'``).
+            time_scale (tuple[float, float] | None): Time window used, the whole table if None.
+            key (Hashable): Product and parameters.
+            compute (Callable): Compute the product.
+
+        """
+        cache_key = (table, time_scale, key)
+        if cache_key not in self._entries:
+            self._entries[cache_key] = compute()
+        return self._entries[cache_key]
+
+    def invalidate(self, table: str, start: float = -math.inf) -> int:
+        """Drop the products of a table whose window reaches data changed from ``start``.
+
+        Returns:
+            int: Number of dropped products.
+
+        """
+        stale = [
+            cache_key for cache_key in self._entries
+            if cache_key[0] == table and (cache_key[1] is None or cache_key[1][1] >= start)
+        ]
+        for cache_key in stale:
+            del self._entries[cache_key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every product."""
+        self._entries.clear()
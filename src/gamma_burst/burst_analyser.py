@@ -0,0 +1,922 @@
+"""BurstAnalyser class."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from gamma_burst import metrics
+from gamma_burst.cache_manager import CacheManager, get_cache_manager
+from gamma_burst.cache_policy import CachePolicy, load_pickle
+from gamma_burst.columnar_store import is_columnar_store, open_columnar_store, write_columnar_store
+from gamma_burst.containers import LightCurve, SpectralSeries
+from gamma_burst.data_source import UKSSDC_SOURCE, DataSource, cache_params, get_data_source, source_id
+from gamma_burst.duration import DurationResult, compute_duration
+from gamma_burst.eumerations import HardnessMethod, Instrument, ProductType, PSDNormalisation, RebinMethod
+from gamma_burst.fitting import BAND_ENERGIES
+from gamma_burst.hardness import photon_index_hardness_ratios
+from gamma_burst.rebinning import rebin
+from gamma_burst.rendering import get_axes, get_subplots, show_figures
+from gamma_burst.spectral_models import energy_grid, power_law
+from gamma_burst.time_index import TimeIndex
+from gamma_burst.timing import PowerSpectrum, check_uniform_sampling, power_spectrum
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+
+@dataclass(frozen=True)
+class BurstKeyIndex:
+    """Catalog of the binnings available for a burst.
+
+    The index is persisted next to the cached data so that listing or
+    validating binnings never requires opening the data itself.
+    """
+
+    snr: tuple[str, ...] = ()
+    binning: tuple[str, ...] = ()
+    binning_no_evolution: tuple[str, ...] = ()
+    snr_no_evolution: tuple[str, ...] = ()
+
+    @classmethod
+    def from_data(cls, burst_analyser_data: Mapping) -> BurstKeyIndex:
+        """Build the index from the (lazy) burst analyser data."""
+        bat_data = burst_analyser_data.get(Instrument.BAT_Sensor, {})
+        no_evolution_binning = burst_analyser_data.get(Instrument.BAT_Sensor_NoEvolution, {}).get('Binning', [])
+        return cls(
+            snr=tuple(key for key in bat_data if 'SNR' in key),
+            binning=tuple(key for key in bat_data.get('Binning', []) if 'TimeBins' in key),
+            binning_no_evolution=tuple(key for key in no_evolution_binning if 'TimeBins' in key),
+            snr_no_evolution=tuple(key for key in no_evolution_binning if 'SNR' in key),
+        )
+
+    @classmethod
+    def load(cls, file_path: Path) -> BurstKeyIndex:
+        """Load a persisted index."""
+        with open(file_path) as f:
+            return cls(**{key: tuple(value) for key, value in json.load(f).items()})
+
+    def save(self, file_path: Path) -> None:
+        """Persist the index."""
+        with open(file_path, 'w') as f:
+            json.dump(asdict(self), f)
+
+    @cached_property
+    def snr_set(self) -> frozenset[str]:
+        """SNR binnings, as a set."""
+        return frozenset(self.snr)
+
+    @cached_property
+    def binning_set(self) -> frozenset[str]:
+        """Time binnings, as a set."""
+        return frozenset(self.binning)
+
+    @cached_property
+    def binning_no_evolution_set(self) -> frozenset[str]:
+        """Time binnings without spectral evolution, as a set."""
+        return frozenset(self.binning_no_evolution)
+
+    @cached_property
+    def snr_no_evolution_set(self) -> frozenset[str]:
+        """SNR binnings without spectral evolution, as a set."""
+        return frozenset(self.snr_no_evolution)
+
+
+class BurstAnalyser:
+
+    def __init__(
+            self,
+            grb_name: str,
+            client: DataSource | None = None,
+            policy: CachePolicy | None = None,
+            cache: CacheManager | None = None
+        ) -> None:
+        """Create a burst analyser.
+
+        Nothing is read or downloaded here: data and available binnings are
+        recovered on first use.
+
+        Args:
+            grb_name (str): GRB's name.
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            policy (CachePolicy | None): Cache freshness policy, read from the environment if None.
+            cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+
+        """
+        self.grb_name: str = grb_name
+        self.client = client if client is not None else get_data_source()
+        self.policy = policy
+        self.cache = cache if cache is not None else get_cache_manager()
+        self._time_indexes: dict[tuple[str, ...], TimeIndex] = {}
+        self._light_curves: dict[tuple[str, str, str], LightCurve] = {}
+        self._spectral_series: dict[tuple[str, str, str], SpectralSeries] = {}
+
+    @cached_property
+    def burst_analyser_data(self) -> Mapping:
+        """Burst Analyser product, recovered on first use."""
+        return self.recover_burst_analyser_data()
+
+    @cached_property
+    def key_index(self) -> BurstKeyIndex:
+        """Available binnings, read from the persisted index when possible."""
+        index_file = self.cache_folder() / 'key_index.json'
+        if index_file.exists():
+            return BurstKeyIndex.load(index_file)
+        key_index = BurstKeyIndex.from_data(self.burst_analyser_data)
+        key_index.save(index_file)
+        return key_index
+
+    @cached_property
+    def available_SNR_data(self) -> list:
+        """Available SNR binnings."""
+        return self.get_available_SNR()
+
+    @cached_property
+    def available_binning_data(self) -> list:
+        """Available time binnings."""
+        return self.get_available_binning()
+
+    @cached_property
+    def available_binning_data_no_evolution(self) -> list:
+        """Available time binnings without spectral evolution."""
+        return self.get_available_binning_no_evolution()
+
+    @cached_property
+    def available_SNR_data_no_evolution(self) -> list:
+        """Available SNR binnings without spectral evolution."""
+        return self.get_available_SNR_no_evolution()
+
+    def request_params(self) -> dict:
+        """Parameters of the burst analyser request, which identify its cache entry."""
+        return {'GRBName': self.grb_name, 'returnData': True, 'saveData': True}
+
+    def cache_entry(self) -> str:
+        """Version of the served data, recovered first, see :meth:`CacheManager.entry_version`."""
+        if 'burst_analyser_data' not in self.__dict__:
+            self.recover_burst_analyser_data()
+        params = cache_params(self.request_params(), self.client)
+        return self.cache.entry_version(ProductType.Burst_Analyser, params, 'store')
+
+    def cache_folder(self) -> Path:
+        """Folder holding the cached data of this burst."""
+        return self.cache.entry_path(ProductType.Burst_Analyser, cache_params(self.request_params(), self.client))
+
+    def recover_burst_analyser_data(self) -> Mapping:
+        """Recover burst analyser data.
+
+        Data are cached as a columnar store (one file per table column plus a
+        manifest), so only the tables actually used are read from disk.
+        A legacy ``burst_analyser.pkl`` cache, only written by the live
+        UKSSDC, is converted on first use.
+
+        Args:
+            grb_name (str): GRB's name.
+        """
+        folder_path = self.cache_folder()
+        store_path = folder_path / 'store'
+        legacy_cache_file = self.cache.root / self.grb_name / 'burst_analyser' / 'burst_analyser.pkl'
+        is_live = source_id(self.client) == UKSSDC_SOURCE
+        if is_live and legacy_cache_file.exists() and not is_columnar_store(store_path):
+            write_columnar_store(load_pickle(legacy_cache_file), store_path)
+            legacy_cache_file.unlink()
+
+        def save(burst_data: Mapping, path: Path) -> None:
+            write_columnar_store(burst_data, path)
+            (folder_path / 'key_index.json').unlink(missing_ok=True)
+
+        params = self.request_params()
+        burst_data = self.cache.load_or_fetch(
+            product=ProductType.Burst_Analyser,
+            params=cache_params(params, self.client),
+            file_name='store',
+            fetch=lambda entry_path: self.client.getBurstAnalyser(
+                **params, destDir=str(entry_path / 'files'), silent=False
+            ),
+            load=open_columnar_store,
+            save=save,
+            policy=self.policy,
+        )
+        self.burst_analyser_data = burst_data
+        return burst_data
+
+    def print_fields(self, instrument: Instrument):
+        import pandas as pd  # noqa: PLC0415
+        for key in self.burst_analyser_data[instrument]:
+            data = self.burst_analyser_data[instrument][key]
+            if isinstance(data, pd.DataFrame):
+                print(f"Dataset {key} : {data.columns}")
+            else:
+                print(f"{key}")
+    
+    def get_available_SNR(self)->list:
+        """Print available binning. Only available for BAT."""
+        return list(self.key_index.snr)
+    
+    def get_available_binning(self)->list:
+        """Print available binning. Only available for BAT."""
+        return list(self.key_index.binning)
+    
+    def get_available_binning_no_evolution(self)->list:
+        """Print available binning. Only available for BAT."""
+        return list(self.key_index.binning_no_evolution)
+
+    def get_available_SNR_no_evolution(self)->list:
+        """Print available binning. Only available for BAT."""
+        return list(self.key_index.snr_no_evolution)
+    
+    def time_index(self, *path: str) -> TimeIndex:
+        """Time index of a table of the burst analyser data, built once per table.
+
+        Args:
+            *path (str): Keys of the table, e.g. ``('BAT', 'SNR4', 'BATBand')`` or ``('BAT', 'HRData')``.
+
+        """
+        if path not in self._time_indexes:
+            table = self.burst_analyser_data
+            for key in path:
+                table = table[key]
+            with metrics.timer('gamma_burst_conversion_seconds', kind='time_index'):
+                self._time_indexes[path] = TimeIndex(table)
+        return self._time_indexes[path]
+
+    def light_curve(
+            self,
+            filter: str,
+            instrument: Instrument = Instrument.BAT_Sensor,
+            dtype: type = np.float64
+        ) -> LightCurve:
+        """BATBand light curve of a binning, built once per binning and precision.
+
+        The no evolution data use their single observed flux ECF.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_64ms'`` or ``'SNR4'``).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+            dtype (type): Precision of the columns other than time.
+
+        """
+        key = (instrument, filter, np.dtype(dtype).str)
+        if key not in self._light_curves:
+            table = self.time_index(instrument, filter, 'BATBand').table
+            ecf = None
+            if instrument == Instrument.BAT_Sensor_NoEvolution:
+                ecf = self.burst_analyser_data[Instrument.BAT_Sensor_NoEvolution]['ECFs']['ObservedFlux']
+            with metrics.timer('gamma_burst_conversion_seconds', kind='light_curve'):
+                self._light_curves[key] = LightCurve.from_bat_band(table, dtype, ecf=ecf)
+        return self._light_curves[key]
+
+    def spectral_series(
+            self,
+            filter: str,
+            dtype: type = np.float64,
+            instrument: Instrument = Instrument.BAT_Sensor,
+        ) -> SpectralSeries:
+        """Power law parameters of every BATBand bin of a binning, built once per binning and precision."""
+        key = (instrument, filter, np.dtype(dtype).str)
+        if key not in self._spectral_series:
+            table = self.time_index(instrument, filter, 'BATBand').table
+            with metrics.timer('gamma_burst_conversion_seconds', kind='spectral_series'):
+                self._spectral_series[key] = SpectralSeries.from_table(table, dtype)
+        return self._spectral_series[key]
+
+    def rebin_light_curve(
+            self,
+            method: RebinMethod,
+            filter: str = 'TimeBins_64ms',
+            time_scale: tuple[float, float] | None = None,
+            instrument: Instrument = Instrument.BAT_Sensor,
+            *,
+            bin_size: float | None = None,
+            min_snr: float | None = None,
+            p0: float = 0.05,
+        ) -> LightCurve:
+        """Rebin a binning locally, see :func:`rebinning.rebin`.
+
+        Args:
+            method (RebinMethod): Rebinning method.
+            filter (str): Binning to rebin, the finest one by default.
+            time_scale (tuple[float, float] | None): Time window (start, stop).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+            bin_size (float | None): Duration of the new bins in seconds, ``RebinMethod.Fixed`` only.
+            min_snr (float | None): Minimum signal to noise ratio of every bin, ``RebinMethod.Min_SNR`` only.
+            p0 (float): False alarm probability of a change point, ``RebinMethod.Bayesian_Blocks`` only.
+
+        """
+        light_curve = self.light_curve(filter, instrument)
+        return rebin(light_curve, method, bin_size=bin_size, min_snr=min_snr, p0=p0, time_scale=time_scale)
+
+    def hardness_ratios(
+            self,
+            filters: Iterable[str] = ('TimeBins_64ms',),
+            method: HardnessMethod = HardnessMethod.Ratio,
+            min_snr: float | None = None,
+            time_scale: tuple[float, float] | None = None,
+            instrument: Instrument = Instrument.BAT_Sensor,
+        ) -> dict[str, LightCurve]:
+        """Ratio of the BAT band flux to the XRT band flux of binnings.
+
+        The XRT band of the BAT data is extrapolated with the photon index of
+        every bin, so this ratio follows the spectral evolution of the burst.
+        Both bands carry the same noise: the ratio and its errors are derived
+        from the photon index, see :func:`hardness.photon_index_hardness_ratios`.
+
+        Args:
+            filters (Iterable[str]): Binnings (e.g. ``'TimeBins_64ms'`` or ``'SNR4'``).
+            method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+            min_snr (float | None): Signal to noise ratio of the BAT band in every bin, the binning if None.
+            time_scale (tuple[float, float] | None): Time window (start, stop).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+
+        """
+        bands = {
+            filter: (self.light_curve(filter, instrument), self.spectral_series(filter, instrument=instrument))
+            for filter in filters
+        }
+        return photon_index_hardness_ratios(
+            bands,
+            BAND_ENERGIES['XRTBand'],
+            BAND_ENERGIES['BATBand'],
+            method=method,
+            min_snr=min_snr,
+            time_scale=time_scale,
+        )
+
+    def retrieve_time_and_count_rate(self, filter: str, time_scale : tuple[float, float] | None = None)->tuple:
+        """Time and count rate of a binning of the BAT light curve.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_1s'`` or ``'SNR4'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+
+        Returns:
+            tuple: (time in s, count rate in cts/s).
+
+        """
+        light_curve = self.light_curve(filter).window(time_scale)
+        return (light_curve.time, light_curve.count_rate)
+    
+    def retrieve_time_and_count_rate_no_evolution(
+            self,
+            filter: str,
+            time_scale : tuple[float, float] | None = None,
+        ) -> tuple:
+        """Time and count rate of a binning of the BAT light curve without spectral evolution.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_1s'`` or ``'SNR4'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+
+        Returns:
+            tuple: (time in s, count rate in cts/s).
+
+        """
+        if filter not in self.key_index.binning_no_evolution_set | self.key_index.snr_no_evolution_set:
+            raise ValueError('Wrong Binning')
+        
+        light_curve = self.light_curve(filter, Instrument.BAT_Sensor_NoEvolution).window(time_scale)
+        return (light_curve.time, light_curve.count_rate)
+
+
+    def compute_duration(
+            self,
+            filter: str,
+            time_scale : tuple[float, float] | None = None,
+            instrument: Instrument = Instrument.BAT_Sensor,
+            nb_samples: int = 0,
+            seed: int | None = None,
+        ) -> DurationResult:
+        """Compute the cumulative fluence, T90 and T50 of one binning.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_64ms'`` or ``'SNR4'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+            nb_samples (int): Number of Monte Carlo samples used for the uncertainties.
+            seed (int | None): Seed of the random generator.
+
+        """
+        light_curve = self.light_curve(filter, instrument).window(time_scale)
+        return compute_duration(
+            light_curve.time,
+            light_curve.rate,
+            flux_err=light_curve.error,
+            widths=light_curve.width,
+            nb_samples=nb_samples,
+            seed=seed,
+        )
+
+    def compute_durations(
+            self,
+            time_scale : tuple[float, float] | None = None,
+            instrument: Instrument = Instrument.BAT_Sensor,
+            nb_samples: int = 0,
+            seed: int | None = None,
+        ) -> dict[str, DurationResult]:
+        """Compute the durations of every binning (time bins and SNR) of the burst.
+
+        Args:
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+            nb_samples (int): Number of Monte Carlo samples used for the uncertainties.
+            seed (int | None): Seed of the random generator.
+
+        Returns:
+            dict[str, DurationResult]: Durations by binning.
+
+        """
+        if instrument == Instrument.BAT_Sensor:
+            binnings = self.key_index.binning + self.key_index.snr
+        else:
+            binnings = self.key_index.binning_no_evolution + self.key_index.snr_no_evolution
+        return {
+            binning: self.compute_duration(binning, time_scale, instrument, nb_samples, seed)
+            for binning in binnings
+        }
+
+    def compute_power_spectrum(
+            self,
+            filter: str,
+            time_scale : tuple[float, float] | None = None,
+            instrument: Instrument = Instrument.BAT_Sensor,
+            *,
+            segment_size: int | None = None,
+            overlap: float = 0.0,
+            window: str | None = None,
+            normalisation: PSDNormalisation = PSDNormalisation.Leahy,
+        ) -> PowerSpectrum:
+        """Compute the power spectrum of the count rate of one binning.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_64ms'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``.
+            segment_size (int | None): Number of bins of each averaged segment, see :func:`timing.power_spectrum`.
+            overlap (float): Fraction of a segment shared with the next one.
+            window (str | None): Window applied to each segment.
+            normalisation (PSDNormalisation): Normalisation of the power.
+
+        """
+        if instrument == Instrument.BAT_Sensor:
+            time, count_rate = self.retrieve_time_and_count_rate(filter, time_scale)
+        else:
+            time, count_rate = self.retrieve_time_and_count_rate_no_evolution(filter, time_scale)
+        return power_spectrum(
+            np.asarray(time, dtype=float),
+            np.asarray(count_rate, dtype=float),
+            segment_size=segment_size,
+            overlap=overlap,
+            window=window,
+            normalisation=normalisation,
+        )
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_time_and_cumulated_flux(
+            self,
+            filter: str,
+            time_scale : tuple[float, float] | None = None,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the cumulated fluence of a binning, with its T90 and T50.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_1s'`` or ``'SNR4'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        result = self.compute_duration(filter, time_scale, Instrument.BAT_Sensor)
+        return self._plot_cumulated_flux(result, filter, ax)
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_time_and_cumulated_flux_no_evolution(
+            self,
+            filter: str,
+            time_scale : tuple[float, float] | None = None,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the cumulated fluence of a binning without spectral evolution, with its T90 and T50.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_1s'`` or ``'SNR4'``).
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        result = self.compute_duration(filter, time_scale, Instrument.BAT_Sensor_NoEvolution)
+        return self._plot_cumulated_flux(result, filter, ax)
+
+    def _plot_cumulated_flux(self, result: DurationResult, filter: str, ax: Axes | None = None) -> Axes:
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(result.time, 100 * result.cumulated_fraction, label='Cumulated fluence')
+        ax.axvspan(result.t90_start, result.t90_stop, alpha=0.2, label=f'T90 = {result.t90:.3f}s')
+        ax.axvspan(result.t50_start, result.t50_stop, alpha=0.2, color='orange', label=f'T50 = {result.t50:.3f}s')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Percentage of cumulated flux emitted in %')
+        ax.set_title(
+            f'Time vs Percentage of flux emitted {filter} '
+            f'(total fluence = {result.total_fluence:.3e}erg cm-2) (15keV to 150keV)'
+        )
+        ax.legend()
+        ax.grid(True)
+        if show:
+            show_figures()
+        return ax
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_snr(
+            self,
+            snr: str,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the BAT light curve of a SNR binning.
+
+        Args:
+            snr (str): Binning, one of ``key_index.snr_set``.
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Unused, no error is plotted yet.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        if snr not in self.key_index.snr_set:
+            raise ValueError('Wrong SNR')
+        time, count_rate = self.retrieve_time_and_count_rate(snr,time_scale )
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, count_rate, label='BATBand')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Rate (cts/s)')
+        ax.set_title(f'Light Curve for {self.grb_name}, {snr} (15keV to 150keV) nb_data = {len(count_rate)}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+    
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_binning(
+            self,
+            binning: str,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the BAT light curve of a time binning.
+
+        Args:
+            binning (str): Binning, one of ``key_index.binning_set``.
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Unused, no error is plotted yet.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        if binning not in self.key_index.binning_set:
+            raise ValueError('Wrong Binning')
+        time, count_rate = self.retrieve_time_and_count_rate(binning,time_scale )
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, count_rate, label=f'{binning}')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Rate (cts/s)')
+        ax.set_title(f'Light Curve for {self.grb_name}, {binning} (15keV to 150keV)')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_binning_no_evolution(self,binning: str, ax: Axes | None = None) -> Axes:
+        """Plot the BAT light curve of a time binning without spectral evolution.
+
+        Args:
+            binning (str): Binning, one of ``key_index.binning_no_evolution_set``.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        if binning not in self.key_index.binning_no_evolution_set:
+            raise ValueError('Wrong Binning')
+        
+        time, observed_flux_rate = self.retrieve_time_and_count_rate_no_evolution(binning)
+
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, observed_flux_rate, label=f'{binning}')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Rate (cts/s)')
+        ax.set_title(
+            f'Light Curve for {self.grb_name}, {binning} (15keV to 150keV) nb_point = {len(observed_flux_rate)}'
+        )
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_SNR_no_evolution(self,snr: str, ax: Axes | None = None) -> Axes:
+        """Plot the BAT light curve of an SNR binning without spectral evolution.
+
+        Args:
+            snr (str): Binning, one of ``key_index.snr_no_evolution_set``.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        if snr not in self.key_index.snr_no_evolution_set:
+            raise ValueError('Wrong Binning')
+        
+        time, observed_flux_rate = self.retrieve_time_and_count_rate_no_evolution(snr)
+
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, observed_flux_rate, label=f'{snr}')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Rate (cts/s)')
+        ax.set_title(f'Light Curve for {self.grb_name}, {snr} (15keV to 150keV)')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_hr(
+            self,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the BAT hardness ratio over time.
+
+        Args:
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Unused, no error is plotted yet.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        index = self.time_index(Instrument.BAT_Sensor, 'HRData')
+        time = index.column('Time', time_scale)
+        hr = index.column('HR', time_scale)
+
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, hr, label='HR')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Hardness Ratio')
+        ax.set_title(f'HR. Mean value = {np.mean(hr)} (15keV to 150keV) nb_data = {len(hr)}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_gamma(
+            self,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the BAT photon index over time.
+
+        Args:
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Unused, no error is plotted yet.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        index = self.time_index(Instrument.BAT_Sensor, 'HRData')
+        time = index.column('Time', time_scale)
+        gamma = index.column('Gamma', time_scale)
+
+        ax, show = get_axes(ax, figsize=(10, 6))
+        ax.plot(time, gamma, label='Gamma')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Gamma')
+        ax.set_title(f'Gamma. Mean value = {np.mean(gamma):.3f} (15keV to 150keV)')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def subplot_all_binning_lc(
+            self,
+            time_scale: tuple[float, float] | None = None,
+            fig: Figure | None = None,
+        ) -> Figure:
+        """Trace les light curves pour tous les types de binning disponibles dans une grille de subplots.
+        
+        Args:
+            time_scale (tuple[float, float], optional): Intervalle de temps à tracer (start, stop).
+            fig (Figure, optional): Figure sur laquelle tracer, une nouvelle figure affichée si None.
+
+        """
+        nb_plot = len(self.available_binning_data)
+        if nb_plot < 1:
+            raise ValueError("No available data.")
+        
+        ncols = 2
+        nrows = int(np.ceil(nb_plot / ncols))
+        fig, axs, show = get_subplots(fig, nrows, ncols, figsize=(15, 5 * nrows))
+        for idx, binning in enumerate(self.available_binning_data):
+            time, count_rate = self.retrieve_time_and_count_rate(binning, time_scale)
+            axs[idx].plot(time, count_rate, 'o-', label=f'{binning}', markersize=4)
+            axs[idx].set_xlabel('Time (s)')
+            axs[idx].set_ylabel('Rate (cts/s)')
+            axs[idx].set_title(f'Light Curve for {self.grb_name}, {binning} (15keV to 150keV)')
+            axs[idx].legend()
+            axs[idx].grid(True)
+        for j in range(idx + 1, len(axs)):
+            fig.delaxes(axs[j])
+        fig.tight_layout()
+        if show:
+            show_figures()
+        return fig
+    
+    @metrics.timed('gamma_burst_plot_seconds')
+    def subplot_all_snr_lc(self, time_scale: tuple[float, float] | None = None, fig: Figure | None = None) -> Figure:
+        """Trace les light curves pour tous les types de binning disponibles dans une grille de subplots.
+        
+        Args:
+            time_scale (tuple[float, float], optional): Intervalle de temps à tracer (start, stop).
+            fig (Figure, optional): Figure sur laquelle tracer, une nouvelle figure affichée si None.
+
+        """
+        nb_plot = len(self.available_SNR_data)
+        if nb_plot < 1:
+            raise ValueError("No available data.")
+        
+        ncols = 2
+        nrows = int(np.ceil(nb_plot / ncols))
+        fig, axs, show = get_subplots(fig, nrows, ncols, figsize=(10, 5 * nrows))
+        for idx, binning in enumerate(self.available_SNR_data):
+            time, count_rate = self.retrieve_time_and_count_rate(binning, time_scale)
+            axs[idx].plot(time, count_rate, 'o-', label=f'{binning}', markersize=4)
+            axs[idx].set_xlabel('Time (s)')
+            axs[idx].set_ylabel('Rate (cts/s)')
+            axs[idx].set_title(f'Light Curve for {self.grb_name}, {binning} (15keV to 150keV)')
+            axs[idx].legend()
+            axs[idx].grid(True)
+        for j in range(idx + 1, len(axs)):
+            fig.delaxes(axs[j])
+        fig.tight_layout()
+        if show:
+            show_figures()
+        return fig
+
+    def compute_spectra(
+            self,
+            filter: str,
+            energy: np.ndarray,
+            time_scale: tuple[float, float] | None = None,
+        ) -> np.ndarray:
+        """Evaluate the power law spectrum of every bin of a binning in one call.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_64ms'`` or ``'SNR4'``).
+            energy (np.ndarray): Energies in keV.
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+
+        Returns:
+            np.ndarray: Count rate spectra in cts/s/kev, shape (nb_bins, nb_energies).
+
+        """
+        return self.spectral_series(filter).window(time_scale).spectra(energy)
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_spectra(
+            self,
+            filter: str,
+            energy_scale_kev: tuple[float, float],
+            *,
+            nb_points: int = 200,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the power law spectrum of a binning, averaged over its time bins.
+
+        Args:
+            filter (str): Binning (e.g. ``'TimeBins_1s'`` or ``'SNR4'``).
+            energy_scale_kev (tuple[float, float]): Energy range in keV.
+            nb_points (int): Number of log-spaced energies.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        series = self.spectral_series(filter)
+        gamma_mean = np.mean(series.gamma)
+        flux_mean = np.mean(series.flux)
+        ecf_mean = np.mean(series.ecf)
+        energy = energy_grid(energy_scale_kev[0], energy_scale_kev[1], nb_points)
+        count = power_law(energy, flux_mean/ecf_mean, -gamma_mean)
+        ax, show = get_axes(ax)
+        ax.plot(energy, count, label=filter)
+        ax.set_xlabel('Energy (kev)')
+        ax.set_ylabel('Flux (cts/s/kev)')
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_title(f'Spectra for {self.grb_name}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+
+def calculate_fft(time, counts):
+    """Calcule l'amplitude de la transformée de Fourier (réelle) des comptages de photons.
+
+    Voir ``gamma_burst.timing.power_spectrum`` pour des spectres de puissance normalisés
+    et pour les courbes de lumière à échantillonnage non uniforme.
+    
+    Args:
+        time (list or numpy.ndarray): Liste des temps, uniformément échantillonnés.
+        counts (list or numpy.ndarray): Liste des comptages de photons.
+        
+    Returns:
+        tuple: (fréquences en Hz, magnitude de la FFT)
+
+    """
+    time = np.asarray(time, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    if not check_uniform_sampling(time):
+        raise ValueError('Non uniform sampling, use gamma_burst.timing.power_spectrum instead')
+
+    delta_t = time[1] - time[0]
+    frequencies = np.fft.rfftfreq(len(counts), d=delta_t)
+    magnitude = np.abs(np.fft.rfft(counts))
+    return frequencies, magnitude
+
+@metrics.timed('gamma_burst_plot_seconds')
+def plot_fft(
+        frequencies: np.ndarray,
+        magnitude: np.ndarray,
+        title: str = "Transformée de Fourier des Comptages de Photons",
+        ax: Axes | None = None,
+    ) -> Axes:
+    """Affiche la transformée de Fourier en fonction de la fréquence.
+    
+    Args:
+        frequencies (numpy.ndarray): Array des fréquences en Hz.
+        magnitude (numpy.ndarray): Array de la magnitude de la FFT.
+        title (str): Titre du graphique.
+        ax (Axes | None): Axes du graphique, une nouvelle figure si None.
+
+    """
+    ax, show = get_axes(ax, figsize=(10, 6))
+    ax.plot(frequencies, magnitude, color='blue')
+    ax.set_xlabel('Fréquence (Hz)')
+    ax.set_ylabel('Magnitude de la FFT')
+    ax.set_title(title)
+    ax.grid(True)
+    ax.set_xlim(left=0)  # Limiter l'axe des x aux fréquences positives
+    if show:
+        show_figures()
+    return ax
+
+if __name__ == '__main__':
+    burst_analyser = BurstAnalyser('GRB 101225A')
+    # burst_analyser = BurstAnalyser('GRB 210905A')
+    burst_analyser.plot_light_curve_binning_no_evolution('TimeBins_64ms')
+    # burst_analyser.plot_light_curve_binning_no_evolution('TimeBins_1s')
+    # burst_analyser.plot_light_curve_binning_no_evolution('TimeBins_10s')
+
+    # burst_analyser.plot_light_curve_snr('SNR4')
+    # burst_analyser.plot_light_curve_snr('SNR5')
+    # burst_analyser.plot_light_curve_snr('SNR7')
+
+    # burst_analyser.plot_time_and_cumulated_flux_no_evolution('TimeBins_10s', (0, 10000))
+    # burst_analyser.plot_light_curve_hr()
+    # # burst_analyser.plot_time_and_cumulated_flux('SNR4')
+
+    # # print(burst_analyser.available_binning_data)
+
+    # burst_analyser.plot_spectra('TimeBins_10s', (1, 1e5))
+
+    time, count_rate = burst_analyser.retrieve_time_and_count_rate_no_evolution('TimeBins_64ms')
+    frequencies, magnitude = calculate_fft(time, count_rate)
+    
+    plot_fft(frequencies, magnitude)
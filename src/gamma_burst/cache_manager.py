@@ -0,0 +1,312 @@
+"""Content-addressed, size-bounded cache of the downloaded products.
+
+Every cached product lives in its own entry folder under
+``~/.gamma_burst/objects``. The folder name is a hash of the product type and
+of every request parameter, so two requests share an entry only if they are
+identical. A small SQLite index records the size and last access time of each
+entry; when the total size exceeds the budget the least recently used entries
+are evicted.
+
+The freshness policy (and pydantic), the metrics and the hashing are only
+imported to serve a product, so that maintenance commands (stats, gc, clear)
+start quickly.
+
+The default cache lives in ``~/.gamma_burst``, or in the folder given by
+``GAMMA_BURST_CACHE_DIR``. It is built on first use; call
+:func:`reset_cache_manager` to read the environment again.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+from gamma_burst.eumerations import ProductType
+
+if TYPE_CHECKING:
+    from gamma_burst.cache_policy import CachePolicy
+
+MAX_BYTES_ENV = 'GAMMA_BURST_CACHE_MAX_BYTES'
+CACHE_DIR_ENV = 'GAMMA_BURST_CACHE_DIR'
+DEFAULT_MAX_BYTES = 10 * 1024**3
+INDEX_FILE = 'index.sqlite'
+OBJECTS_FOLDER = 'objects'
+
+_COUNTERS = ('hits', 'misses', 'bytes_served', 'bytes_written', 'evictions')
+_T = TypeVar('_T')
+
+
+class CacheStats(NamedTuple):
+    """Cache usage, counters are cumulated over every process using the cache.
+
+    ``bytes_served`` is the size of the entries served from the cache: lazily
+    read entries (e.g. columnar stores) count in full, whatever is read.
+    """
+
+    hits: int
+    misses: int
+    bytes_served: int
+    bytes_written: int
+    evictions: int
+    nb_entries: int
+    total_bytes: int
+    max_bytes: int | None
+
+
+def folder_size(path: Path) -> int:
+    """Total size in bytes of the files below a folder."""
+    return sum(file.stat().st_size for file in path.rglob('*') if file.is_file())
+
+
+class CacheManager:
+    """Content-addressed cache with LRU eviction."""
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = DEFAULT_MAX_BYTES) -> None:
+        """Create a cache manager.
+
+        Args:
+            root (Path | None): Cache folder, ``~/.gamma_burst`` if None.
+            max_bytes (int | None): Size budget of the cache, unbounded if None.
+
+        """
+        self.root = root if root is not None else Path.home().joinpath('.gamma_burst')
+        self.max_bytes = max_bytes
+        self.root.joinpath(OBJECTS_FOLDER).mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, product TEXT, params TEXT, size INTEGER, created REAL, last_access REAL)'
+            )
+            connection.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)')
+            connection.executemany('INSERT OR IGNORE INTO counters VALUES (?, 0)', [(name,) for name in _COUNTERS])
+
+    @classmethod
+    def from_env(cls) -> CacheManager:
+        """Cache in ``GAMMA_BURST_CACHE_DIR`` (or ``~/.gamma_burst``), budget in ``GAMMA_BURST_CACHE_MAX_BYTES``."""
+        root = os.environ.get(CACHE_DIR_ENV)
+        max_bytes = os.environ.get(MAX_BYTES_ENV)
+        return cls(Path(root) if root else None, max_bytes=int(max_bytes) if max_bytes else DEFAULT_MAX_BYTES)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.root / INDEX_FILE, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def key(product: ProductType, params: dict) -> str:
+        """Hash identifying a product requested with some parameters."""
+        import hashlib  # noqa: PLC0415
+        import json  # noqa: PLC0415
+        payload = json.dumps({'product': str(product), 'params': params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def entry_path(self, product: ProductType, params: dict) -> Path:
+        """Folder of the cache entry of a product requested with some parameters."""
+        key = self.key(product, params)
+        return self.root / OBJECTS_FOLDER / key[:2] / key
+
+    def entry_version(self, product: ProductType, params: dict, file_name: str) -> str:
+        """Key of a cache entry and fetch time of its data, which changes whenever the product is refreshed.
+
+        Args:
+            product (ProductType): Cached product.
+            params (dict): Every request parameter, part of the cache key.
+            file_name (str): Name of the cache file or folder inside the entry.
+
+        """
+        from gamma_burst.cache_policy import read_metadata  # noqa: PLC0415
+        metadata = read_metadata(self.entry_path(product, params) / file_name) or {}
+        return f"{self.key(product, params)}@{metadata.get('fetched_at', 0.0)}"
+
+    def _increment(self, connection: sqlite3.Connection, **counters: int) -> None:
+        connection.executemany(
+            'UPDATE counters SET value = value + ? WHERE name = ?',
+            [(value, name) for name, value in counters.items()],
+        )
+
+    def _record_read(self, key: str, product: ProductType, params: dict, entry_path: Path) -> None:
+        import json  # noqa: PLC0415
+
+        from gamma_burst import metrics  # noqa: PLC0415
+        with self._connect() as connection:
+            row = connection.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                # Entry written without the index (e.g. the index was removed): index it again.
+                size = folder_size(entry_path)
+                connection.execute(
+                    'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, str(product), json.dumps(params, sort_keys=True, default=str), size, time.time(), 0.0),
+                )
+            else:
+                size = row[0]
+            connection.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._increment(connection, hits=1, bytes_served=size)
+        metrics.increment('gamma_burst_cache_hits_total', product=product)
+        metrics.increment('gamma_burst_cache_bytes_served_total', size, product=product)
+
+    def _record_write(self, key: str, product: ProductType, params: dict, entry_path: Path) -> None:
+        import json  # noqa: PLC0415
+
+        from gamma_burst import metrics  # noqa: PLC0415
+        size = folder_size(entry_path)
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                (key, str(product), json.dumps(params, sort_keys=True, default=str), size, now, now),
+            )
+            self._increment(connection, misses=1, bytes_written=size)
+        metrics.increment('gamma_burst_cache_misses_total', product=product)
+        metrics.increment('gamma_burst_cache_bytes_written_total', size, product=product)
+        if self.max_bytes is not None:
+            self.gc(keep={key})
+
+    def load_or_fetch(
+            self,
+            product: ProductType,
+            params: dict,
+            file_name: str,
+            *,
+            fetch: Callable[[Path], _T],
+            load: Callable[[Path], _T],
+            save: Callable[[_T, Path], None],
+            policy: CachePolicy | None = None,
+        ) -> _T:
+        """Serve a product from its cache entry or fetch it, see :func:`cache_policy.load_or_fetch`.
+
+        Args:
+            product (ProductType): Cached product.
+            params (dict): Every request parameter, part of the cache key.
+            file_name (str): Name of the cache file or folder inside the entry.
+            fetch (Callable): Download the product, given the entry folder for any side file.
+            load (Callable): Read the product from a path.
+            save (Callable): Write the product to a path.
+            policy (CachePolicy | None): Freshness policy.
+
+        Returns:
+            _T: Product data.
+
+        """
+        from gamma_burst import metrics  # noqa: PLC0415
+        from gamma_burst.cache_policy import load_or_fetch  # noqa: PLC0415
+        key = self.key(product, params)
+        entry_path = self.entry_path(product, params)
+        fetched = False
+
+        def fetch_entry() -> _T:
+            nonlocal fetched
+            fetched = True
+            with metrics.timer('gamma_burst_fetch_seconds', product=product):
+                return fetch(entry_path)
+
+        def load_entry(path: Path) -> _T:
+            with metrics.timer('gamma_burst_cache_load_seconds', product=product):
+                return load(path)
+
+        def save_entry(data: _T, path: Path) -> None:
+            with metrics.timer('gamma_burst_cache_save_seconds', product=product):
+                save(data, path)
+
+        data = load_or_fetch(
+            entry_path / file_name, product, params, fetch=fetch_entry, load=load_entry, save=save_entry, policy=policy
+        )
+        if fetched:
+            self._record_write(key, product, params, entry_path)
+        else:
+            self._record_read(key, product, params, entry_path)
+        return data
+
+    def gc(self, max_bytes: int | None = None, keep: set[str] | None = None) -> list[str]:
+        """Evict least recently used entries until the cache fits its budget.
+
+        Entry folders missing from the index (left by an interrupted write)
+        are removed as well.
+
+        Args:
+            max_bytes (int | None): Budget to enforce, the manager budget if None.
+            keep (set[str] | None): Keys never to evict.
+
+        Returns:
+            list[str]: Keys of the evicted entries.
+
+        """
+        max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+        keep = keep or set()
+        evicted = []
+        with self._connect() as connection:
+            rows = connection.execute('SELECT key, size FROM entries ORDER BY last_access').fetchall()
+            total_bytes = sum(size for _, size in rows)
+            for key, size in rows:
+                if max_bytes is None or total_bytes <= max_bytes:
+                    break
+                if key in keep:
+                    continue
+                shutil.rmtree(self.root / OBJECTS_FOLDER / key[:2] / key, ignore_errors=True)
+                connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+                total_bytes -= size
+                evicted.append(key)
+            self._increment(connection, evictions=len(evicted))
+            indexed = {key for key, _ in rows} - set(evicted)
+
+        for entry_path in self.root.joinpath(OBJECTS_FOLDER).glob('*/*'):
+            if entry_path.name not in indexed and entry_path.name not in keep and _is_stale_orphan(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
+        return evicted
+
+    def stats(self) -> CacheStats:
+        """Usage statistics of the cache."""
+        with self._connect() as connection:
+            counters = dict(connection.execute('SELECT name, value FROM counters').fetchall())
+            nb_entries, total_bytes = connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return CacheStats(
+            **{name: counters[name] for name in _COUNTERS},
+            nb_entries=nb_entries,
+            total_bytes=total_bytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        shutil.rmtree(self.root / OBJECTS_FOLDER, ignore_errors=True)
+        self.root.joinpath(OBJECTS_FOLDER).mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM entries')
+            connection.execute('UPDATE counters SET value = 0')
+
+
+def _is_stale_orphan(entry_path: Path, grace_period: float = 3600.0) -> bool:
+    """Whether an unindexed entry folder is old enough not to be a write in progress."""
+    return time.time() - entry_path.stat().st_mtime > grace_period
+
+
+_default_cache: CacheManager | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """Cache manager used when none is given explicitly, built from the environment on first use."""
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = CacheManager.from_env()
+        return _default_cache
+
+
+def reset_cache_manager() -> None:
+    """Forget the default cache manager, the next one reading the environment again."""
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        _default_cache = None
@@ -0,0 +1,157 @@
+"""Freshness policy shared by every cached product."""
+
+import json
+import os
+import pickle
+import time
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from gamma_burst.eumerations import CacheMode, ProductType
+
+CACHE_MODE_ENV = 'GAMMA_BURST_CACHE_MODE'
+
+_T = TypeVar('_T')
+
+
+class CachePolicy(BaseModel):
+    """When a cached product may be served instead of being fetched again.
+
+    Attributes:
+        mode (CacheMode): Refresh stale data, never touch the network, or always refresh.
+        ttl (dict[ProductType, float | None]): Time to live in seconds of each product, None for no expiry.
+
+    """
+
+    mode: CacheMode = CacheMode.Refresh_If_Stale
+    ttl: dict[ProductType, float | None] = {
+        ProductType.Light_Curve: 3600.0,
+        ProductType.Spectra: None,
+        ProductType.Burst_Analyser: None,
+        ProductType.Rebinned_Light_Curve: None,
+        ProductType.Joint_Light_Curve: None,
+    }
+
+    @classmethod
+    def from_env(cls) -> 'CachePolicy':
+        """Default policy, whose mode can be overridden with ``GAMMA_BURST_CACHE_MODE``."""
+        return cls(mode=os.environ.get(CACHE_MODE_ENV, CacheMode.Refresh_If_Stale))
+
+    def is_fresh(self, product: ProductType, params: dict, metadata: dict) -> bool:
+        """Check whether cached data fetched with ``metadata`` can still be served.
+
+        Args:
+            product (ProductType): Cached product.
+            params (dict): Parameters of the current request.
+            metadata (dict): Metadata recorded when the cached data were fetched.
+
+        """
+        if self.mode == CacheMode.Always_Refresh:
+            return False
+        if metadata.get('params', params) != params:
+            return False
+        ttl = self.ttl.get(product)
+        return ttl is None or time.time() - metadata['fetched_at'] < ttl
+
+
+def metadata_path(cache_path: Path) -> Path:
+    """Path of the metadata file of a cache file or folder."""
+    return cache_path.with_name(f'{cache_path.name}.meta.json')
+
+
+def read_metadata(cache_path: Path) -> dict | None:
+    """Read the metadata of cached data.
+
+    Caches written before metadata existed are dated with their modification
+    time and assumed to match any request parameters.
+
+    Returns:
+        dict | None: Metadata, None if nothing is cached.
+
+    """
+    if not cache_path.exists():
+        return None
+    meta_file = metadata_path(cache_path)
+    if not meta_file.exists():
+        return {'fetched_at': cache_path.stat().st_mtime}
+    with open(meta_file) as f:
+        return json.load(f)
+
+
+def write_metadata(cache_path: Path, product: ProductType, params: dict) -> None:
+    """Record when and how cached data were fetched."""
+    fetched_at = time.time()
+    metadata = {
+        'product': str(product),
+        'params': params,
+        'fetched_at': fetched_at,
+        'fetched_at_utc': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(fetched_at)),
+    }
+    with open(metadata_path(cache_path), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+
+def load_pickle(cache_path: Path) -> object:
+    """Read a pickled product."""
+    with open(cache_path, 'rb') as f:
+        return pickle.load(f)  # noqa: S301
+
+
+def save_pickle(data: object, cache_path: Path) -> None:
+    """Pickle a product, replacing the previous file atomically."""
+    tmp_path = cache_path.with_name(f'.{cache_path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(data, f)
+    tmp_path.replace(cache_path)
+
+
+def load_or_fetch(
+        cache_path: Path,
+        product: ProductType,
+        params: dict,
+        *,
+        fetch: Callable[[], _T],
+        load: Callable[[Path], _T],
+        save: Callable[[_T, Path], None],
+        policy: CachePolicy | None = None,
+    ) -> _T:
+    """Serve a product from the cache or fetch it, according to a policy.
+
+    Args:
+        cache_path (Path): Cache file or folder of the product.
+        product (ProductType): Cached product.
+        params (dict): JSON serialisable request parameters, recorded with the data.
+        fetch (Callable): Download the product.
+        load (Callable): Read the product from ``cache_path``.
+        save (Callable): Write the product to ``cache_path``.
+        policy (CachePolicy | None): Freshness policy, :meth:`CachePolicy.from_env` if None.
+
+    Returns:
+        _T: Product data.
+
+    """
+    if policy is None:
+        policy = CachePolicy.from_env()
+    metadata = read_metadata(cache_path)
+
+    if metadata is not None and (policy.mode == CacheMode.Offline or policy.is_fresh(product, params, metadata)):
+        return load(cache_path)
+    if policy.mode == CacheMode.Offline:
+        raise FileNotFoundError(f'No cached {product} in {cache_path} and cache policy is offline')
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        data = fetch()
+    except Exception as error:
+        if metadata is None:
+            raise
+        warnings.warn(f'Could not refresh {cache_path}, serving stale data: {error!r}', stacklevel=2)
+        return load(cache_path)
+
+    save(data, cache_path)
+    write_metadata(cache_path, product, params)
+    return data
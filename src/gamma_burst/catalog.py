@@ -0,0 +1,275 @@
+"""Catalog-wide extraction of per-burst features into a columnar summary table.
+
+The features of every GRB are computed across a process pool and streamed,
+as the bursts complete, to numbered part files of an output folder
+(``part-00000.parquet``, ``part-00001.parquet``, ...). Each part is written
+to a temporary file and renamed, so an interrupted run leaves only complete
+parts behind, and a new run skips the bursts already found in them.
+"""
+
+import math
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.data_source import DataSource
+from gamma_burst.eumerations import CatalogFormat, Instrument, ObservationMode
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectra import XRTSpectra
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+PEAK_RATE_BINNINGS = ('TimeBins_64ms', 'TimeBins_1s', 'TimeBins_10s')
+DURATION_BINNING = 'TimeBins_64ms'
+XRT_MODES = (ObservationMode.WT_Mode, ObservationMode.PC_Mode)
+FEATURE_COLUMNS = (
+    'grb_name',
+    'bat_nb_points',
+    'bat_mean_hr',
+    'bat_mean_gamma',
+    *(f'bat_peak_rate_{binning.removeprefix("TimeBins_")}' for binning in PEAK_RATE_BINNINGS),
+    'total_fluence',
+    't90',
+    't50',
+    *(f'xrt_{mode.lower()}_{name}' for mode in XRT_MODES for name in ('gamma', 'obs_flux', 'nb_points')),
+    'errors',
+)
+COUNT_COLUMNS = tuple(column for column in FEATURE_COLUMNS if column.endswith('_nb_points'))
+
+
+@dataclass
+class FeatureResult:
+    """Outcome of the feature extraction of one GRB."""
+
+    grb_name: str
+    duration: float
+    features: dict[str, Any] | None = None
+    error: str | None = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the features were extracted."""
+        return self.error is None
+
+
+@dataclass
+class CatalogReport:
+    """Summary of a catalog extraction."""
+
+    results: list[FeatureResult] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    parts: list[Path] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> list[FeatureResult]:
+        """Results of the GRBs whose features were extracted."""
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> list[FeatureResult]:
+        """Results of the GRBs in error."""
+        return [result for result in self.results if not result.success]
+
+    def summary(self) -> str:
+        """Human readable summary of the extraction."""
+        lines = [
+            f'Extracted {len(self.succeeded)}/{len(self.results)} GRBs in {self.duration:.1f}s '
+            f'({len(self.skipped)} already in the catalog, {len(self.parts)} part(s) written)'
+        ]
+        lines.extend(f'  FAILED {result.grb_name}: {result.error}' for result in self.failed)
+        return '\n'.join(lines)
+
+
+def extract_features(grb_name: str, client: DataSource | None = None) -> dict[str, Any]:
+    """Compute the summary features of one GRB.
+
+    The BAT features are required. XRT products missing for the burst leave
+    their features to NaN and are listed in the ``errors`` feature.
+
+    Args:
+        grb_name (str): GRB's name.
+        client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+
+    Returns:
+        dict[str, Any]: Features by name, every name of :data:`FEATURE_COLUMNS`.
+
+    """
+    features: dict[str, Any] = dict.fromkeys(FEATURE_COLUMNS, math.nan)
+    features['grb_name'] = grb_name
+    errors = []
+
+    analyser = BurstAnalyser(grb_name, client=client)
+    hr_index = analyser.time_index(Instrument.BAT_Sensor, 'HRData')
+    features['bat_mean_hr'] = float(np.mean(hr_index.column('HR')))
+    features['bat_mean_gamma'] = float(np.mean(hr_index.column('Gamma')))
+    for binning in PEAK_RATE_BINNINGS:
+        if binning in analyser.available_binning_data:
+            peak_rate = np.max(analyser.light_curve(binning).count_rate)
+            features[f'bat_peak_rate_{binning.removeprefix("TimeBins_")}'] = float(peak_rate)
+    duration = analyser.compute_duration(DURATION_BINNING)
+    features['bat_nb_points'] = len(analyser.light_curve(DURATION_BINNING))
+    features['total_fluence'] = float(duration.total_fluence)
+    features['t90'] = float(duration.t90)
+    features['t50'] = float(duration.t50)
+
+    try:
+        interval = XRTSpectra(grb_name, client=client).s_data['interval0']
+        for mode in XRT_MODES:
+            if mode in interval:
+                power_law_fit = interval[mode]['PowerLaw']
+                features[f'xrt_{mode.lower()}_gamma'] = float(power_law_fit['Gamma'])
+                features[f'xrt_{mode.lower()}_obs_flux'] = float(power_law_fit['ObsFlux'])
+    except Exception as error:
+        errors.append(f'spectra: {error!r}')
+    try:
+        lc_data = XRTLightCurve(grb_name, client=client).lc_data
+        for mode in XRT_MODES:
+            if mode + '_incbad' in lc_data:
+                features[f'xrt_{mode.lower()}_nb_points'] = len(lc_data[mode + '_incbad'])
+    except Exception as error:
+        errors.append(f'light curves: {error!r}')
+    features['errors'] = '; '.join(errors)
+    return features
+
+
+def _extract_in_worker(grb_name: str, client: DataSource | None) -> FeatureResult:
+    start = time.monotonic()
+    try:
+        features = extract_features(grb_name, client)
+    except Exception as error:
+        return FeatureResult(grb_name, time.monotonic() - start, error=repr(error))
+    return FeatureResult(grb_name, time.monotonic() - start, features=features)
+
+
+def _part_paths(output_dir: Path) -> list[Path]:
+    return sorted(path for catalog_format in CatalogFormat for path in output_dir.glob(f'part-*.{catalog_format}'))
+
+
+def _read_part(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    if path.suffix == '.' + CatalogFormat.Parquet:
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, dtype={'grb_name': str})
+
+
+def _write_part(rows: list[dict[str, Any]], path: Path, catalog_format: CatalogFormat) -> None:
+    table = pd.DataFrame(rows, columns=list(FEATURE_COLUMNS)).astype({column: 'Int64' for column in COUNT_COLUMNS})
+    temporary_path = path.with_name(path.name + '.tmp')
+    if catalog_format == CatalogFormat.Parquet:
+        table.to_parquet(temporary_path, index=False)
+    else:
+        table.to_csv(temporary_path, index=False)
+    temporary_path.replace(path)
+
+
+def completed_bursts(output_dir: Path) -> set[str]:
+    """Names of the GRBs already in the parts of a catalog folder."""
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        return set()
+    return {name for path in _part_paths(output_dir) for name in _read_part(path, ['grb_name'])['grb_name']}
+
+
+def read_catalog(output_dir: Path) -> pd.DataFrame:
+    """Summary table of every GRB in the parts of a catalog folder, one row per GRB.
+
+    Args:
+        output_dir (Path): Catalog folder written by :func:`extract_catalog`.
+
+    """
+    parts = [_read_part(path) for path in _part_paths(Path(output_dir))]
+    if not parts:
+        return pd.DataFrame(columns=list(FEATURE_COLUMNS))
+    table = pd.concat(parts, ignore_index=True).astype({column: 'Int64' for column in COUNT_COLUMNS})
+    table['errors'] = table['errors'].fillna('')
+    return table.drop_duplicates('grb_name', keep='last').reset_index(drop=True)
+
+
+def print_progress(result: FeatureResult, nb_done: int, nb_total: int) -> None:
+    """Default progress callback of :func:`extract_catalog`."""
+    status = 'ok' if result.success else f'FAILED ({result.error})'
+    print(f'[{nb_done}/{nb_total}] {result.grb_name}: {status} ({result.duration:.1f}s)')
+
+
+def extract_catalog(
+        grb_names: Iterable[str],
+        output_dir: Path,
+        *,
+        max_workers: int | None = None,
+        batch_size: int = 64,
+        catalog_format: CatalogFormat = CatalogFormat.Parquet,
+        client: DataSource | None = None,
+        progress: Callable[[FeatureResult, int, int], None] | None = print_progress,
+    ) -> CatalogReport:
+    """Extract the features of several GRBs across a process pool into a catalog folder.
+
+    GRBs already in the folder are skipped. Features are written every
+    ``batch_size`` bursts and when the extraction stops, even on an
+    interruption, so a new run resumes where the previous one stopped.
+    Failed bursts are not written and are tried again by the next run.
+
+    Args:
+        grb_names (Iterable[str]): GRBs' names.
+        output_dir (Path): Folder of the catalog parts.
+        max_workers (int | None): Number of worker processes, the number of CPUs if None.
+        batch_size (int): Number of GRBs per part.
+        catalog_format (CatalogFormat): Format of the new parts, Parquet needs ``pyarrow``.
+        client (DataSource | None): Picklable source of the UKSSDC products, the configured data source if None.
+        progress (Callable | None): Called with each result, the number of finished and total GRBs.
+
+    Returns:
+        CatalogReport: Result of every extracted GRB.
+
+    """
+    if batch_size < 1:
+        raise ValueError('Batch size should be at least 1')
+    if catalog_format == CatalogFormat.Parquet and pyarrow is None:
+        raise ValueError('Parquet catalogs need pyarrow, use CatalogFormat.CSV otherwise')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    done = completed_bursts(output_dir)
+    report = CatalogReport()
+    todo = []
+    for grb_name in dict.fromkeys(grb_names):
+        (report.skipped if grb_name in done else todo).append(grb_name)
+    existing_parts = _part_paths(output_dir)
+    next_part = int(existing_parts[-1].stem.removeprefix('part-')) + 1 if existing_parts else 0
+    rows: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal next_part, rows
+        if rows:
+            path = output_dir / f'part-{next_part:05d}.{catalog_format}'
+            _write_part(rows, path, catalog_format)
+            report.parts.append(path)
+            next_part += 1
+            rows = []
+
+    start = time.monotonic()
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(_extract_in_worker, grb_name, client) for grb_name in todo]
+        for future in as_completed(futures):
+            result = future.result()
+            report.results.append(result)
+            if result.success:
+                rows.append(result.features)
+                if len(rows) >= batch_size:
+                    flush()
+            if progress is not None:
+                progress(result, len(report.results), len(todo))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        flush()
+        report.duration = time.monotonic() - start
+    return report
@@ -0,0 +1,204 @@
+"""``gamma-burst`` command line interface.
+
+Subcommands:
+
+- ``fetch``: download the products of GRBs into the cache, in a thread pool,
+- ``analyze``: extract the catalog features of GRBs, in a process pool,
+- ``render``: render plots of GRBs to files, in a process pool,
+- ``cache``: show the cache statistics, evict entries or clear it.
+
+GRB names are given as arguments and/or read from files (``-`` for stdin),
+one per line, blank lines and ``#`` comments being skipped. Without any of
+them, names are read from stdin when it is not a terminal.
+
+Each subcommand only imports the modules it uses, so that the cache
+commands start without NumPy, pandas, matplotlib or ``swifttools``.
+"""
+
+import argparse
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TextIO
+
+from gamma_burst.eumerations import CatalogFormat, ProductType
+
+# fetcher.FETCHABLE_PRODUCTS, not imported so that building the parser stays cheap
+FETCHABLE_PRODUCTS = (ProductType.Light_Curve, ProductType.Spectra, ProductType.Burst_Analyser)
+DATA_SOURCES = ('ukssdc', 'synthetic')
+
+
+def _read_names(lines: Iterable[str]) -> list[str]:
+    names = (line.split('#', 1)[0].strip() for line in lines)
+    return [name for name in names if name]
+
+
+def read_grb_names(names: Iterable[str] = (), files: Iterable[str] = (), stdin: TextIO | None = None) -> list[str]:
+    """GRB names of the arguments and of the files, in order and without duplicates.
+
+    Args:
+        names (Iterable[str]): GRBs' names.
+        files (Iterable[str]): Files of GRB names, one per line, ``-`` for stdin.
+        stdin (TextIO | None): Standard input, ``sys.stdin`` if None.
+
+    Returns:
+        list[str]: GRBs' names.
+
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    grb_names = [name.strip() for name in names if name.strip()]
+    for file in files:
+        if file == '-':
+            grb_names.extend(_read_names(stdin))
+        else:
+            with open(file, encoding='utf-8') as lines:
+                grb_names.extend(_read_names(lines))
+    return list(dict.fromkeys(grb_names))
+
+
+def _grb_names(args: argparse.Namespace) -> list[str]:
+    files = list(args.files)
+    if not args.grb_names and not files and not sys.stdin.isatty():
+        files = ['-']
+    grb_names = read_grb_names(args.grb_names, files)
+    if not grb_names:
+        raise ValueError('No GRB name given, as arguments, with --file or on stdin')
+    return grb_names
+
+
+def _use_source(args: argparse.Namespace) -> None:
+    """Select the data source of this process and of its workers."""
+    if args.source is not None:
+        from gamma_burst.data_source import DATA_SOURCE_ENV  # noqa: PLC0415
+        os.environ[DATA_SOURCE_ENV] = args.source
+
+
+def _fetch(args: argparse.Namespace) -> int:
+    from gamma_burst.fetcher import fetch_many, print_progress  # noqa: PLC0415
+    _use_source(args)
+    report = fetch_many(
+        _grb_names(args),
+        products=args.products,
+        max_workers=args.workers,
+        rate_limit=args.rate_limit,
+        max_retries=args.retries,
+        progress=None if args.quiet else print_progress,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def _analyze(args: argparse.Namespace) -> int:
+    from gamma_burst.catalog import extract_catalog, print_progress  # noqa: PLC0415
+    _use_source(args)
+    report = extract_catalog(
+        _grb_names(args),
+        args.output_dir,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+        catalog_format=args.format,
+        progress=None if args.quiet else print_progress,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def _render(args: argparse.Namespace) -> int:
+    from gamma_burst.rendering import PLOT_TYPES, print_progress, render_many  # noqa: PLC0415
+    _use_source(args)
+    report = render_many(
+        _grb_names(args),
+        plot_types=args.plots if args.plots else tuple(PLOT_TYPES),
+        output_dir=args.output_dir,
+        formats=args.formats,
+        max_workers=args.workers,
+        progress=None if args.quiet else print_progress,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def _cache(args: argparse.Namespace) -> int:
+    from gamma_burst.cache_manager import CacheManager  # noqa: PLC0415
+    manager = CacheManager.from_env()
+    if args.action == 'gc':
+        evicted = manager.gc(args.max_bytes)
+        print(f'Evicted {len(evicted)} entries')
+    elif args.action == 'clear':
+        manager.clear()
+        print(f'Cleared {manager.root}')
+    for name, value in manager.stats()._asdict().items():
+        print(f'{name}: {value}')
+    return 0
+
+
+def _add_grb_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('grb_names', nargs='*', metavar='GRB', help="GRB names (e.g. 'GRB 101225A')")
+    parser.add_argument(
+        '-f', '--file', dest='files', action='append', default=[], help='file of GRB names, - for stdin'
+    )
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of parallel workers')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print the summary')
+    parser.add_argument(
+        '--source', choices=DATA_SOURCES, default=None, help='data source, GAMMA_BURST_DATA_SOURCE if not given'
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parser of the ``gamma-burst`` command."""
+    parser = argparse.ArgumentParser(prog='gamma-burst', description='Fetch, analyze and render Swift GRB products.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch = subparsers.add_parser('fetch', help='download products into the cache')
+    _add_grb_arguments(fetch)
+    fetch.add_argument(
+        '--products', nargs='+', type=ProductType, choices=FETCHABLE_PRODUCTS, default=FETCHABLE_PRODUCTS
+    )
+    fetch.add_argument('--rate-limit', type=float, default=None, help='maximum number of requests per second')
+    fetch.add_argument('--retries', type=int, default=3, help='number of retries of a failed request')
+    fetch.set_defaults(handler=_fetch, workers=8)
+
+    analyze = subparsers.add_parser('analyze', help='extract catalog features into a folder of parts')
+    _add_grb_arguments(analyze)
+    analyze.add_argument('-o', '--output-dir', type=Path, required=True, help='catalog folder, resumed if it exists')
+    analyze.add_argument('--batch-size', type=int, default=64, help='number of GRBs per part')
+    analyze.add_argument('--format', type=CatalogFormat, choices=list(CatalogFormat), default=CatalogFormat.Parquet)
+    analyze.set_defaults(handler=_analyze)
+
+    render = subparsers.add_parser('render', help='render plots to files')
+    _add_grb_arguments(render)
+    render.add_argument('-o', '--output-dir', type=Path, default=Path('.'), help='folder of the plots')
+    render.add_argument('--plots', nargs='+', default=None, help='plot types, every one if not given')
+    render.add_argument('--formats', nargs='+', default=['png'], help='file formats (png, svg, pdf)')
+    render.set_defaults(handler=_render)
+
+    cache = subparsers.add_parser('cache', help='show, trim or clear the cache')
+    cache.add_argument('action', nargs='?', choices=('stats', 'gc', 'clear'), default='stats')
+    cache.add_argument(
+        '--max-bytes', type=int, default=None, help='budget enforced by gc, the cache budget if not given'
+    )
+    cache.set_defaults(handler=_cache)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``gamma-burst`` command.
+
+    Args:
+        argv (Sequence[str] | None): Arguments, ``sys.argv[1:]`` if None.
+
+    Returns:
+        int: Exit status, 1 if some GRBs failed.
+
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as error:
+        parser.exit(2, f'gamma-burst {args.command}: error: {error}\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Columnar on-disk store for nested product dictionaries.
+
+The UKSSDC helpers return deeply nested dictionaries whose leaves are mostly
+``pandas.DataFrame`` tables. Pickling such a dictionary in one piece forces
+every later run to deserialise every table. This module instead writes one
+``.npy`` file per column (memory-mappable) and a small JSON manifest that
+describes the tree. Reading the store returns a :class:`LazyNode` mapping which
+only loads a table the first time it is accessed.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+import shutil
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+OBJECTS_FILE = 'objects.pkl'
+TABLES_FOLDER = 'tables'
+STORE_VERSION = 1
+
+_TABLE = '__table__'
+_VALUE = '__value__'
+_OBJECT = '__object__'
+_NODE = '__node__'
+
+
+def _is_json_value(value: object) -> bool:
+    """Check that a leaf can be stored as is in the JSON manifest."""
+    if value is None or isinstance(value, str | bool | int | float):
+        return True
+    if isinstance(value, list):
+        return all(_is_json_value(item) for item in value)
+    return False
+
+
+class _StoreWriter:
+    """Walk a nested dictionary and write its leaves to a store folder."""
+
+    def __init__(self, folder_path: Path) -> None:
+        self.folder_path = folder_path
+        self.tables_path = folder_path / TABLES_FOLDER
+        self.objects: dict[str, Any] = {}
+        self.nb_tables = 0
+
+    def write_node(self, data: Mapping, path: str) -> dict:
+        import pandas as pd  # noqa: PLC0415
+        children = {}
+        for key, value in data.items():
+            child_path = f'{path}/{key}' if path else str(key)
+            if isinstance(value, Mapping) and all(isinstance(k, str) for k in value):
+                children[key] = self.write_node(value, child_path)
+            elif isinstance(value, pd.DataFrame):
+                children[key] = self.write_table(value)
+            elif isinstance(value, np.generic):
+                children[key] = {_VALUE: value.item()}
+            elif _is_json_value(value):
+                children[key] = {_VALUE: value}
+            else:
+                self.objects[child_path] = value
+                children[key] = {_OBJECT: child_path}
+        return {_NODE: children}
+
+    def write_table(self, table: pd.DataFrame) -> dict:
+        table_id = f't{self.nb_tables}'
+        self.nb_tables += 1
+        table_path = self.tables_path / table_id
+        table_path.mkdir(parents=True)
+
+        columns = []
+        for idx, column in enumerate(table.columns):
+            series = table[column]
+            values = series.to_numpy()
+            np.save(table_path / f'c{idx}.npy', values, allow_pickle=values.dtype.hasobject)
+            columns.append({
+                'name': column,
+                'file': f'c{idx}.npy',
+                'dtype': str(series.dtype),
+                'mmap': not values.dtype.hasobject,
+            })
+
+        import pandas as pd  # noqa: PLC0415
+        index = None
+        default_index = pd.RangeIndex(len(table))
+        if not (isinstance(table.index, pd.RangeIndex) and table.index.equals(default_index)):
+            values = table.index.to_numpy()
+            np.save(table_path / 'index.npy', values, allow_pickle=values.dtype.hasobject)
+            index = {'file': 'index.npy', 'name': table.index.name, 'mmap': not values.dtype.hasobject}
+
+        return {_TABLE: table_id, 'nb_rows': len(table), 'columns': columns, 'index': index}
+
+
+def write_columnar_store(data: Mapping, folder_path: Path) -> None:
+    """Write a nested product dictionary as a columnar store.
+
+    The store is first written to a temporary sibling folder and then moved in
+    place, so a concurrent reader never sees a half-written store.
+
+    Args:
+        data (Mapping): Nested dictionary as returned by ``udg``.
+        folder_path (Path): Destination folder of the store.
+
+    """
+    tmp_path = folder_path.with_name(f'.{folder_path.name}.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    writer = _StoreWriter(tmp_path)
+    tree = writer.write_node(data, '')
+    if writer.objects:
+        with open(tmp_path / OBJECTS_FILE, 'wb') as f:
+            pickle.dump(writer.objects, f)
+    manifest = {'version': STORE_VERSION, 'tree': tree}
+    with open(tmp_path / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f)
+
+    if folder_path.exists():
+        shutil.rmtree(folder_path)
+    tmp_path.rename(folder_path)
+
+
+def is_columnar_store(folder_path: Path) -> bool:
+    """Check whether a folder holds a columnar store."""
+    return (folder_path / MANIFEST_FILE).exists()
+
+
+class _StoreReader:
+    """Shared state of every node of an opened store."""
+
+    def __init__(self, folder_path: Path) -> None:
+        self.folder_path = folder_path
+        self._objects: dict[str, Any] | None = None
+
+    def load_table(self, entry: dict) -> pd.DataFrame:
+        import pandas as pd  # noqa: PLC0415
+        table_path = self.folder_path / TABLES_FOLDER / entry[_TABLE]
+        columns = {}
+        for column in entry['columns']:
+            columns[column['name']] = self._load_array(table_path / column['file'], column['mmap'])
+        index = None
+        if entry['index'] is not None:
+            index_values = self._load_array(table_path / entry['index']['file'], entry['index']['mmap'])
+            index = pd.Index(index_values, name=entry['index']['name'])
+        if index is None:
+            index = pd.RangeIndex(entry['nb_rows'])
+        table = pd.DataFrame(columns, index=index, copy=False)
+        for column in entry['columns']:
+            if not column['mmap'] and str(table[column['name']].dtype) != column['dtype']:
+                table[column['name']] = table[column['name']].astype(column['dtype'])
+        return table
+
+    def load_object(self, path: str) -> object:
+        if self._objects is None:
+            # Written by write_columnar_store in the local cache, like the pickled products of cache_policy.
+            with open(self.folder_path / OBJECTS_FILE, 'rb') as f:
+                self._objects = pickle.load(f)  # noqa: S301
+        return self._objects[path]
+
+    @staticmethod
+    def _load_array(file_path: Path, mmap: bool) -> np.ndarray:
+        if mmap:
+            # Plain ndarray view on the mapping, so pandas treats it like any other array.
+            return np.asarray(np.load(file_path, mmap_mode='r'))
+        return np.load(file_path, allow_pickle=True)
+
+
+class LazyNode(Mapping):
+    """Read-only mapping over one level of a columnar store.
+
+    Tables are loaded (memory-mapped when possible) on first access and then
+    kept, so each table is read at most once per opened store.
+    """
+
+    def __init__(self, reader: _StoreReader, children: dict) -> None:
+        """Create a node over the manifest entries of its children."""
+        self._reader = reader
+        self._children = children
+        self._loaded: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> object:
+        """Child node, table or value of a key, loaded on first access."""
+        if key in self._loaded:
+            return self._loaded[key]
+        entry = self._children[key]
+        if _NODE in entry:
+            value = LazyNode(self._reader, entry[_NODE])
+        elif _TABLE in entry:
+            value = self._reader.load_table(entry)
+        elif _OBJECT in entry:
+            value = self._reader.load_object(entry[_OBJECT])
+        else:
+            value = entry[_VALUE]
+        self._loaded[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Keys of the children."""
+        return iter(self._children)
+
+    def __len__(self) -> int:
+        """Return the number of children."""
+        return len(self._children)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is a child, without loading it."""
+        return key in self._children
+
+    def is_table(self, key: str) -> bool:
+        """Check whether a key points to a table, without loading it."""
+        return _TABLE in self._children[key]
+
+    def is_loaded(self, key: str) -> bool:
+        """Check whether a key has already been read."""
+        return key in self._loaded
+
+    def to_dict(self) -> dict:
+        """Load the whole subtree into a plain dictionary."""
+        return {key: value.to_dict() if isinstance(value, LazyNode) else value for key, value in self.items()}
+
+
+def open_columnar_store(folder_path: Path) -> LazyNode:
+    """Open a columnar store without reading any table.
+
+    Args:
+        folder_path (Path): Folder written by :func:`write_columnar_store`.
+
+    Returns:
+        LazyNode: Root of the stored dictionary.
+
+    """
+    with open(folder_path / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    if manifest['version'] != STORE_VERSION:
+        raise ValueError(f"Unsupported columnar store version {manifest['version']} in {folder_path}")
+    return LazyNode(_StoreReader(folder_path), manifest['tree'][_NODE])
@@ -0,0 +1,294 @@
+"""Compact array-backed light curve and spectral series containers.
+
+Columns are held as contiguous NumPy arrays instead of DataFrames: times
+always in float64 (a float32 loses the 64 ms resolution after ~1e5 s),
+the other columns in a selectable precision. Derived columns (count rate,
+bin widths, symmetric errors, ...) are computed on first access and
+cached. Instances use ``__slots__`` so that a catalog of thousands of
+curves only costs its arrays.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, ClassVar, Self
+
+import numpy as np
+
+from gamma_burst.spectral_models import power_law
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from numpy.typing import ArrayLike, DTypeLike
+
+
+class _ArraySeries:
+    """Time series whose columns are arrays of the same length, sorted by time."""
+
+    __slots__ = ('_derived', 'time')
+    _fields: tuple[str, ...] = ()
+    _columns: ClassVar[dict[str, str]] = {}
+    time: np.ndarray
+    _derived: dict[str, np.ndarray]
+
+    def __init__(self, time: ArrayLike, dtype: DTypeLike = np.float64, **columns: ArrayLike | None) -> None:
+        """Create a series, sorting it by time if needed.
+
+        Args:
+            time (ArrayLike): Bin times.
+            dtype (DTypeLike): Precision of the columns other than time, ``np.float64`` or ``np.float32``.
+            **columns (ArrayLike | None): Columns of :attr:`_fields`, missing ones are None. Scalars
+                (e.g. a single ECF) apply to every bin.
+
+        """
+        unknown = set(columns) - set(self._fields)
+        if unknown:
+            raise ValueError(f'Unknown columns {sorted(unknown)}, should be in {list(self._fields)}')
+        time = np.asarray(time, dtype=np.float64)
+        order = None
+        if len(time) > 1 and np.any(time[1:] < time[:-1]):
+            order = np.argsort(time, kind='stable')
+            time = time[order]
+        self.time = np.ascontiguousarray(time)
+        self._derived: dict[str, np.ndarray] = {}
+        for name in self._fields:
+            value = columns.get(name)
+            if value is not None:
+                value = np.asarray(value, dtype=dtype)
+                if value.ndim > 0:
+                    if len(value) != len(time):
+                        raise ValueError(f'Column {name} has {len(value)} values for {len(time)} times')
+                    if order is not None:
+                        value = value[order]
+                    value = np.ascontiguousarray(value)
+            setattr(self, name, value)
+
+    @classmethod
+    def from_table(cls, table: pd.DataFrame, dtype: DTypeLike = np.float64, **overrides: ArrayLike | None) -> Self:
+        """Build a series from a UKSSDC table, reading the columns of :attr:`_columns`.
+
+        Args:
+            table (pd.DataFrame): Table with a ``Time`` column.
+            dtype (DTypeLike): Precision of the columns other than time.
+            **overrides (ArrayLike | None): Values replacing (or completing) columns of the table.
+
+        """
+        columns = {name: table[column].to_numpy() for name, column in cls._columns.items() if column in table}
+        columns.update(overrides)
+        return cls(table['Time'].to_numpy(), dtype, **columns)
+
+    @classmethod
+    def from_arrays(cls, time: np.ndarray, **columns: np.ndarray | None) -> Self:
+        """Wrap sorted times and their columns as they are, without copy nor check (e.g. views of a shared block)."""
+        series = object.__new__(cls)
+        series.time = time
+        series._derived = {}
+        for name in cls._fields:
+            setattr(series, name, columns.get(name))
+        return series
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __repr__(self) -> str:
+        present = [name for name in self._fields if getattr(self, name) is not None]
+        return f'{type(self).__name__}(nb_bins={len(self)}, columns={present}, dtype={self.dtype})'
+
+    @property
+    def dtype(self) -> np.dtype:
+        for name in self._fields:
+            value = getattr(self, name)
+            if value is not None:
+                return value.dtype
+        return self.time.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns and the cached derived columns."""
+        arrays = [self.time, *(getattr(self, name) for name in self._fields), *self._derived.values()]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def _cached(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+    def window(self, time_scale: tuple[float, float] | None = None) -> Self:
+        """Bins of a time window (bounds included), as views of the columns."""
+        if time_scale is None:
+            return self
+        start = int(np.searchsorted(self.time, time_scale[0], side='left'))
+        stop = max(start, int(np.searchsorted(self.time, time_scale[1], side='right')))
+        columns = {}
+        for name in self._fields:
+            value = getattr(self, name)
+            columns[name] = value[start:stop] if value is not None and value.ndim > 0 else value
+        return type(self).from_arrays(self.time[start:stop], **columns)
+
+
+class LightCurve(_ArraySeries):
+    """Light curve with asymmetric time and rate errors.
+
+    ``rate`` is the rate of the source table (a flux for the Burst Analyser,
+    a count rate for XRT). ``ecf`` converts count rates to fluxes.
+    """
+
+    __slots__ = ('ecf', 'rate', 'rate_neg', 'rate_pos', 'time_neg', 'time_pos')
+    _fields = ('time_pos', 'time_neg', 'rate', 'rate_pos', 'rate_neg', 'ecf')
+    _columns: ClassVar[dict[str, str]] = {
+        'time_pos': 'TimePos',
+        'time_neg': 'TimeNeg',
+        'rate': 'Rate',
+        'rate_pos': 'RatePos',
+        'rate_neg': 'RateNeg',
+        'ecf': 'ECF',
+    }
+    time_pos: np.ndarray | None
+    time_neg: np.ndarray | None
+    rate: np.ndarray
+    rate_pos: np.ndarray | None
+    rate_neg: np.ndarray | None
+    ecf: np.ndarray | None
+
+    @classmethod
+    def from_bat_band(
+            cls,
+            table: pd.DataFrame,
+            dtype: DTypeLike = np.float64,
+            ecf: ArrayLike | None = None
+        ) -> LightCurve:
+        """Build a light curve from a Burst Analyser ``BATBand`` table, whose rates are fluxes.
+
+        Args:
+            table (pd.DataFrame): ``BATBand`` table.
+            dtype (DTypeLike): Precision of the columns other than time.
+            ecf (ArrayLike | None): ECF replacing the ``ECF`` column (e.g. the single ECF of the no evolution data).
+
+        """
+        columns = {'rate': table['Flux'].to_numpy()}
+        if 'FluxPos' in table and 'FluxNeg' in table:
+            columns.update(rate_pos=table['FluxPos'].to_numpy(), rate_neg=table['FluxNeg'].to_numpy())
+        if ecf is not None:
+            columns['ecf'] = ecf
+        return cls.from_table(table, dtype, **columns)
+
+    @property
+    def width(self) -> np.ndarray | None:
+        """Duration of every bin, None without time errors."""
+        time_pos, time_neg = self.time_pos, self.time_neg
+        if time_pos is None or time_neg is None:
+            return None
+        return self._cached('width', lambda: time_pos + np.abs(time_neg))
+
+    @property
+    def error(self) -> np.ndarray | None:
+        """Symmetric rate error, mean of the positive and negative errors."""
+        rate_pos, rate_neg = self.rate_pos, self.rate_neg
+        if rate_pos is None or rate_neg is None:
+            return None
+        return self._cached('error', lambda: (rate_pos + np.abs(rate_neg)) / 2)
+
+    @property
+    def count_rate(self) -> np.ndarray:
+        """Rate divided by the ECF, the rate itself without ECF."""
+        ecf = self.ecf
+        if ecf is None:
+            return self.rate
+        return self._cached('count_rate', lambda: self.rate / ecf)
+
+    @property
+    def count_rate_error(self) -> np.ndarray | None:
+        """Symmetric error of the count rate."""
+        error, ecf = self.error, self.ecf
+        if error is None or ecf is None:
+            return error
+        return self._cached('count_rate_error', lambda: error / np.abs(ecf))
+
+
+class SpectralSeries(_ArraySeries):
+    """Power law spectral parameters of every time bin, as in a ``BATBand`` table."""
+
+    __slots__ = ('ecf', 'flux', 'gamma', 'gamma_neg', 'gamma_pos')
+    _fields = ('gamma', 'gamma_pos', 'gamma_neg', 'flux', 'ecf')
+    _columns: ClassVar[dict[str, str]] = {
+        'gamma': 'Gamma', 'gamma_pos': 'GammaPos', 'gamma_neg': 'GammaNeg', 'flux': 'Flux', 'ecf': 'ECF',
+    }
+    gamma: np.ndarray
+    gamma_pos: np.ndarray | None
+    gamma_neg: np.ndarray | None
+    flux: np.ndarray
+    ecf: np.ndarray
+
+    @property
+    def gamma_error(self) -> np.ndarray | None:
+        """Symmetric photon index error."""
+        gamma_pos, gamma_neg = self.gamma_pos, self.gamma_neg
+        if gamma_pos is None or gamma_neg is None:
+            return None
+        return self._cached('gamma_error', lambda: (gamma_pos + np.abs(gamma_neg)) / 2)
+
+    @property
+    def count_rate(self) -> np.ndarray:
+        """Flux divided by the ECF."""
+        return self._cached('count_rate', lambda: self.flux / self.ecf)
+
+    def spectra(self, energy: np.ndarray, pivot: float = 50.0) -> np.ndarray:
+        """Power law count rate spectrum of every bin, shape (nb_bins, nb_energies).
+
+        Args:
+            energy (np.ndarray): Energies in keV.
+            pivot (float): Energy in keV at which the spectrum equals the count rate.
+
+        """
+        return power_law(energy, self.count_rate, -self.gamma, pivot)
+
+
+class JointFluxSeries(_ArraySeries):
+    """BAT and XRT fluxes resampled on a common time grid.
+
+    Each instrument has its mean flux, error and observed duration in every
+    bin of the grid. Bins not observed by an instrument have a zero exposure
+    and a NaN flux.
+    """
+
+    __slots__ = (
+        'bat_exposure', 'bat_flux', 'bat_flux_error', 'time_neg', 'time_pos',
+        'xrt_exposure', 'xrt_flux', 'xrt_flux_error',
+    )
+    _fields = (
+        'time_pos', 'time_neg', 'bat_flux', 'bat_flux_error', 'bat_exposure',
+        'xrt_flux', 'xrt_flux_error', 'xrt_exposure',
+    )
+    time_pos: np.ndarray
+    time_neg: np.ndarray
+    bat_flux: np.ndarray
+    bat_flux_error: np.ndarray
+    bat_exposure: np.ndarray
+    xrt_flux: np.ndarray
+    xrt_flux_error: np.ndarray
+    xrt_exposure: np.ndarray
+
+    @property
+    def width(self) -> np.ndarray:
+        """Duration of every bin of the grid."""
+        return self._cached('width', lambda: self.time_pos + np.abs(self.time_neg))
+
+    def _combine(self) -> tuple[np.ndarray, np.ndarray]:
+        fluxes = np.stack([self.bat_flux, self.xrt_flux])
+        errors = np.stack([self.bat_flux_error, self.xrt_flux_error])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weights = np.where(np.isfinite(fluxes) & (errors > 0), 1 / errors**2, 0.0)
+            total = weights.sum(axis=0)
+            flux = np.where(total > 0, np.nansum(weights * np.nan_to_num(fluxes), axis=0) / total, np.nan)
+            flux_error = np.where(total > 0, 1 / np.sqrt(total), np.nan)
+        return flux, flux_error
+
+    @property
+    def flux(self) -> np.ndarray:
+        """Inverse-variance weighted mean of the instrument fluxes, NaN where none observed."""
+        return self._cached('flux', lambda: self._combine()[0])
+
+    @property
+    def flux_error(self) -> np.ndarray:
+        """Error of :attr:`flux`."""
+        return self._cached('flux_error', lambda: self._combine()[1])
@@ -0,0 +1,132 @@
+"""Sources of the UKSSDC products.
+
+Every product class takes a ``client`` exposing the functions of
+``swifttools.ukssdc.data.GRB`` used by this package, described by
+:class:`DataSource`. Without an explicit client, :func:`get_data_source`
+selects one from ``GAMMA_BURST_DATA_SOURCE``:
+
+- ``ukssdc`` (default): the live UKSSDC service through ``swifttools``,
+- ``synthetic``: :class:`synthetic_source.SyntheticDataSource`, serving
+  realistic products generated locally, with configurable latency and
+  failures, to test the throughput of the fetch, cache and API layers offline.
+
+``swifttools`` and the synthetic source (with the analysis modules it
+builds its products with) are only imported by the source actually used.
+
+Products of different sources never share a cache entry: :func:`cache_params`
+adds the identity of any source other than the live UKSSDC to the parameters
+keying the cache.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from gamma_burst.synthetic_source import SyntheticDataSource
+
+DATA_SOURCE_ENV = 'GAMMA_BURST_DATA_SOURCE'
+UKSSDC_SOURCE = 'ukssdc'
+
+
+class DataSource(Protocol):
+    """Functions of ``swifttools.ukssdc.data.GRB`` used by this package."""
+
+    def getBurstAnalyser(self, **kwargs: object) -> dict:
+        """Burst Analyser product of a GRB."""
+
+    def getLightCurves(self, **kwargs: object) -> dict:
+        """XRT light curves of a GRB."""
+
+    def getSpectra(self, **kwargs: object) -> dict:
+        """XRT spectra of a GRB."""
+
+    def rebinLightCurve(self, **kwargs: object) -> int:
+        """Submit a rebinning job and return its ID."""
+
+    def checkRebinStatus(self, JobID: int, **kwargs: object) -> dict:
+        """Status of a rebinning job."""
+
+    def getRebinnedLightCurve(self, JobID: int, **kwargs: object) -> dict:
+        """Light curves of a completed rebinning job."""
+
+    def cancelRebin(self, JobID: int, **kwargs: object) -> bool:
+        """Cancel a rebinning job."""
+
+
+def _ukssdc() -> DataSource:
+    """Live UKSSDC service, ``swifttools`` (and astropy) being imported on first use."""
+    import swifttools.ukssdc.data.GRB as udg  # noqa: PLC0415
+    return udg
+
+
+def __getattr__(name: str) -> DataSource:
+    """Keep ``data_source.udg`` available without importing ``swifttools`` with the module."""
+    if name == 'udg':
+        return _ukssdc()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def source_id(client: DataSource) -> str:
+    """Identity of a data source, telling apart the products it serves.
+
+    The ``swifttools`` module is the live UKSSDC. Other sources give their own
+    ``source_id`` attribute, or are identified by their class.
+
+    Args:
+        client (DataSource): Source of the UKSSDC products.
+
+    Returns:
+        str: ``'ukssdc'`` for the live service.
+
+    """
+    if isinstance(client, ModuleType):
+        return UKSSDC_SOURCE
+    identity = getattr(client, 'source_id', None)
+    return identity if isinstance(identity, str) else f'{type(client).__module__}.{type(client).__qualname__}'
+
+
+def cache_params(params: dict, client: DataSource) -> dict:
+    """Parameters keying the cache entry of a product requested from a source.
+
+    Products of the live UKSSDC are keyed by their request parameters alone, so
+    that existing cache entries stay valid; other sources add their identity.
+
+    Args:
+        params (dict): Request parameters of the product.
+        client (DataSource): Source of the UKSSDC products.
+
+    Returns:
+        dict: Request parameters, with the ``source`` if it is not the live UKSSDC.
+
+    """
+    source = source_id(client)
+    return params if source == UKSSDC_SOURCE else {**params, 'source': source}
+
+
+_default_source: SyntheticDataSource | None = None
+_default_source_lock = threading.Lock()
+
+
+def get_data_source(name: str | None = None) -> DataSource:
+    """Return the data source used when none is given explicitly.
+
+    Args:
+        name (str | None): ``'ukssdc'`` or ``'synthetic'``, read from ``GAMMA_BURST_DATA_SOURCE`` if None.
+
+    """
+    global _default_source  # noqa: PLW0603
+    name = name if name is not None else os.environ.get(DATA_SOURCE_ENV, UKSSDC_SOURCE)
+    if name == UKSSDC_SOURCE:
+        return _ukssdc()
+    if name != 'synthetic':
+        raise ValueError(f"Unknown data source {name}, should be 'ukssdc' or 'synthetic'")
+    with _default_source_lock:
+        if _default_source is None:
+            from gamma_burst.synthetic_source import SyntheticDataSource  # noqa: PLC0415
+            _default_source = SyntheticDataSource.from_env()
+        return _default_source
+
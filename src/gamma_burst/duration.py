@@ -0,0 +1,168 @@
+"""Cumulative fluence and burst durations (T90, T50)."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+MAX_CHUNK_ELEMENTS = 4_000_000
+MIN_NB_BINS = 2
+
+
+@dataclass
+class DurationResult:
+    """Cumulative fluence of a light curve and the durations derived from it.
+
+    Times are in the unit of the light curve time (seconds), errors are the
+    standard deviation of the Monte Carlo samples (NaN without samples).
+    Scalars are floats for a single light curve, and arrays of shape (...)
+    for a batch of light curves of shape (..., nb_bins).
+    """
+
+    time: np.ndarray
+    cumulated_fluence: np.ndarray
+    cumulated_fraction: np.ndarray
+    total_fluence: float | np.ndarray
+    t90_start: float | np.ndarray
+    t90_stop: float | np.ndarray
+    t50_start: float | np.ndarray
+    t50_stop: float | np.ndarray
+    t90_err: float | np.ndarray = np.nan
+    t50_err: float | np.ndarray = np.nan
+
+    @property
+    def t90(self) -> float | np.ndarray:
+        """Time during which 90% of the fluence is collected."""
+        return self.t90_stop - self.t90_start
+
+    @property
+    def t50(self) -> float | np.ndarray:
+        """Time during which 50% of the fluence is collected."""
+        return self.t50_stop - self.t50_start
+
+
+def cumulative_fluence(flux: np.ndarray, widths: np.ndarray | None = None, positive_only: bool = True) -> np.ndarray:
+    """Cumulated fluence along the last axis.
+
+    Args:
+        flux (np.ndarray): Flux of each bin, shape (..., nb_bins).
+        widths (np.ndarray | None): Duration of each bin, the flux is summed as is if None.
+        positive_only (bool): Ignore negative (background dominated) bins.
+
+    Returns:
+        np.ndarray: Cumulated fluence, same shape as ``flux``.
+
+    """
+    fluence = np.asarray(flux, dtype=float)
+    if positive_only:
+        fluence = np.where(fluence > 0, fluence, 0.0)
+    if widths is not None:
+        fluence = fluence * widths
+    return np.cumsum(fluence, axis=-1)
+
+
+def cumulated_fraction(cumulated: np.ndarray) -> np.ndarray:
+    """Normalise cumulated fluences to [0, 1] along the last axis."""
+    low = cumulated.min(axis=-1, keepdims=True)
+    span = cumulated.max(axis=-1, keepdims=True) - low
+    return (cumulated - low) / np.where(span > 0, span, 1.0)
+
+
+def crossing_times(time: np.ndarray, fraction: np.ndarray, level: float) -> np.ndarray:
+    """First time each cumulated fraction reaches a level, linearly interpolated.
+
+    Args:
+        time (np.ndarray): Bin times, shape (nb_bins,).
+        fraction (np.ndarray): Non decreasing cumulated fractions, shape (..., nb_bins).
+        level (float): Level to reach, between 0 and 1.
+
+    Returns:
+        np.ndarray: Crossing times, shape (...).
+
+    """
+    above = fraction >= level
+    stop = np.argmax(above, axis=-1)
+    start = np.maximum(stop - 1, 0)
+    frac_stop = np.take_along_axis(fraction, stop[..., None], axis=-1)[..., 0]
+    frac_start = np.take_along_axis(fraction, start[..., None], axis=-1)[..., 0]
+    step = frac_stop - frac_start
+    weight = np.where(step > 0, (level - frac_start) / np.where(step > 0, step, 1.0), 1.0)
+    return time[start] + weight * (time[stop] - time[start])
+
+
+def _scalar(value: np.ndarray) -> float | np.ndarray:
+    """Float of a 0-d array, the array itself otherwise."""
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def _durations(time: np.ndarray, fraction: np.ndarray) -> dict[str, np.ndarray]:
+    return {
+        't90_start': crossing_times(time, fraction, 0.05),
+        't90_stop': crossing_times(time, fraction, 0.95),
+        't50_start': crossing_times(time, fraction, 0.25),
+        't50_stop': crossing_times(time, fraction, 0.75),
+    }
+
+
+def compute_duration(
+        time: np.ndarray,
+        flux: np.ndarray,
+        flux_err: np.ndarray | None = None,
+        widths: np.ndarray | None = None,
+        *,
+        nb_samples: int = 0,
+        positive_only: bool = True,
+        seed: int | None = None,
+    ) -> DurationResult:
+    """Compute the cumulative fluence, T90 and T50 of a light curve or of a batch of them.
+
+    Uncertainties are estimated by drawing ``nb_samples`` light curves from
+    Gaussian flux errors; samples are processed in chunks to bound memory.
+
+    Args:
+        time (np.ndarray): Sorted bin times, shape (nb_bins,).
+        flux (np.ndarray): Flux of each bin, shape (nb_bins,) or (..., nb_bins).
+        flux_err (np.ndarray | None): 1 sigma flux error of each bin, needed for the uncertainties.
+        widths (np.ndarray | None): Duration of each bin, the flux is summed as is if None.
+        nb_samples (int): Number of Monte Carlo samples, no uncertainty if 0.
+        positive_only (bool): Ignore negative (background dominated) bins.
+        seed (int | None): Seed of the random generator.
+
+    Returns:
+        DurationResult: Cumulative fluence and durations, arrays of shape (...) for a batch.
+
+    """
+    time = np.asarray(time, dtype=float)
+    flux = np.asarray(flux, dtype=float)
+    if len(time) < MIN_NB_BINS:
+        raise ValueError('At least two bins are needed to compute a duration')
+    if widths is not None:
+        widths = np.asarray(widths, dtype=float)
+
+    cumulated = cumulative_fluence(flux, widths, positive_only)
+    fraction = cumulated_fraction(cumulated)
+    durations = _durations(time, fraction)
+    result = DurationResult(
+        time=time,
+        cumulated_fluence=cumulated,
+        cumulated_fraction=fraction,
+        total_fluence=_scalar(cumulated[..., -1]),
+        **{name: _scalar(value) for name, value in durations.items()},
+    )
+
+    if nb_samples > 0:
+        if flux_err is None:
+            raise ValueError('Flux errors are needed to estimate uncertainties')
+        flux_err = np.asarray(flux_err, dtype=float)
+        rng = np.random.default_rng(seed)
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // flux.size)
+        t90 = np.empty((nb_samples, *flux.shape[:-1]))
+        t50 = np.empty_like(t90)
+        for start in range(0, nb_samples, chunk_size):
+            stop = min(start + chunk_size, nb_samples)
+            samples = flux + flux_err * rng.standard_normal((stop - start, *flux.shape))
+            sample_durations = _durations(time, cumulated_fraction(cumulative_fluence(samples, widths, positive_only)))
+            t90[start:stop] = sample_durations['t90_stop'] - sample_durations['t90_start']
+            t50[start:stop] = sample_durations['t50_stop'] - sample_durations['t50_start']
+        result.t90_err = _scalar(np.std(t90, axis=0))
+        result.t50_err = _scalar(np.std(t50, axis=0))
+    return result
@@ -12,7 +12,76 @@ class ObservationMode(StrEnum):
     PC_Soft_Mode = 'PCSoft'
 
 
+class ProductType(StrEnum):
+    """Products of the UKSSDC, as named in the cache."""
+
+    Light_Curve = 'light_curve'
+    Spectra = 'spectra'
+    Burst_Analyser = 'burst_analyser'
+    Rebinned_Light_Curve = 'rebinned_light_curve'
+    Joint_Light_Curve = 'joint_light_curve'
+
+
+class CacheMode(StrEnum):
+    """How cached products are refreshed."""
+
+    Refresh_If_Stale = 'refresh_if_stale'
+    Offline = 'offline'
+    Always_Refresh = 'always_refresh'
+
+
 class Instrument(StrEnum):
     BAT_Sensor = 'BAT' #15 - 150kev 
     BAT_Sensor_NoEvolution = 'BAT_NoEvolution' #15 - 150kev 
-    XRT_Sensor = 'XRT' #0.3 - 10kev
\ No newline at end of file
+    XRT_Sensor = 'XRT' #0.3 - 10kev
+
+
+class PSDNormalisation(StrEnum):
+    """Normalisation of a power spectrum."""
+
+    Leahy = 'leahy' # Poisson noise level at 2
+    Rms = 'rms' # (rms / mean)^2 / Hz
+    Absolute = 'absolute' # rate^2 / Hz
+
+
+class FitStatistic(StrEnum):
+    """Statistic minimised by a spectral fit."""
+
+    Chi2 = 'chi2' # Gaussian errors
+    CStat = 'cstat' # Poisson counts
+
+
+class RebinMethod(StrEnum):
+    """Method grouping the bins of a light curve."""
+
+    Fixed = 'fixed' # bins of a fixed duration
+    Min_SNR = 'min_snr' # bins reaching a minimum signal to noise ratio
+    Bayesian_Blocks = 'bayesian_blocks' # Scargle et al. 2013, point measures fitness
+
+
+class CatalogFormat(StrEnum):
+    """File format of the catalog parts."""
+
+    Parquet = 'parquet' # needs pyarrow
+    CSV = 'csv'
+
+
+class GridScale(StrEnum):
+    """Spacing of a time grid."""
+
+    Linear = 'linear'
+    Log = 'log' # needs a positive start time
+
+
+class HardnessMethod(StrEnum):
+    """Definition of a hardness ratio."""
+
+    Ratio = 'ratio' # H / S
+    Normalised = 'normalised' # (H - S) / (H + S)
+
+
+class SharedBackend(StrEnum):
+    """Memory shared between processes."""
+
+    SharedMemory = 'shared_memory' # multiprocessing.shared_memory block
+    MemoryMap = 'memory_map' # memory-mapped temporary file
@@ -0,0 +1,182 @@
+"""Concurrent fetcher for several GRBs and products."""
+
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.data_source import DataSource
+from gamma_burst.eumerations import ProductType
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectra import XRTSpectra
+
+FETCHABLE_PRODUCTS = (ProductType.Light_Curve, ProductType.Spectra, ProductType.Burst_Analyser)
+
+
+class RateLimiter:
+    """Token bucket limiting the number of requests per second across threads."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Create a rate limiter.
+
+        Args:
+            rate (float): Sustained number of requests per second.
+            burst (int): Number of requests allowed back to back.
+
+        """
+        if rate <= 0:
+            raise ValueError('Rate should be strictly positive')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of the fetch of one product for one GRB."""
+
+    grb_name: str
+    product: ProductType
+    success: bool
+    attempts: int
+    duration: float
+    error: str | None = None
+
+
+@dataclass
+class FetchReport:
+    """Summary of a batch fetch."""
+
+    results: list[FetchResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> list[FetchResult]:
+        """Results of the products fetched."""
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> list[FetchResult]:
+        """Results of the products in error."""
+        return [result for result in self.results if not result.success]
+
+    def summary(self) -> str:
+        """Human readable summary of the batch."""
+        lines = [
+            f'Fetched {len(self.succeeded)}/{len(self.results)} products in {self.duration:.1f}s '
+            f'({sum(result.attempts for result in self.results)} requests)'
+        ]
+        lines.extend(f'  FAILED {result.grb_name} {result.product}: {result.error}' for result in self.failed)
+        return '\n'.join(lines)
+
+
+def fetch_product(grb_name: str, product: ProductType, client: DataSource | None = None) -> object:
+    """Fetch (or read from cache) one product of a GRB.
+
+    Args:
+        grb_name (str): GRB's name.
+        product (ProductType): Product to fetch.
+        client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+
+    Returns:
+        object: Product data.
+
+    """
+    match product:
+        case ProductType.Light_Curve:
+            return XRTLightCurve(grb_name, client=client).lc_data
+        case ProductType.Spectra:
+            return XRTSpectra(grb_name, client=client).s_data
+        case ProductType.Burst_Analyser:
+            return BurstAnalyser(grb_name, client=client).recover_burst_analyser_data()
+    raise ValueError(f'Unknown product {product}')
+
+
+def print_progress(result: FetchResult, nb_done: int, nb_total: int) -> None:
+    """Default progress callback of :func:`fetch_many`."""
+    status = 'ok' if result.success else f'FAILED ({result.error})'
+    print(f'[{nb_done}/{nb_total}] {result.grb_name} {result.product}: {status} '
+          f'({result.attempts} attempt(s), {result.duration:.1f}s)')
+
+
+def fetch_many(
+        grb_names: Iterable[str],
+        products: Iterable[ProductType] = FETCHABLE_PRODUCTS,
+        *,
+        max_workers: int = 8,
+        rate_limit: float | None = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        client: DataSource | None = None,
+        progress: Callable[[FetchResult, int, int], None] | None = print_progress,
+    ) -> FetchReport:
+    """Fetch several products of several GRBs concurrently.
+
+    Each (GRB, product) pair is fetched in a thread pool. Failed fetches are
+    retried with an exponential backoff (with jitter), and every attempt goes
+    through a shared rate limiter to stay polite with the UKSSDC servers.
+
+    Args:
+        grb_names (Iterable[str]): GRBs' names.
+        products (Iterable[ProductType]): Products to fetch for every GRB.
+        max_workers (int): Maximum number of concurrent fetches.
+        rate_limit (float | None): Maximum number of attempts per second, unlimited if None.
+        max_retries (int): Number of retries after a failed attempt.
+        backoff (float): Delay before the first retry in seconds, doubled for every retry.
+        max_backoff (float): Maximum delay between two retries in seconds.
+        client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+        progress (Callable | None): Called with each result, the number of finished and total fetches.
+
+    Returns:
+        FetchReport: Result of every fetch.
+
+    """
+    limiter = RateLimiter(rate_limit, burst=max_workers) if rate_limit is not None else None
+    tasks = [(grb_name, ProductType(product)) for grb_name in grb_names for product in products]
+
+    def run(grb_name: str, product: ProductType) -> FetchResult:
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                fetch_product(grb_name, product, client)
+                return FetchResult(grb_name, product, True, attempt, time.monotonic() - start)
+            except Exception as error:
+                if attempt > max_retries:
+                    return FetchResult(grb_name, product, False, attempt, time.monotonic() - start, repr(error))
+                delay = min(max_backoff, backoff * 2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))  # noqa: S311
+
+    report = FetchReport()
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, grb_name, product) for grb_name, product in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            report.results.append(result)
+            if progress is not None:
+                progress(result, len(report.results), len(tasks))
+    report.duration = time.monotonic() - start
+    return report
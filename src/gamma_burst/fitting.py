@@ -0,0 +1,400 @@
+"""Batched spectral fitting.
+
+Many spectra (e.g. every time slice of a burst) are fitted at once: the
+Levenberg-Marquardt iterations work on arrays of shape (nb_spectra, ...)
+and the models of :mod:`gamma_burst.spectral_models` are integrated over
+every energy channel with a vectorized quadrature. Several starting points
+are tried for every spectrum, spread across a process pool, and the best
+fit of each spectrum is kept.
+
+Fits are made without instrument response: values are fluxes, or counts
+already corrected for the effective area. A fit needs more channels than
+free parameters, a fit without any degree of freedom being rejected.
+
+The Burst Analyser bands are not fitted: their XRT band is extrapolated by
+the UKSSDC from the BAT band with the hardness ratio photon index, so a fit
+would only give back that index.
+"""
+
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+
+from gamma_burst.eumerations import FitStatistic
+from gamma_burst.spectral_models import KEV_TO_ERG, band, cutoff_power_law, power_law
+
+BAND_ENERGIES = {'BATBand': (15.0, 150.0), 'XRTBand': (0.3, 10.0)}
+MAX_DAMPING = 1e10  # Levenberg-Marquardt damping at which a fit is considered stuck
+
+
+@dataclass(frozen=True)
+class FitModel:
+    """Spectral model with its fitted parameterisation.
+
+    Parameters flagged in ``log_params`` are fitted in log10. The first
+    parameter is always the amplitude, started from its linear best fit.
+    ``start_low`` and ``start_high`` bound the random starting points, in
+    the fitted parameterisation.
+    """
+
+    function: Callable[..., np.ndarray]
+    param_names: tuple[str, ...]
+    log_params: tuple[bool, ...]
+    start_low: tuple[float, ...]
+    start_high: tuple[float, ...]
+
+
+MODELS = {
+    'power_law': FitModel(power_law, ('amplitude', 'index'), (True, False), (0.0, -3.0), (0.0, -0.5)),
+    'cutoff_power_law': FitModel(
+        cutoff_power_law,
+        ('amplitude', 'alpha', 'epeak'),
+        (True, False, True),
+        (0.0, -1.8, 1.0),
+        (0.0, 0.0, 3.5),
+    ),
+    'band': FitModel(
+        band,
+        ('amplitude', 'alpha', 'beta', 'epeak'),
+        (True, False, False, True),
+        (0.0, -1.8, -4.0, 1.0),
+        (0.0, 0.0, -2.1, 3.5),
+    ),
+}
+
+
+@dataclass
+class SpectralData:
+    """Spectra binned in energy channels.
+
+    Args:
+        e_min (np.ndarray): Lower bound of every channel in keV, shape (nb_channels,).
+        e_max (np.ndarray): Upper bound of every channel in keV, shape (nb_channels,).
+        values (np.ndarray): Photon fluxes (ph/cm2/s), energy fluxes (erg/cm2/s) if ``energy_flux``,
+            or counts for the C-stat, shape (nb_spectra, nb_channels).
+        errors (np.ndarray | None): 1 sigma errors of the values, needed for the chi2.
+        exposure (np.ndarray | None): Exposure of every spectrum in seconds, counts being
+            predicted as photon flux times exposure (1 s if None).
+        energy_flux (bool): Values are energy fluxes.
+
+    """
+
+    e_min: np.ndarray
+    e_max: np.ndarray
+    values: np.ndarray
+    errors: np.ndarray | None = None
+    exposure: np.ndarray | None = None
+    energy_flux: bool = False
+
+    @property
+    def nb_spectra(self) -> int:
+        """Number of spectra."""
+        return self.values.shape[0]
+
+    @property
+    def nb_channels(self) -> int:
+        """Number of energy channels of every spectrum."""
+        return self.values.shape[1]
+
+
+@dataclass
+class FitResult:
+    """Best fits of every spectrum.
+
+    ``params`` and ``errors`` have shape (nb_spectra, nb_params) in natural
+    units, errors of fixed parameters being NaN. ``covariance`` has shape
+    (nb_spectra, nb_free_params, nb_free_params).
+    """
+
+    model: str
+    statistic: FitStatistic
+    param_names: tuple[str, ...]
+    free_params: tuple[str, ...]
+    params: np.ndarray
+    errors: np.ndarray
+    covariance: np.ndarray
+    fit_statistic: np.ndarray
+    dof: int
+    converged: np.ndarray
+
+    @property
+    def reduced_statistic(self) -> np.ndarray:
+        """Fit statistic per degree of freedom."""
+        return self.fit_statistic / self.dof if self.dof > 0 else np.full_like(self.fit_statistic, np.nan)
+
+    def param(self, name: str) -> np.ndarray:
+        """Best fit values of one parameter for every spectrum."""
+        return self.params[:, self.param_names.index(name)]
+
+
+class _Problem:
+    """Fitted model, data and statistic of a batch of spectra."""
+
+    def __init__(self, model: str, data: SpectralData, statistic: FitStatistic, free: np.ndarray, nb_quad: int) -> None:
+        self.model = MODELS[model]
+        self.data = data
+        self.statistic = FitStatistic(statistic)
+        self.free = free
+        self.log_params = np.array(self.model.log_params)
+        fractions = np.linspace(0, 1, nb_quad)
+        log_energy = np.log(data.e_min)[:, None] + fractions * np.log(data.e_max / data.e_min)[:, None]
+        self.energy = np.exp(log_energy)
+        self.dlog_energy = np.diff(log_energy, axis=-1)
+        self.scale = KEV_TO_ERG if data.energy_flux else 1.0
+
+    def natural(self, theta: np.ndarray) -> np.ndarray:
+        with np.errstate(over='ignore'):
+            return np.where(self.log_params, 10.0**theta, theta)
+
+    def predict(self, theta: np.ndarray, exposure: np.ndarray | None) -> np.ndarray:
+        """Model values of every channel, ``theta`` having shape (nb_problems, nb_params)."""
+        params = self.natural(theta)
+        with np.errstate(all='ignore'):
+            spectrum = self.model.function(self.energy.ravel(), *params.T)
+            spectrum = spectrum.reshape(theta.shape[:-1] + self.energy.shape)
+            integrand = spectrum * self.energy ** (1 + self.data.energy_flux)
+            flux = 0.5 * np.sum((integrand[..., 1:] + integrand[..., :-1]) * self.dlog_energy, axis=-1) * self.scale
+        if exposure is not None:
+            flux = flux * exposure[:, None]
+        return flux
+
+    def evaluate(self, model: np.ndarray, values: np.ndarray, errors: np.ndarray | None) -> tuple[np.ndarray, ...]:
+        """Statistic, its derivative with respect to the model and the Fisher weights."""
+        with np.errstate(all='ignore'):
+            if self.statistic == FitStatistic.Chi2:
+                inv_var = 1 / errors**2
+                residual = values - model
+                return np.sum(residual**2 * inv_var, axis=-1), -2 * residual * inv_var, 2 * inv_var
+            log_term = np.where(values > 0, values * np.log(values / model), 0.0)
+            stat = 2 * np.sum(model - values + log_term, axis=-1)
+            return stat, 2 * (1 - values / model), 2 / model
+
+    def linearised(
+            self,
+            theta: np.ndarray,
+            values: np.ndarray,
+            errors: np.ndarray | None,
+            exposure: np.ndarray | None
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Statistic, gradient and approximate Hessian with respect to the free parameters."""
+        model = self.predict(theta, exposure)
+        stat, d_stat, weights = self.evaluate(model, values, errors)
+        free_idx = np.flatnonzero(self.free)
+        jacobian = np.empty((*model.shape, len(free_idx)))
+        with np.errstate(all='ignore'):
+            for column, idx in enumerate(free_idx):
+                step = 1e-6 * (1 + np.abs(theta[:, idx]))
+                shifted = theta.copy()
+                shifted[:, idx] += step
+                jacobian[..., column] = (self.predict(shifted, exposure) - model) / step[:, None]
+            gradient = np.einsum('bcp,bc->bp', jacobian, d_stat)
+            hessian = np.einsum('bcp,bc,bcq->bpq', jacobian, weights, jacobian)
+        return stat, gradient, hessian
+
+
+def _levenberg_marquardt(
+        problem: _Problem,
+        theta: np.ndarray,
+        values: np.ndarray,
+        errors: np.ndarray | None,
+        exposure: np.ndarray | None,
+        *,
+        max_iter: int,
+        tol: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Minimise the statistic of every problem of the batch at once.
+
+    Only the problems that have not converged yet are evaluated at each
+    iteration, and the Jacobian is only updated after an accepted step.
+    """
+    free_idx = np.flatnonzero(problem.free)
+    nb_free = len(free_idx)
+    damping = np.full(len(theta), 1e-3)
+    converged = np.zeros(len(theta), dtype=bool)
+    stat, gradient, hessian = problem.linearised(theta, values, errors, exposure)
+
+    def subset(array: np.ndarray | None, active: np.ndarray) -> np.ndarray | None:
+        return array[active] if array is not None else None
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if len(active) == 0:
+            break
+        diagonal = np.diagonal(hessian[active], axis1=-2, axis2=-1)
+        floor = 1e-12 * np.maximum(np.nanmax(np.abs(diagonal), axis=-1, initial=0.0), 1e-300)
+        system = hessian[active] + (damping[active, None] * diagonal + floor[:, None])[..., None] * np.eye(nb_free)
+        system = np.nan_to_num(system)
+        active_gradient = np.nan_to_num(gradient[active])
+        try:
+            delta = -np.linalg.solve(system, active_gradient[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            delta = -np.einsum('bpq,bq->bp', np.linalg.pinv(system), active_gradient)
+
+        trial = theta[active]
+        trial[:, free_idx] += delta
+        active_values, active_errors = values[active], subset(errors, active)
+        active_exposure = subset(exposure, active)
+        trial_stat = problem.evaluate(problem.predict(trial, active_exposure), active_values, active_errors)[0]
+        accepted = trial_stat < stat[active]
+        improvement = np.where(accepted, stat[active] - trial_stat, 0.0)
+        small_step = np.all(np.abs(delta) <= tol * (1 + np.abs(theta[active][:, free_idx])), axis=-1)
+
+        moved = active[accepted]
+        theta[moved] = trial[accepted]
+        if len(moved):
+            stat[moved], gradient[moved], hessian[moved] = problem.linearised(
+                theta[moved], values[moved], subset(errors, moved), subset(exposure, moved)
+            )
+        damping[active] = np.where(accepted, damping[active] / 10, damping[active] * 10)
+        converged[active] = (
+            (accepted & ((improvement < tol * (1 + stat[active])) | small_step)) | (damping[active] > MAX_DAMPING)
+        )
+    return theta, stat, converged
+
+
+def _fit_starts(
+        model: str,
+        data: SpectralData,
+        statistic: FitStatistic,
+        free: np.ndarray,
+        starts: np.ndarray,
+        *,
+        max_iter: int,
+        tol: float,
+        nb_quad: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fit every spectrum from each starting point, ``starts`` having shape (nb_starts, nb_spectra, nb_params)."""
+    problem = _Problem(model, data, statistic, free, nb_quad)
+    nb_starts = starts.shape[0]
+    values = np.tile(data.values, (nb_starts, 1))
+    errors = np.tile(data.errors, (nb_starts, 1)) if data.errors is not None else None
+    exposure = np.tile(data.exposure, nb_starts) if data.exposure is not None else None
+    theta, stat, converged = _levenberg_marquardt(
+        problem, starts.reshape(-1, starts.shape[-1]).copy(), values, errors, exposure, max_iter=max_iter, tol=tol
+    )
+    shape = starts.shape[:2]
+    return theta.reshape(starts.shape), stat.reshape(shape), converged.reshape(shape)
+
+
+def _starting_points(
+        problem: _Problem,
+        fixed: dict[str, float],
+        nb_starts: int,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+    """Random starting points, the first one at the center of the ranges, amplitudes from a linear fit."""
+    model = problem.model
+    data = problem.data
+    low, high = np.array(model.start_low), np.array(model.start_high)
+    starts = rng.uniform(low, high, (nb_starts, data.nb_spectra, len(low)))
+    starts[0] = (low + high) / 2
+    for name, value in fixed.items():
+        idx = model.param_names.index(name)
+        starts[..., idx] = np.log10(value) if model.log_params[idx] else value
+
+    if problem.free[0]:
+        # The model is linear in the amplitude: start from its best value given the other parameters
+        flat = starts.reshape(-1, len(low)).copy()
+        flat[:, 0] = 0.0
+        exposure = np.tile(data.exposure, nb_starts) if data.exposure is not None else None
+        shape = problem.predict(flat, exposure).reshape(nb_starts, data.nb_spectra, -1)
+        with np.errstate(all='ignore'):
+            if problem.statistic == FitStatistic.Chi2:
+                weights = 1 / data.errors**2
+                amplitude = np.sum(data.values * shape * weights, axis=-1) / np.sum(shape**2 * weights, axis=-1)
+            else:
+                amplitude = np.sum(data.values, axis=-1) / np.sum(shape, axis=-1)
+        amplitude = np.where(np.isfinite(amplitude) & (amplitude > 0), amplitude, 1e-30)
+        starts[..., 0] = np.log10(amplitude)
+    return starts
+
+
+def fit_spectra(
+        data: SpectralData,
+        model: str = 'power_law',
+        statistic: FitStatistic = FitStatistic.Chi2,
+        *,
+        fixed: dict[str, float] | None = None,
+        nb_starts: int = 8,
+        max_workers: int | None = None,
+        max_iter: int = 200,
+        tol: float = 1e-6,
+        nb_quad: int = 16,
+        seed: int | None = None,
+    ) -> FitResult:
+    """Fit a spectral model to every spectrum of a batch.
+
+    Args:
+        data (SpectralData): Spectra to fit.
+        model (str): Key of :data:`MODELS`.
+        statistic (FitStatistic): Chi2 for Gaussian errors, C-stat for Poisson counts.
+        fixed (dict[str, float] | None): Parameters kept at a given value.
+        nb_starts (int): Number of starting points tried for every spectrum.
+        max_workers (int | None): Processes sharing the starting points, the number of CPUs if None,
+            1 to fit in the current process.
+        max_iter (int): Maximum number of Levenberg-Marquardt iterations.
+        tol (float): Relative improvement of the statistic below which a fit has converged.
+        nb_quad (int): Number of energies of the quadrature of each channel.
+        seed (int | None): Seed of the random starting points.
+
+    Returns:
+        FitResult: Best fit of every spectrum.
+
+    """
+    if model not in MODELS:
+        raise ValueError(f'Unknown model {model}, should be in {list(MODELS)}')
+    statistic = FitStatistic(statistic)
+    fixed = fixed or {}
+    fit_model = MODELS[model]
+    unknown = set(fixed) - set(fit_model.param_names)
+    if unknown:
+        raise ValueError(f'Unknown parameters {sorted(unknown)} for model {model}')
+    if statistic == FitStatistic.Chi2 and data.errors is None:
+        raise ValueError('Errors are needed to compute the chi2')
+    free = np.array([name not in fixed for name in fit_model.param_names])
+    dof = data.nb_channels - int(free.sum())
+    if dof <= 0:
+        raise ValueError(
+            f'Underdetermined fit: {data.nb_channels} channel(s) for {int(free.sum())} free parameters '
+            'leave no degree of freedom, fix some parameters'
+        )
+
+    problem = _Problem(model, data, statistic, free, nb_quad)
+    starts = _starting_points(problem, fixed, nb_starts, np.random.default_rng(seed))
+    nb_workers = min(max_workers or os.cpu_count() or 1, nb_starts)
+    fit_starts = partial(_fit_starts, model, data, statistic, free, max_iter=max_iter, tol=tol, nb_quad=nb_quad)
+    if nb_workers <= 1:
+        theta, stat, converged = fit_starts(starts)
+    else:
+        with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+            chunks = list(executor.map(fit_starts, np.array_split(starts, nb_workers)))
+        theta, stat, converged = (np.concatenate(parts) for parts in zip(*chunks, strict=True))
+
+    spectra = np.arange(data.nb_spectra)
+    best = np.argmin(np.where(np.isfinite(stat), stat, np.inf), axis=0)
+    best_theta = theta[best, spectra]
+    best_stat, _, hessian = problem.linearised(best_theta, data.values, data.errors, data.exposure)
+
+    free_idx = np.flatnonzero(free)
+    covariance = 2 * np.linalg.pinv(np.nan_to_num(hessian))
+    params = problem.natural(best_theta)
+    derivative = np.where(problem.log_params, params * np.log(10), 1.0)[:, free_idx]
+    covariance = covariance * derivative[:, :, None] * derivative[:, None, :]
+    errors = np.full(params.shape, np.nan)
+    errors[:, free_idx] = np.sqrt(np.diagonal(covariance, axis1=-2, axis2=-1))
+    return FitResult(
+        model=model,
+        statistic=statistic,
+        param_names=fit_model.param_names,
+        free_params=tuple(name for name, is_free in zip(fit_model.param_names, free, strict=True) if is_free),
+        params=params,
+        errors=errors,
+        covariance=covariance,
+        fit_statistic=best_stat,
+        dof=dof,
+        converged=converged[best, spectra],
+    )
@@ -1,8 +1,14 @@
-from pathlib import Path
-from time import sleep
-import pandas as pd
-import swifttools.ukssdc.data.GRB as udg
-import pickle
+"""Recover rebinned light curves, through the cache and the rebin scheduler."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gamma_burst.cache_manager import CacheManager, get_cache_manager
+from gamma_burst.cache_policy import load_pickle, save_pickle
+from gamma_burst.data_source import cache_params
+from gamma_burst.eumerations import ProductType
+from gamma_burst.rebin_scheduler import RebinRequest, RebinScheduler, get_rebin_scheduler
+from gamma_burst.spectra import XRTSpectra
+
 
 def recover_rebinned_light_curves(
         grb_name: str,
@@ -11,68 +17,73 @@ def recover_rebinned_light_curves(
         soft_min: float, 
         soft_max: float, 
         hard_min: float, 
-        hard_max: float
+        hard_max: float,
+        cache: CacheManager | None = None,
+        scheduler: RebinScheduler | None = None,
     ) -> dict:
     """Recover light curve data.
 
+    Every rebin parameter is part of the cache key, so two binnings of the
+    same GRB never share a cache entry. Missing light curves are rebinned by
+    the shared :class:`RebinScheduler`, so calls made from several threads
+    wait for their jobs concurrently.
+
     Args:
         grb_name (str): GRB's name.
+        bin_size (float): Bin size in seconds.
+        min_snr (float): Minimum signal-to-noise ratio of a bin.
+        soft_min (float): Lower energy of the soft band in keV.
+        soft_max (float): Upper energy of the soft band in keV.
+        hard_min (float): Lower energy of the hard band in keV.
+        hard_max (float): Upper energy of the hard band in keV.
+        cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+        scheduler (RebinScheduler | None): Scheduler running the rebin job, the shared one if None.
+
     """
-    home_path = Path.home().joinpath(".gamma_burst")
-    if not home_path.exists():
-        home_path.mkdir(parents=True, exist_ok=True)
-    
-    folder_path = home_path.joinpath(f"rebinned_{grb_name}_{min_snr}_{soft_min}_{soft_max}_{hard_min}_{hard_max}").joinpath('light_curve')
-    
-    cache_file = folder_path / 'lc_data.pkl'
-    
-    if not cache_file.exists():
-        folder_path.mkdir(parents=True, exist_ok=True)
-        job_id = udg.rebinLightCurve(
-            GRBName=grb_name,
-            verbose=True,
-            binMeth='time',
-            pcCounts=15,
-            wtCounts=15,
-            dynamic=True,
-            pcMaxGap=bin_size,
-            wtMaxGap=bin_size,
-            minSNR=min_snr,
-            softLo=soft_min,
-            softHi=soft_max,
-            hardLo=hard_min,
-            hardHi=hard_max,
-            wtBinTime=2.51,
-            pcBinTime=0.5,
-            minCounts=15,
-            binFact=1.5,
-            rateFact=10,
-            minEnergy=soft_min,
-            maxEnergy=hard_max,
-            pcHRBinTime=bin_size,
-            wtHRBinTime=bin_size,
-            returnData=True,
-            saveData=False,
-            silent=False
-        )
-        i=0
-        while not udg.rebinComplete(job_id):
-            if udg.checkRebinStatus(job_id)['statusText'] not in ['Running', 'Queued', 'Complete']:
-                raise ValueError(f"Error : Rebinning status {udg.checkRebinStatus(job_id)['statusText']}")
-            sleep(1)
-            i+=1
-            print(f'Waited {i}s')
-        lc_data = udg.getRebinnedLightCurve(job_id)
-        if lc_data is None:
-            raise ValueError("Null lc_data")
-        with open(cache_file, 'wb') as f:
-            pickle.dump(lc_data, f)
-    else:
-        with open(cache_file, 'rb') as f:
-            lc_data = pickle.load(f)
-        
-    
-    return lc_data
+    request = RebinRequest(grb_name, bin_size, min_snr, soft_min, soft_max, hard_min, hard_max)
+    return _recover_rebinned_light_curve(request, cache, scheduler)
+
+def recover_many_rebinned_light_curves(
+        requests: list[RebinRequest],
+        cache: CacheManager | None = None,
+        scheduler: RebinScheduler | None = None,
+        max_workers: int | None = None,
+    ) -> list[dict]:
+    """Recover several rebinned light curves, e.g. a sweep over bin sizes or SNR.
+
+    The rebin jobs missing from the cache wait on the server at the same
+    time, up to ``max_workers`` at once, instead of one after the other.
+
+    Args:
+        requests (list[RebinRequest]): Light curves to recover.
+        cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+        scheduler (RebinScheduler | None): Scheduler running the rebin jobs, the shared one if None.
+        max_workers (int | None): Number of threads waiting for the jobs, 8 if None.
+
+    Returns:
+        list[dict]: Light curve data, in the order of the requests.
+
+    """
+    if not requests:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(requests), max_workers or 8)) as executor:
+        return list(executor.map(lambda request: _recover_rebinned_light_curve(request, cache, scheduler), requests))
+
+def _recover_rebinned_light_curve(
+        request: RebinRequest,
+        cache: CacheManager | None,
+        scheduler: RebinScheduler | None,
+    ) -> dict:
+    cache = cache if cache is not None else get_cache_manager()
+    scheduler = scheduler if scheduler is not None else get_rebin_scheduler()
+    return cache.load_or_fetch(
+        product=ProductType.Rebinned_Light_Curve,
+        params=cache_params(request.params(), scheduler.client),
+        file_name='lc_data.pkl',
+        fetch=lambda entry_path: scheduler.submit(request).result(),
+        load=load_pickle,
+        save=save_pickle,
+    )
 
 def recover_spectra(grb_name: str) -> dict:
     """Recover spectra data.
@@ -80,44 +91,10 @@ def recover_spectra(grb_name: str) -> dict:
     Args:
         grb_name (str): GRB's name.
     """
-    home_path = Path.home().joinpath(".gamma_burst")
-    if not home_path.exists():
-        home_path.mkdir(parents=True, exist_ok=True)
-    
-    folder_path = home_path.joinpath(grb_name).joinpath('spectra')
-    
-    cache_file = folder_path / 'spectra_data.pkl'
-    
-    if not folder_path.exists():
-        folder_path.mkdir(parents=True, exist_ok=True)
-        
-        spectra_data = udg.getSpectra(
-            GRBName=grb_name,
-            returnData=True,
-            saveData=True,
-            silent=False
-        )
-        
-        with open(cache_file, 'wb') as f:
-            pickle.dump(spectra_data, f)
-    else:
-        if cache_file.exists():
-            with open(cache_file, 'rb') as f:
-                spectra_data = pickle.load(f)
-        else:
-            spectra_data = udg.getSpectra(
-                GRBName=grb_name,
-                destDir=folder_path,
-                returnData=True,
-                saveData=True,
-                silent=False
-            )
-            with open(cache_file, 'wb') as f:
-                pickle.dump(spectra_data, f)
-    
-    return spectra_data
+    return XRTSpectra(grb_name).s_data
 
 def print_fields(dict):
+    import pandas as pd  # noqa: PLC0415
     for key in dict:
         data = dict[key]
         if isinstance(data, pd.DataFrame):
@@ -0,0 +1,253 @@
+"""Hardness ratios computed locally from soft and hard band light curves.
+
+The UKSSDC ``HR`` tables come with the binning chosen by the server. Here the
+ratio is computed from the band light curves themselves (``WTSoft`` /
+``WTHard``, ``PCSoft`` / ``PCHard``), optionally after grouping the bins until
+the summed band reaches a signal to noise ratio, so a new binning needs no
+rebin job.
+
+The XRT band of a Burst Analyser binning is extrapolated from its BAT band
+with the photon index of every bin, so the two bands carry the same noise:
+their ratio and its errors follow from the photon index alone
+(:func:`photon_index_hardness_ratios`), not from independent band errors.
+
+Several pairs of bands are grouped separately but their ratios and errors
+are computed in a single vectorised pass over the concatenated bins.
+"""
+
+from collections.abc import Mapping
+from typing import TypeVar
+
+import numpy as np
+
+from gamma_burst.containers import LightCurve, SpectralSeries
+from gamma_burst.eumerations import HardnessMethod
+from gamma_burst.rebinning import combine_bins, min_snr_starts
+from gamma_burst.spectral_models import band_ratio
+
+_K = TypeVar('_K', bound=str)
+
+
+def hardness_ratio(
+        soft: np.ndarray,
+        hard: np.ndarray,
+        soft_error: np.ndarray,
+        hard_error: np.ndarray,
+        method: HardnessMethod = HardnessMethod.Ratio
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Hardness ratio of band rates and its first order error, for arrays of any shape.
+
+    Args:
+        soft (np.ndarray): Soft band rates.
+        hard (np.ndarray): Hard band rates.
+        soft_error (np.ndarray): Soft band rate errors.
+        hard_error (np.ndarray): Hard band rate errors.
+        method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Hardness ratio and its error, NaN where undefined.
+
+    """
+    soft, hard = np.asarray(soft, dtype=float), np.asarray(hard, dtype=float)
+    soft_error, hard_error = np.asarray(soft_error, dtype=float), np.asarray(hard_error, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == HardnessMethod.Ratio:
+            ratio = hard / soft
+            error = np.hypot(hard_error / soft, hard * soft_error / soft**2)
+        else:
+            total = hard + soft
+            ratio = (hard - soft) / total
+            error = 2 * np.hypot(soft * hard_error, hard * soft_error) / total**2
+    defined = np.isfinite(ratio)
+    return np.where(defined, ratio, np.nan), np.where(defined, error, np.nan)
+
+
+def _group(soft: LightCurve, hard: LightCurve, min_snr: float | None) -> tuple[LightCurve, LightCurve]:
+    if len(soft) != len(hard) or not np.allclose(soft.time, hard.time):
+        raise ValueError('Soft and hard bands should share their time bins')
+    if min_snr is None or len(soft) == 0:
+        return soft, hard
+    if soft.error is None or hard.error is None:
+        raise ValueError('Minimum SNR binning needs rate errors')
+    error = np.hypot(soft.error, hard.error)
+    total = LightCurve(
+        soft.time,
+        time_pos=soft.time_pos,
+        time_neg=soft.time_neg,
+        rate=soft.rate + hard.rate,
+        rate_pos=error,
+        rate_neg=-error,
+    )
+    starts = min_snr_starts(total, min_snr)
+    return combine_bins(soft, starts), combine_bins(hard, starts)
+
+
+def hardness_ratios(
+        bands: Mapping[_K, tuple[LightCurve, LightCurve]],
+        method: HardnessMethod = HardnessMethod.Ratio,
+        min_snr: float | None = None,
+        time_scale: tuple[float, float] | None = None
+    ) -> dict[_K, LightCurve]:
+    """Hardness ratio light curves of several pairs of bands.
+
+    Args:
+        bands (Mapping[str, tuple[LightCurve, LightCurve]]): Soft and hard band light curves
+            sharing their time bins, by name (e.g. ``{'WT': (wt_soft, wt_hard), 'PC': ...}``).
+        method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+        min_snr (float | None): Group consecutive bins until the summed band reaches this
+            signal to noise ratio, keep the bins if None.
+        time_scale (tuple[float, float] | None): Time window (start, stop).
+
+    Returns:
+        dict[str, LightCurve]: Hardness ratio light curves by name, the ratio as rate
+            and its symmetric error as rate errors.
+
+    """
+    grouped = {
+        name: _group(soft.window(time_scale), hard.window(time_scale), min_snr)
+        for name, (soft, hard) in bands.items()
+    }
+    if not grouped:
+        return {}
+    columns = []
+    for soft, hard in grouped.values():
+        soft_error = soft.error if soft.error is not None else np.zeros(len(soft))
+        hard_error = hard.error if hard.error is not None else np.zeros(len(hard))
+        columns.append((soft.rate, hard.rate, soft_error, hard_error))
+    soft_rate, hard_rate, soft_error, hard_error = (np.concatenate(column) for column in zip(*columns, strict=True))
+    ratio, error = hardness_ratio(soft_rate, hard_rate, soft_error, hard_error, method=method)
+    splits = np.cumsum([len(soft) for soft, _ in grouped.values()])[:-1]
+
+    results = {}
+    band_ratios, band_errors = np.split(ratio, splits), np.split(error, splits)
+    for (name, (soft, _)), band_hr, band_error in zip(grouped.items(), band_ratios, band_errors, strict=True):
+        results[name] = LightCurve(
+            soft.time,
+            time_pos=soft.time_pos,
+            time_neg=soft.time_neg,
+            rate=band_hr,
+            rate_pos=band_error,
+            rate_neg=-band_error,
+        )
+    return results
+
+
+def photon_index_hardness_ratio(
+        gamma: np.ndarray,
+        gamma_pos: np.ndarray,
+        gamma_neg: np.ndarray,
+        soft_band: tuple[float, float],
+        hard_band: tuple[float, float],
+        *,
+        method: HardnessMethod = HardnessMethod.Ratio
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Energy flux hardness ratio of power law spectra and its errors, from their photon index.
+
+    The ratio is monotonic in the photon index, so its errors are the ratios
+    at the bounds of the photon index interval.
+
+    Args:
+        gamma (np.ndarray): Photon indices.
+        gamma_pos (np.ndarray): Positive photon index errors.
+        gamma_neg (np.ndarray): Negative photon index errors.
+        soft_band (tuple[float, float]): Soft band (min, max) in keV.
+        hard_band (tuple[float, float]): Hard band (min, max) in keV.
+        method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Hardness ratio, its positive error and its negative error.
+
+    """
+    gamma = np.asarray(gamma, dtype=float)
+
+    def ratio(index: np.ndarray) -> np.ndarray:
+        hard_over_soft = band_ratio(index, soft_band, hard_band)
+        if method == HardnessMethod.Ratio:
+            return hard_over_soft
+        return (hard_over_soft - 1) / (hard_over_soft + 1)
+
+    value = ratio(gamma)
+    bounds = np.stack([ratio(gamma + np.asarray(gamma_pos)), ratio(gamma + np.asarray(gamma_neg))])
+    return value, bounds.max(axis=0) - value, bounds.min(axis=0) - value
+
+
+def _mean_photon_index(series: SpectralSeries, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Inverse-variance weighted mean photon index of groups of bins and its error."""
+    error = series.gamma_error
+    if error is None:
+        sizes = np.diff(np.append(starts, len(series)))
+        return np.add.reduceat(series.gamma, starts) / sizes, np.zeros(len(starts))
+    with np.errstate(divide='ignore'):
+        weights = np.where((error > 0) & np.isfinite(series.gamma), 1 / error**2, 0.0)
+    total = np.add.reduceat(weights, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gamma = np.add.reduceat(weights * np.nan_to_num(series.gamma), starts) / total
+        return np.where(total > 0, gamma, np.nan), np.where(total > 0, 1 / np.sqrt(total), np.nan)
+
+
+def photon_index_hardness_ratios(
+        bands: Mapping[_K, tuple[LightCurve, SpectralSeries]],
+        soft_band: tuple[float, float],
+        hard_band: tuple[float, float],
+        *,
+        method: HardnessMethod = HardnessMethod.Ratio,
+        min_snr: float | None = None,
+        time_scale: tuple[float, float] | None = None
+    ) -> dict[_K, LightCurve]:
+    """Hardness ratio light curves of binnings whose bands follow from a power law of every bin.
+
+    Grouped bins get the inverse-variance weighted mean photon index of their bins.
+
+    Args:
+        bands (Mapping[str, tuple[LightCurve, SpectralSeries]]): Light curve and power law
+            parameters sharing their time bins, by name.
+        soft_band (tuple[float, float]): Soft band (min, max) in keV.
+        hard_band (tuple[float, float]): Hard band (min, max) in keV.
+        method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+        min_snr (float | None): Group consecutive bins until the light curve reaches this
+            signal to noise ratio, keep the bins if None.
+        time_scale (tuple[float, float] | None): Time window (start, stop).
+
+    Returns:
+        dict[str, LightCurve]: Hardness ratio light curves by name, the ratio as rate
+            and its asymmetric errors as rate errors.
+
+    """
+    grouped = {}
+    for name, (band, band_series) in bands.items():
+        light_curve, series = band.window(time_scale), band_series.window(time_scale)
+        if len(light_curve) != len(series) or not np.allclose(light_curve.time, series.time):
+            raise ValueError('Light curves and spectral series should share their time bins')
+        if series.gamma is None:
+            raise ValueError(f'No photon index in {name}')
+        gamma_pos = series.gamma_pos if series.gamma_pos is not None else np.zeros(len(series))
+        gamma_neg = series.gamma_neg if series.gamma_neg is not None else np.zeros(len(series))
+        gamma = series.gamma
+        if min_snr is not None and len(light_curve) > 0:
+            starts = min_snr_starts(light_curve, min_snr)
+            light_curve = combine_bins(light_curve, starts)
+            gamma, gamma_pos = _mean_photon_index(series, starts)
+            gamma_neg = -gamma_pos
+        grouped[name] = (light_curve, gamma, gamma_pos, gamma_neg)
+    if not grouped:
+        return {}
+    gamma, gamma_pos, gamma_neg = (
+        np.concatenate(column) for column in zip(*(values[1:] for values in grouped.values()), strict=True)
+    )
+    ratio, ratio_pos, ratio_neg = photon_index_hardness_ratio(
+        gamma, gamma_pos, gamma_neg, soft_band, hard_band, method=method,
+    )
+    splits = np.cumsum([len(light_curve) for light_curve, *_ in grouped.values()])[:-1]
+
+    results = {}
+    splitted = (np.split(ratio, splits), np.split(ratio_pos, splits), np.split(ratio_neg, splits))
+    for (name, (light_curve, *_)), rate, rate_pos, rate_neg in zip(grouped.items(), *splitted, strict=True):
+        results[name] = LightCurve(
+            light_curve.time,
+            time_pos=light_curve.time_pos,
+            time_neg=light_curve.time_neg,
+            rate=rate,
+            rate_pos=rate_pos,
+            rate_neg=rate_neg,
+        )
+    return results
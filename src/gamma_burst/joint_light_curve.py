@@ -0,0 +1,322 @@
+"""BAT and XRT light curves of a GRB on a common time grid.
+
+BAT Burst Analyser rates are 15-150 keV fluxes (count rates times the ECF
+of every bin), XRT rates are 0.3-10 keV count rates. The XRT count rates
+are converted to fluxes with the ECF of the mode's power law spectrum
+(observed flux over mean count rate), then both instruments are brought to
+a common energy band with their power law photon index and resampled onto
+a linear or logarithmic time grid.
+
+Resampling is exposure weighted: the flux of a grid bin is the mean of the
+overlapping source bins weighted by their overlap, its error the quadratic
+sum of the overlap weighted errors. It is computed in one pass over the
+elementary segments delimited by every source and grid edge. The error of
+the XRT ECF is systematic, the same for every bin of a mode, so it is added
+to the resampled errors rather than averaged down with the statistical ones.
+
+Resampled series are cached like the downloaded products, keyed by the grid
+parameters and the versions of the cached products they are built from.
+"""
+
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.cache_manager import CacheManager, get_cache_manager
+from gamma_burst.cache_policy import CachePolicy
+from gamma_burst.containers import JointFluxSeries, LightCurve
+from gamma_burst.data_source import DataSource, get_data_source
+from gamma_burst.eumerations import GridScale, ObservationMode, ProductType
+from gamma_burst.fitting import BAND_ENERGIES
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectra import XRTSpectra
+from gamma_burst.spectral_models import band_ratio
+
+XRT_MODES = (ObservationMode.WT_Mode, ObservationMode.PC_Mode)
+
+
+def time_grid(start: float, stop: float, nb_bins: int, scale: GridScale = GridScale.Log) -> np.ndarray:
+    """Edges of a time grid.
+
+    Args:
+        start (float): Start of the first bin in seconds.
+        stop (float): End of the last bin in seconds.
+        nb_bins (int): Number of bins.
+        scale (GridScale): Linear or logarithmic spacing.
+
+    Returns:
+        np.ndarray: ``nb_bins + 1`` increasing edges.
+
+    """
+    if nb_bins < 1:
+        raise ValueError('Number of bins should be at least 1')
+    if not stop > start:
+        raise ValueError(f'Grid stop {stop} should be after its start {start}')
+    if scale == GridScale.Log:
+        if start <= 0:
+            raise ValueError('Logarithmic grids need a positive start time')
+        return np.geomspace(start, stop, nb_bins + 1)
+    return np.linspace(start, stop, nb_bins + 1)
+
+
+def resample(
+        light_curve: LightCurve,
+        edges: np.ndarray,
+        rate: np.ndarray | None = None,
+        error: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Exposure weighted mean rate of a light curve in the bins of a grid.
+
+    The bins of the light curve should not overlap.
+
+    Args:
+        light_curve (LightCurve): Light curve with time errors.
+        edges (np.ndarray): Increasing edges of the grid.
+        rate (np.ndarray | None): Rates replacing ``light_curve.rate`` (e.g. converted to fluxes).
+        error (np.ndarray | None): Errors replacing ``light_curve.error``.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Rate (NaN where not observed),
+            its error and the observed duration of every grid bin.
+
+    """
+    if light_curve.width is None:
+        raise ValueError('Resampling needs the time errors of the light curve')
+    rate = light_curve.rate if rate is None else rate
+    error = light_curve.error if error is None else error
+    error = np.zeros(len(light_curve)) if error is None else error
+    nb_bins = len(edges) - 1
+    starts = light_curve.time + light_curve.time_neg
+    stops = light_curve.time + light_curve.time_pos
+
+    bounds = np.unique(np.concatenate([starts, stops, edges]))
+    bounds = bounds[(bounds >= edges[0]) & (bounds <= edges[-1])]
+    middles = (bounds[:-1] + bounds[1:]) / 2
+    source = np.searchsorted(starts, middles, side='right') - 1
+    grid = np.searchsorted(edges, middles, side='right') - 1
+    observed = (source >= 0) & (middles < stops[np.maximum(source, 0)]) & (grid >= 0) & (grid < nb_bins)
+    overlap = np.diff(bounds)[observed]
+    source, grid = source[observed], grid[observed]
+
+    exposure = np.bincount(grid, overlap, minlength=nb_bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(grid, rate[source] * overlap, minlength=nb_bins) / exposure
+        mean_error = np.sqrt(np.bincount(grid, (error[source] * overlap) ** 2, minlength=nb_bins)) / exposure
+    mean_error[exposure == 0] = np.nan
+    return mean, mean_error, exposure
+
+
+def _combine(
+        results: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+        nb_bins: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Exposure weighted combination of several resampled light curves of one instrument."""
+    if not results:
+        return np.full(nb_bins, np.nan), np.full(nb_bins, np.nan), np.zeros(nb_bins)
+    if len(results) == 1:
+        return results[0]
+    rates, errors, exposures = (np.stack(values) for values in zip(*results, strict=True))
+    exposure = exposures.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.nansum(rates * exposures, axis=0) / exposure
+        error = np.sqrt(np.nansum((errors * exposures) ** 2, axis=0)) / exposure
+    rate[exposure == 0] = np.nan
+    error[exposure == 0] = np.nan
+    return rate, error, exposure
+
+
+def _save_series(series: JointFluxSeries, path: Path) -> None:
+    """Write the columns of a joint flux series to a NumPy archive, replacing the previous file atomically."""
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, allow_pickle=False, time=series.time, **{name: getattr(series, name) for name in series._fields})
+    tmp_path.replace(path)
+
+
+def _load_series(path: Path) -> JointFluxSeries:
+    """Read a joint flux series written by :func:`_save_series`."""
+    with np.load(path) as archive:
+        return JointFluxSeries(archive['time'], **{name: archive[name] for name in JointFluxSeries._fields})
+
+
+class JointLightCurve:
+    """BAT and XRT light curves of a GRB on a common flux scale."""
+
+    def __init__(
+            self,
+            grb_name: str,
+            client: DataSource | None = None,
+            policy: CachePolicy | None = None,
+            cache: CacheManager | None = None
+        ) -> None:
+        """Create the joint light curve of a GRB, its products being recovered on first use.
+
+        Args:
+            grb_name (str): GRB's name.
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            policy (CachePolicy | None): Cache freshness policy, read from the environment if None.
+            cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+
+        """
+        self.grb_name: str = grb_name
+        self.client = client if client is not None else get_data_source()
+        self.policy = policy
+        self.cache = cache if cache is not None else get_cache_manager()
+        self._series: dict[str, JointFluxSeries] = {}
+
+    @cached_property
+    def burst_analyser(self) -> BurstAnalyser:
+        """Burst Analyser products of the GRB."""
+        return BurstAnalyser(self.grb_name, client=self.client, policy=self.policy, cache=self.cache)
+
+    @cached_property
+    def xrt_light_curve(self) -> XRTLightCurve:
+        """XRT light curves of the GRB."""
+        return XRTLightCurve(self.grb_name, client=self.client, policy=self.policy, cache=self.cache)
+
+    @cached_property
+    def xrt_spectra(self) -> XRTSpectra:
+        """XRT spectra of the GRB."""
+        return XRTSpectra(self.grb_name, client=self.client, policy=self.policy, cache=self.cache)
+
+    def xrt_modes(self) -> list[ObservationMode]:
+        """XRT modes with both a light curve and a power law spectrum."""
+        interval = self.xrt_spectra.s_data['interval0']
+        return [
+            mode for mode in XRT_MODES
+            if mode + '_incbad' in self.xrt_light_curve.lc_data and 'PowerLaw' in interval.get(mode, {})
+        ]
+
+    def xrt_ecf(self, mode: ObservationMode) -> tuple[float, float]:
+        """Energy conversion factor of an XRT mode, 0.3-10 keV observed flux per count rate.
+
+        The ECF is the observed flux of the mode's power law spectrum over the
+        exposure weighted mean count rate of the light curve during the
+        spectrum (the whole light curve if the spectrum has no time interval).
+
+        Returns:
+            tuple[float, float]: ECF and its error, from the error of the observed flux.
+
+        """
+        interval = self.xrt_spectra.s_data['interval0']
+        power_law_fit = interval[mode]['PowerLaw']
+        light_curve = self.xrt_light_curve.light_curve(mode)
+        if 'Start' in interval and 'Stop' in interval:
+            light_curve = light_curve.window((interval['Start'], interval['Stop']))
+        width = light_curve.width
+        if len(light_curve) == 0 or width is None:
+            raise ValueError(f'No {mode} light curve bin during the spectrum')
+        mean_rate = np.sum(light_curve.rate * width) / np.sum(width)
+        ecf = power_law_fit['ObsFlux'] / mean_rate
+        relative_error = (power_law_fit['ObsFluxPos'] + abs(power_law_fit['ObsFluxNeg'])) / 2 / power_law_fit['ObsFlux']
+        return float(ecf), float(ecf * relative_error)
+
+    def source_entries(self) -> dict[str, str]:
+        """Versions of the cached products the fluxes are built from, see :meth:`CacheManager.entry_version`."""
+        return {
+            'burst_analyser': self.burst_analyser.cache_entry(),
+            'light_curve': self.xrt_light_curve.cache_entry(),
+            'spectra': self.xrt_spectra.cache_entry(),
+        }
+
+    def default_time_range(self, binning: str, scale: GridScale) -> tuple[float, float]:
+        """Time range covered by the BAT binning and the XRT light curves, from the first positive bin for log grids."""
+        light_curves = [self.burst_analyser.light_curve(binning)]
+        light_curves += [self.xrt_light_curve.light_curve(mode) for mode in self.xrt_modes()]
+        starts = np.concatenate([light_curve.time + light_curve.time_neg for light_curve in light_curves])
+        stops = np.concatenate([light_curve.time + light_curve.time_pos for light_curve in light_curves])
+        if scale == GridScale.Log:
+            starts = starts[starts > 0] if np.any(starts > 0) else stops[stops > 0]
+        return float(np.min(starts)), float(np.max(stops))
+
+    def resample(
+            self,
+            nb_bins: int = 100,
+            scale: GridScale = GridScale.Log,
+            time_scale: tuple[float, float] | None = None,
+            binning: str = 'TimeBins_1s',
+            band: tuple[float, float] = BAND_ENERGIES['XRTBand']
+        ) -> JointFluxSeries:
+        """BAT and XRT energy fluxes on a common time grid, cached for every set of parameters.
+
+        BAT fluxes are converted to the band with the photon index of every
+        bin, XRT fluxes with the photon index of the mode's spectrum. The
+        systematic error of the XRT ECF is added to the resampled errors.
+
+        The series is cached with the versions of the Burst Analyser, XRT
+        light curves and spectra, so refreshing any of them builds it again.
+
+        Args:
+            nb_bins (int): Number of bins of the grid.
+            scale (GridScale): Linear or logarithmic grid.
+            time_scale (tuple[float, float] | None): Grid range, every observed bin (positive times for log
+                grids) if None.
+            binning (str): BAT Burst Analyser binning (e.g. ``'TimeBins_1s'``).
+            band (tuple[float, float]): Energy band of the fluxes in keV.
+
+        Returns:
+            JointFluxSeries: Fluxes in erg/cm2/s of both instruments.
+
+        """
+        start, stop = time_scale if time_scale is not None else self.default_time_range(binning, scale)
+        params = {
+            'GRBName': self.grb_name,
+            'nb_bins': nb_bins,
+            'scale': str(scale),
+            'time_scale': [float(start), float(stop)],
+            'binning': binning,
+            'band': [float(band[0]), float(band[1])],
+            'sources': self.source_entries(),
+        }
+        key = self.cache.key(ProductType.Joint_Light_Curve, params)
+        if key not in self._series:
+            self._series[key] = self.cache.load_or_fetch(
+                product=ProductType.Joint_Light_Curve,
+                params=params,
+                file_name='joint_flux.npz',
+                fetch=lambda entry_path: self._resample(time_grid(start, stop, nb_bins, scale), scale, binning, band),
+                load=_load_series,
+                save=_save_series,
+                policy=self.policy,
+            )
+        return self._series[key]
+
+    def _resample(
+            self,
+            edges: np.ndarray,
+            scale: GridScale,
+            binning: str,
+            band: tuple[float, float]
+        ) -> JointFluxSeries:
+        nb_bins = len(edges) - 1
+        bat = self.burst_analyser.light_curve(binning)
+        ratio = band_ratio(self.burst_analyser.spectral_series(binning).gamma, BAND_ENERGIES['BATBand'], band)
+        bat_results = [resample(bat, edges, bat.rate * ratio, bat.error * ratio if bat.error is not None else None)]
+
+        xrt_results = []
+        for mode in self.xrt_modes():
+            xrt = self.xrt_light_curve.light_curve(mode)
+            ecf, ecf_error = self.xrt_ecf(mode)
+            gamma = self.xrt_spectra.s_data['interval0'][mode]['PowerLaw']['Gamma']
+            ratio = band_ratio(gamma, BAND_ENERGIES['XRTBand'], band) * ecf
+            flux, flux_error, exposure = resample(
+                xrt, edges, xrt.rate * ratio, xrt.error * ratio if xrt.error is not None else None
+            )
+            xrt_results.append((flux, np.hypot(flux_error, flux * ecf_error / ecf), exposure))
+
+        bat_flux, bat_flux_error, bat_exposure = _combine(bat_results, nb_bins)
+        xrt_flux, xrt_flux_error, xrt_exposure = _combine(xrt_results, nb_bins)
+        time = np.sqrt(edges[:-1] * edges[1:]) if scale == GridScale.Log else (edges[:-1] + edges[1:]) / 2
+        return JointFluxSeries(
+            time,
+            time_pos=edges[1:] - time,
+            time_neg=edges[:-1] - time,
+            bat_flux=bat_flux,
+            bat_flux_error=bat_flux_error,
+            bat_exposure=bat_exposure,
+            xrt_flux=xrt_flux,
+            xrt_flux_error=xrt_flux_error,
+            xrt_exposure=xrt_exposure,
+        )
@@ -1,99 +1,321 @@
 """LightCurve class."""
 
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
 from pathlib import Path
-from matplotlib import pyplot as plt
-import pandas as pd
-import swifttools.ukssdc.data.GRB as udg
-import pickle
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from gamma_burst import metrics
+from gamma_burst.append_store import WindowedCache, append_tables, open_append_store
+from gamma_burst.cache_manager import CacheManager, get_cache_manager
+from gamma_burst.cache_policy import CachePolicy, load_pickle, save_pickle
+from gamma_burst.containers import LightCurve
+from gamma_burst.data_source import DataSource, cache_params, get_data_source
+from gamma_burst.eumerations import CacheMode, HardnessMethod, ObservationMode, ProductType, RebinMethod
+from gamma_burst.hardness import hardness_ratios
+from gamma_burst.rebinning import rebin
+from gamma_burst.rendering import get_axes, show_figures
+from gamma_burst.time_index import TimeIndex
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
-from gamma_burst.eumerations import ObservationMode
 class XRTLightCurve:
 
-    def __init__(self, grb_name: str) -> None:
+    def __init__(
+            self,
+            grb_name: str,
+            client: DataSource | None = None,
+            policy: CachePolicy | None = None,
+            cache: CacheManager | None = None,
+            incremental: bool = False
+        ) -> None:
+        """Create a light curve and recover its data.
+
+        Args:
+            grb_name (str): GRB's name.
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            policy (CachePolicy | None): Cache freshness policy, read from the environment if None.
+            cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+            incremental (bool): Keep the data in an append-only store, for bursts still observed.
+
+        """
         self.grb_name: str = grb_name
+        self.client = client if client is not None else get_data_source()
+        self.policy = policy
+        self.cache = cache if cache is not None else get_cache_manager()
+        self.incremental = incremental
+        self._time_indexes: dict[str, TimeIndex] = {}
+        self._light_curves: dict[tuple[str, str], LightCurve] = {}
+        self._derived = WindowedCache()
         self.lc_data = self.recover_light_curves()
         pass
 
     def recover_light_curves(self) -> dict:
         """Recover light curve data.
 
+        The cached data are served as long as the cache policy considers them
+        fresh, otherwise they are downloaded again.
+
         Args:
             grb_name (str): GRB's name.
         """
-        home_path = Path.home().joinpath(".gamma_burst")
-        if not home_path.exists():
-            home_path.mkdir(parents=True, exist_ok=True)
-        
-        folder_path = home_path.joinpath(self.grb_name).joinpath('light_curve')
-        
-        cache_file = folder_path / 'lc_data.pkl'
-        
-        if not cache_file.exists():
-            folder_path.mkdir(parents=True, exist_ok=True)
-            
-            lc_data = udg.getLightCurves(
-                GRBName=self.grb_name,
-                returnData=True,
-                saveData=False,
-                silent=False
-            )
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(lc_data, f)
-        else:
-            lc_data = udg.getLightCurves(
-                GRBName=self.grb_name,
-                destDir=folder_path,
-                returnData=True,
-                saveData=False,
-                silent=False
-            )
-            with open(cache_file, 'wb') as f:
-                pickle.dump(lc_data, f)
+        self._recover(self.policy)
+        return self.lc_data
+
+    def refresh(self) -> dict[str, float]:
+        """Download the light curves again, whatever the cache policy.
+
+        In incremental mode only the rows after the last ingested time of
+        every table are written, and only the derived products whose window
+        reaches them are invalidated.
+
+        Returns:
+            dict[str, float]: Earliest changed time of every changed table, ``-inf`` if rewritten.
+
+        """
+        policy = self.policy if self.policy is not None else CachePolicy.from_env()
+        return self._recover(policy.model_copy(update={'mode': CacheMode.Always_Refresh}))
+
+    def request_params(self) -> dict:
+        """Parameters of the light curves request, which identify its cache entry."""
+        return {'GRBName': self.grb_name, 'returnData': True, 'saveData': False}
+
+    def cache_file_name(self) -> str:
+        """Name of the cached data inside the cache entry."""
+        return 'lc_store' if self.incremental else 'lc_data.pkl'
+
+    def cache_entry(self) -> str:
+        """Version of the cached data, see :meth:`CacheManager.entry_version`."""
+        params = cache_params(self.request_params(), self.client)
+        return self.cache.entry_version(ProductType.Light_Curve, params, self.cache_file_name())
+
+    def _recover(self, policy: CachePolicy | None) -> dict[str, float]:
+        params = self.request_params()
+        changes: dict[str, float] = {}
+
+        def save_store(lc_data: dict, path: Path) -> None:
+            changes.update(append_tables(lc_data, path))
+
+        lc_data = self.cache.load_or_fetch(
+            product=ProductType.Light_Curve,
+            params=cache_params(params, self.client),
+            file_name=self.cache_file_name(),
+            fetch=lambda entry_path: self.client.getLightCurves(**params, silent=False),
+            load=open_append_store if self.incremental else load_pickle,
+            save=save_store if self.incremental else save_pickle,
+            policy=policy,
+        )
         self.lc_data = lc_data
-        return lc_data
-    
-    def plot_light_curve(self, mode: ObservationMode, time_scale : tuple[float, float] = None, plot_error: bool = False):
+        if not self.incremental:
+            import pandas as pd  # noqa: PLC0415
+            changes = {name: -math.inf for name, value in lc_data.items() if isinstance(value, pd.DataFrame)}
+            self._time_indexes.clear()
+            self._light_curves.clear()
+            self._derived.clear()
+        for name, start in changes.items():
+            self.invalidate(name, start)
+        return changes
+
+    def invalidate(self, dataset: str, start: float = -math.inf) -> None:
+        """Drop the indexes and derived products of a dataset whose data changed from ``start``.
+
+        Args:
+            dataset (str): Light curve dataset (e.g. ``'WT_incbad'``).
+            start (float): Earliest changed time.
+
+        """
+        self._time_indexes.pop(dataset, None)
+        for key in [key for key in self._light_curves if key[0] + '_incbad' == dataset]:
+            del self._light_curves[key]
+        self._derived.invalidate(dataset, start)
+
+    def time_index(self, dataset: str) -> TimeIndex:
+        """Time index of a light curve dataset (e.g. ``'WT_incbad'``), built once per dataset."""
+        if dataset not in self._time_indexes:
+            with metrics.timer('gamma_burst_conversion_seconds', kind='time_index'):
+                self._time_indexes[dataset] = TimeIndex(self.lc_data[dataset])
+        return self._time_indexes[dataset]
+
+    def light_curve(self, mode: ObservationMode, dtype: type = np.float64) -> LightCurve:
+        """Count rate light curve of a mode (bad bins included), built once per mode and precision.
+
+        Args:
+            mode (ObservationMode): Observation mode.
+            dtype (type): Precision of the columns other than time.
+
+        """
+        key = (mode, np.dtype(dtype).str)
+        if key not in self._light_curves:
+            table = self.time_index(mode + '_incbad').table
+            with metrics.timer('gamma_burst_conversion_seconds', kind='light_curve'):
+                self._light_curves[key] = LightCurve.from_table(table, dtype)
+        return self._light_curves[key]
     
-        lc_data = self.lc_data[mode + '_incbad']
-        lc_data_filtered = lc_data
-        if time_scale is not None:
-            lc_data_filtered = lc_data.loc[(lc_data['Time'] >= time_scale[0]) & (lc_data['Time'] <= time_scale[1])]
-        time = lc_data_filtered['Time']
-        rate = lc_data_filtered['Rate']
+    def rebin_light_curve(
+            self,
+            mode: ObservationMode,
+            method: RebinMethod,
+            time_scale: tuple[float, float] | None = None,
+            *,
+            bin_size: float | None = None,
+            min_snr: float | None = None,
+            p0: float = 0.05,
+        ) -> LightCurve:
+        """Rebin the light curve of a mode locally, see :func:`rebinning.rebin`.
+
+        The rebinned light curve is kept until new data reach its window.
+
+        Args:
+            mode (ObservationMode): Observation mode.
+            method (RebinMethod): Rebinning method.
+            time_scale (tuple[float, float] | None): Time window (start, stop).
+            bin_size (float | None): Duration of the new bins in seconds, ``RebinMethod.Fixed`` only.
+            min_snr (float | None): Minimum signal to noise ratio of every bin, ``RebinMethod.Min_SNR`` only.
+            p0 (float): False alarm probability of a change point, ``RebinMethod.Bayesian_Blocks`` only.
+
+        """
+        time_scale = (time_scale[0], time_scale[1]) if time_scale is not None else None
+        return self._derived.get(
+            mode + '_incbad',
+            time_scale,
+            ('rebin', method, bin_size, min_snr, p0),
+            lambda: rebin(
+                self.light_curve(mode), method, bin_size=bin_size, min_snr=min_snr, p0=p0, time_scale=time_scale
+            ),
+        )
+
+    def hardness_ratios(
+            self,
+            modes: Iterable[ObservationMode] = (ObservationMode.WT_Mode, ObservationMode.PC_Mode),
+            method: HardnessMethod = HardnessMethod.Ratio,
+            min_snr: float | None = None,
+            time_scale: tuple[float, float] | None = None,
+        ) -> dict[ObservationMode, LightCurve]:
+        """Hardness ratios computed from the soft and hard band light curves, see :func:`hardness.hardness_ratios`.
+
+        Args:
+            modes (Iterable[ObservationMode]): ``ObservationMode.WT_Mode`` and/or ``ObservationMode.PC_Mode``.
+            method (HardnessMethod): ``H / S`` or ``(H - S) / (H + S)``.
+            min_snr (float | None): Signal to noise ratio of the summed band in every bin, the band binning if None.
+            time_scale (tuple[float, float] | None): Time window (start, stop).
+
+        """
+        bands: dict[ObservationMode, tuple[LightCurve, LightCurve]] = {}
+        for mode in modes:
+            if mode not in [ObservationMode.PC_Mode, ObservationMode.WT_Mode]:
+                raise ValueError("Mode should be ObservationMode.PC_Mode or ObservationMode.WT_Mode")
+            bands[mode] = (
+                self.light_curve(ObservationMode(mode + 'Soft')),
+                self.light_curve(ObservationMode(mode + 'Hard')),
+            )
+        return hardness_ratios(bands, method, min_snr, time_scale)
+
+    def fluence(self, mode: ObservationMode, time_scale: tuple[float, float] | None = None) -> tuple[float, float]:
+        """Count the events of a mode in a time window, with their error.
+
+        Args:
+            mode (ObservationMode): Observation mode.
+            time_scale (tuple[float, float] | None): Time window (start, stop).
+
+        """
+        def compute() -> tuple[float, float]:
+            light_curve = self.light_curve(mode).window(time_scale)
+            width = light_curve.width if light_curve.width is not None else np.ones(len(light_curve))
+            error = light_curve.error if light_curve.error is not None else np.zeros(len(light_curve))
+            return float(np.sum(light_curve.rate * width)), float(np.sqrt(np.sum((error * width) ** 2)))
+
+        time_scale = (time_scale[0], time_scale[1]) if time_scale is not None else None
+        return self._derived.get(mode + '_incbad', time_scale, ('fluence',), compute)
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve(
+            self,
+            mode: ObservationMode,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the light curve of a mode.
+
+        Args:
+            mode (ObservationMode): Observation mode.
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Whether to draw the rate error bars.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
+        light_curve = self.light_curve(mode).window(time_scale)
         
-        if plot_error:
-            error = lc_data_filtered.get('RateErr', 0)
-            plt.errorbar(time, rate, yerr=error, fmt='o-', label=mode)
+        ax, show = get_axes(ax)
+        rate_pos, rate_neg = light_curve.rate_pos, light_curve.rate_neg
+        if plot_error and rate_pos is not None and rate_neg is not None:
+            error = (np.abs(rate_neg), rate_pos)
+            ax.errorbar(light_curve.time, light_curve.rate, yerr=error, fmt='o-', label=mode)
         else:
-            plt.plot(time, rate)
-        plt.xlabel('Time (s)')
-        plt.ylabel('Rate (cts/s)')
-        plt.title(f'Light Curve for {self.grb_name} in {mode}')
-        plt.legend()
-        plt.show()
-
-    def plot_light_curve_HR(self, mode: ObservationMode, time_scale : tuple[float, float] = None, plot_error: bool = False):
+            ax.plot(light_curve.time, light_curve.rate, label=mode)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Rate (cts/s)')
+        ax.set_title(f'Light Curve for {self.grb_name} in {mode}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_light_curve_HR(
+            self,
+            mode: ObservationMode,
+            time_scale : tuple[float, float] | None = None,
+            plot_error: bool = False,
+            ax: Axes | None = None,
+            *,
+            method: HardnessMethod | None = None,
+            min_snr: float | None = None
+        ) -> Axes:
+        """Plot the hardness ratio of a mode, the UKSSDC one unless a method or a minimum SNR is given.
+
+        Args:
+            mode (ObservationMode): ``ObservationMode.WT_Mode`` or ``ObservationMode.PC_Mode``.
+            time_scale (tuple[float, float], optional): Time window (start, stop).
+            plot_error (bool): Draw the hardness ratio errors.
+            ax (Axes | None): Axes to draw on, a new figure if None.
+            method (HardnessMethod | None): Compute the ratio locally with this method.
+            min_snr (float | None): Compute the ratio locally, on bins reaching this SNR.
+
+        """
         if mode not in [ObservationMode.PC_Mode, ObservationMode.WT_Mode]:
             raise ValueError("Mode should be ObservationMode.PC_Mode or ObservationMode.WT_Mode")
-        lc_data = self.lc_data[mode + 'HR_incbad']
-        lc_data_filtered = lc_data
-        if time_scale is not None:
-            lc_data_filtered = lc_data.loc[(lc_data['Time'] >= time_scale[0]) & (lc_data['Time'] <= time_scale[1])]
-        time = lc_data_filtered['Time']
-        hr = lc_data_filtered['HR']
-        if plot_error:
-            error = lc_data_filtered.get('RateErr', 0)
-            plt.errorbar(time, hr, yerr=error, fmt='o-', label=mode)
+        if method is None and min_snr is None:
+            table = self.time_index(mode + 'HR_incbad').window(time_scale)
+            hr = LightCurve.from_table(
+                table, rate=table['HR'], rate_pos=table.get('HRPos'), rate_neg=table.get('HRNeg')
+            )
+        else:
+            method = method if method is not None else HardnessMethod.Ratio
+            hr = self.hardness_ratios([mode], method, min_snr, time_scale)[mode]
+        ax, show = get_axes(ax)
+        if plot_error and hr.rate_pos is not None and hr.rate_neg is not None:
+            ax.errorbar(hr.time, hr.rate, yerr=[np.abs(hr.rate_neg), hr.rate_pos], fmt='o-', label=mode)
         else:
-            plt.plot(time, hr)
-        plt.xlabel('Time (s)')
-        plt.ylabel('HR (NU)')
-        plt.title(f'Hardness Ratio for {self.grb_name} in {mode} mode')
-        plt.legend()
-        plt.show()
+            ax.plot(hr.time, hr.rate, label=mode)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('HR (NU)')
+        ax.set_title(f'Hardness Ratio for {self.grb_name} in {mode} mode')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
     
     def print_fields(self):
+        import pandas as pd  # noqa: PLC0415
         for key in self.lc_data:
             data = self.lc_data[key]
             if isinstance(data, pd.DataFrame):
@@ -107,4 +329,4 @@ if __name__ == '__main__':
     lc.plot_light_curve(ObservationMode.WT_Mode)
     lc.plot_light_curve_HR(ObservationMode.WT_Mode)
 
-    lc.print_fields()
\ No newline at end of file
+    lc.print_fields()
@@ -0,0 +1,211 @@
+"""Counters and timing histograms of the hot paths.
+
+Instrumentation is disabled by default and then costs a single attribute
+check per instrumented call. Set ``GAMMA_BURST_METRICS=1`` (or call
+:func:`enable`) to record:
+
+- ``gamma_burst_fetch_seconds``: downloads from the data source, by product,
+- ``gamma_burst_cache_load_seconds`` / ``gamma_burst_cache_save_seconds``: cache reads and writes, by product,
+- ``gamma_burst_cache_{hits,misses,bytes_served,bytes_written}_total``: cache counters, by product, the
+  bytes served counting the whole entry even when its tables are read lazily,
+- ``gamma_burst_rebin_call_seconds``: requests of the rebin jobs to the data source, by call,
+- ``gamma_burst_rebin_wait_seconds``: submission to completion of rebin jobs, by final status,
+- ``gamma_burst_conversion_seconds``: tables converted to indexes and array containers, by kind,
+- ``gamma_burst_plot_seconds``: plotting functions, by function.
+
+The recorded metrics are exported as Prometheus text (:func:`to_prometheus`)
+or as a JSON serialisable report (:func:`report`).
+"""
+
+import functools
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+METRICS_ENV = 'GAMMA_BURST_METRICS'
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_Labels = tuple[tuple[str, str], ...]
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+@dataclass
+class Histogram:
+    """Cumulative distribution of observed values, Prometheus style."""
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        """Start with empty buckets."""
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Add a value to the distribution."""
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters and histograms."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Create an empty registry, recording only if enabled."""
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[_Labels, float]] = {}
+        self._histograms: dict[str, dict[_Labels, Histogram]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add a value to a counter."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+        with self._lock:
+            self._histograms.setdefault(name, {}).setdefault(key, Histogram()).observe(value)
+
+    def timer(self, name: str, **labels: str) -> AbstractContextManager:
+        """Context manager recording its duration in a histogram, a no-op when disabled."""
+        if not self.enabled:
+            return nullcontext()
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        """Forget every recorded value."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def report(self) -> dict:
+        """Return the recorded metrics as a JSON serialisable dictionary."""
+        with self._lock:
+            return {
+                'counters': {
+                    name: [{'labels': dict(labels), 'value': value} for labels, value in counters.items()]
+                    for name, counters in self._counters.items()
+                },
+                'histograms': {
+                    name: [
+                        {
+                            'labels': dict(labels),
+                            'count': histogram.count,
+                            'sum': histogram.total,
+                            'buckets': dict(zip(map(str, histogram.buckets), histogram.counts, strict=True)),
+                        }
+                        for labels, histogram in histograms.items()
+                    ]
+                    for name, histograms in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Return the recorded metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, counters in sorted(self._counters.items()):
+                lines.append(f'# TYPE {name} counter')
+                lines.extend(
+                    f'{name}{_format_labels(labels)} {_format_value(value)}' for labels, value in counters.items()
+                )
+            for name, histograms in sorted(self._histograms.items()):
+                lines.append(f'# TYPE {name} histogram')
+                for labels, histogram in histograms.items():
+                    for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                        lines.append(f'{name}_bucket{_format_labels(labels, le=_format_value(bound))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels, le="+Inf")} {histogram.count}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: _Labels, **extra: str) -> str:
+    items = [*labels, *extra.items()]
+    if not items:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in items)
+    return '{' + ','.join(f'{label}="{value}"' for (label, _), value in zip(items, escaped, strict=True)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+registry = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, '0').lower() in ('1', 'true', 'yes'))
+
+
+def enable() -> None:
+    """Start recording metrics."""
+    registry.enabled = True
+
+
+def disable() -> None:
+    """Stop recording metrics, keeping the recorded values."""
+    registry.enabled = False
+
+
+def increment(name: str, value: float = 1.0, **labels: str) -> None:
+    """Add a value to a counter of the shared registry."""
+    registry.increment(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record a value in a histogram of the shared registry."""
+    registry.observe(name, value, **labels)
+
+
+def timer(name: str, **labels: str) -> AbstractContextManager:
+    """Time a block in a histogram of the shared registry."""
+    return registry.timer(name, **labels)
+
+
+def timed(name: str) -> Callable[[_F], _F]:
+    """Time every call of a function, labelled with its qualified name."""
+    def decorator(function: _F) -> _F:
+        @functools.wraps(function)
+        def wrapper(*args: object, **kwargs: object) -> object:
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            with registry.timer(name, function=function.__qualname__):
+                return function(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def report() -> dict:
+    """Metrics of the shared registry as a JSON serialisable dictionary."""
+    return registry.report()
+
+
+def to_prometheus() -> str:
+    """Metrics of the shared registry in the Prometheus text exposition format."""
+    return registry.to_prometheus()
@@ -0,0 +1,263 @@
+"""Scheduler running many UKSSDC rebin jobs concurrently."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+from types import TracebackType
+
+from gamma_burst import metrics
+from gamma_burst.data_source import DataSource, get_data_source
+
+RUNNING_STATUSES = ('Running', 'Queued')
+COMPLETE_STATUS = 'Complete'
+
+
+@dataclass(frozen=True)
+class RebinRequest:
+    """Parameters of one rebinned light curve."""
+
+    grb_name: str
+    bin_size: float
+    min_snr: float
+    soft_min: float
+    soft_max: float
+    hard_min: float
+    hard_max: float
+
+    def params(self) -> dict:
+        """Arguments of ``udg.rebinLightCurve`` for this request."""
+        return dict(
+            GRBName=self.grb_name,
+            binMeth='time',
+            pcCounts=15,
+            wtCounts=15,
+            dynamic=True,
+            pcMaxGap=self.bin_size,
+            wtMaxGap=self.bin_size,
+            minSNR=self.min_snr,
+            softLo=self.soft_min,
+            softHi=self.soft_max,
+            hardLo=self.hard_min,
+            hardHi=self.hard_max,
+            wtBinTime=2.51,
+            pcBinTime=0.5,
+            minCounts=15,
+            binFact=1.5,
+            rateFact=10,
+            minEnergy=self.soft_min,
+            maxEnergy=self.hard_max,
+            pcHRBinTime=self.bin_size,
+            wtHRBinTime=self.bin_size,
+        )
+
+
+@dataclass
+class _Job:
+    request: RebinRequest
+    future: Future
+    job_id: int
+    interval: float
+    next_poll: float
+    status: str = 'Submitted'
+    submitted: float = field(default_factory=time.monotonic)
+
+
+class RebinScheduler:
+    """Submit rebin jobs up to a concurrency cap and poll them together.
+
+    A single background thread submits queued requests, polls every running
+    job with its own adaptive interval (growing while the job is not done),
+    and resolves the future of each request with its light curve data.
+    """
+
+    def __init__(
+            self,
+            client: DataSource | None = None,
+            max_concurrent: int = 4,
+            *,
+            min_interval: float = 1.0,
+            max_interval: float = 30.0,
+            backoff_factor: float = 1.5,
+            verbose: bool = True,
+        ) -> None:
+        """Create a scheduler.
+
+        Args:
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            max_concurrent (int): Maximum number of jobs running on the server at once.
+            min_interval (float): Delay before the first status check of a job in seconds.
+            max_interval (float): Maximum delay between two status checks of a job in seconds.
+            backoff_factor (float): Growth of the delay between two status checks.
+            verbose (bool): Print status changes of the jobs.
+
+        """
+        self.client = client if client is not None else get_data_source()
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.verbose = verbose
+        self._pending: deque[tuple[RebinRequest, Future]] = deque()
+        self._running: list[_Job] = []
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, request: RebinRequest) -> Future:
+        """Queue a rebin request.
+
+        Returns:
+            Future: Resolved with the rebinned light curve data.
+
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError('Cannot submit a rebin request to a stopped scheduler')
+            self._pending.append((request, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='rebin-scheduler', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    async def submit_async(self, request: RebinRequest) -> dict:
+        """Queue a rebin request and await its light curve data."""
+        return await asyncio.wrap_future(self.submit(request))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the scheduler.
+
+        Args:
+            wait (bool): Wait for every queued and running job, otherwise cancel them.
+
+        """
+        running = []
+        with self._condition:
+            if not wait:
+                for _, future in self._pending:
+                    future.cancel()
+                self._pending.clear()
+                running = list(self._running)
+            self._stopped = True
+            self._condition.notify()
+        for job in running:
+            self._cancel(job)
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'RebinScheduler':
+        """Return the scheduler, shut down on exit."""
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_value: BaseException | None,
+            traceback: TracebackType | None
+        ) -> None:
+        """Shut the scheduler down, waiting for the jobs unless an error was raised."""
+        self.shutdown(wait=exc_type is None)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and not self._pending and not self._running:
+                    self._condition.wait()
+                if self._stopped and not self._pending and not self._running:
+                    return
+                to_submit = []
+                while self._pending and len(self._running) + len(to_submit) < self.max_concurrent:
+                    to_submit.append(self._pending.popleft())
+
+            for request, future in to_submit:
+                if future.set_running_or_notify_cancel():
+                    self._start(request, future)
+
+            now = time.monotonic()
+            for job in [job for job in self._running if job.next_poll <= now]:
+                self._poll(job)
+
+            with self._condition:
+                if self._pending and len(self._running) < self.max_concurrent:
+                    continue
+                if self._running:
+                    next_poll = min(job.next_poll for job in self._running)
+                    self._condition.wait(max(0.0, next_poll - time.monotonic()))
+
+    def _start(self, request: RebinRequest, future: Future) -> None:
+        try:
+            with metrics.timer('gamma_burst_rebin_call_seconds', call='rebinLightCurve'):
+                job_id = self.client.rebinLightCurve(
+                    **request.params(),
+                    returnData=True,
+                    saveData=False,
+                    silent=not self.verbose
+                )
+        except Exception as error:
+            future.set_exception(error)
+            return
+        job = _Job(request, future, job_id, self.min_interval, time.monotonic() + self.min_interval)
+        with self._condition:
+            self._running.append(job)
+
+    def _poll(self, job: _Job) -> None:
+        try:
+            with metrics.timer('gamma_burst_rebin_call_seconds', call='checkRebinStatus'):
+                status = self.client.checkRebinStatus(job.job_id)['statusText']
+            if status != job.status and self.verbose:
+                print(f'Rebin job {job.job_id} ({job.request.grb_name}): {status}')
+            job.status = status
+            if status == COMPLETE_STATUS:
+                with metrics.timer('gamma_burst_rebin_call_seconds', call='getRebinnedLightCurve'):
+                    lc_data = self.client.getRebinnedLightCurve(job.job_id, returnData=True, saveData=False)
+                if lc_data is None:
+                    raise ValueError("Null lc_data")
+                self._finish(job, result=lc_data)
+            elif status not in RUNNING_STATUSES:
+                raise ValueError(f"Error : Rebinning status {status}")
+            else:
+                job.interval = min(self.max_interval, job.interval * self.backoff_factor)
+                job.next_poll = time.monotonic() + job.interval
+        except Exception as error:
+            self._finish(job, error=error)
+
+    def _finish(self, job: _Job, result: dict | None = None, error: BaseException | None = None) -> None:
+        with self._condition:
+            if job in self._running:
+                self._running.remove(job)
+        if job.future.done():
+            return
+        if error is None:
+            outcome = job.status
+        else:
+            outcome = 'Cancelled' if isinstance(error, CancelledError) else 'Failed'
+        metrics.observe('gamma_burst_rebin_wait_seconds', time.monotonic() - job.submitted, status=outcome)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def _cancel(self, job: _Job) -> None:
+        try:
+            with metrics.timer('gamma_burst_rebin_call_seconds', call='cancelRebin'):
+                self.client.cancelRebin(job.job_id)
+        except Exception as error:
+            print(f'Could not cancel rebin job {job.job_id}: {error!r}')
+        self._finish(job, error=CancelledError(f'Rebin job {job.job_id} cancelled'))
+
+
+_default_scheduler: RebinScheduler | None = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_rebin_scheduler() -> RebinScheduler:
+    """Scheduler shared by the rebin requests made without an explicit one."""
+    global _default_scheduler  # noqa: PLW0603
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RebinScheduler()
+        return _default_scheduler
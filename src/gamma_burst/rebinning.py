@@ -0,0 +1,215 @@
+"""Local rebinning of light curves.
+
+Rebins the finest available light curve (e.g. ``TimeBins_64ms`` or an XRT
+WT/PC curve) into fixed-width bins, minimum signal to noise ratio bins or
+Bayesian Blocks, without submitting a rebin job to the UKSSDC.
+
+Every method first splits the bins into consecutive groups, then
+:func:`combine_bins` merges every group with ``np.add.reduceat``: the new
+rate is the exposure-weighted mean rate and its error the quadratic sum of
+the weighted errors. The group searches use prefix sums, so evaluating a
+candidate group costs O(1) whatever its number of bins.
+"""
+
+import numpy as np
+
+from gamma_burst.containers import LightCurve
+from gamma_burst.eumerations import RebinMethod
+
+
+def _bin_edges(light_curve: LightCurve) -> tuple[np.ndarray, np.ndarray]:
+    """Start and stop of every bin, the bin times themselves without time errors."""
+    if light_curve.time_pos is None or light_curve.time_neg is None:
+        return light_curve.time, light_curve.time
+    return light_curve.time - np.abs(light_curve.time_neg), light_curve.time + light_curve.time_pos
+
+
+def _weights(light_curve: LightCurve) -> tuple[np.ndarray, np.ndarray]:
+    """Exposure of every bin (ones without time errors) and its rate error (zeros without rate errors)."""
+    width = light_curve.width
+    exposure = np.asarray(width, dtype=float) if width is not None else np.ones(len(light_curve))
+    error = light_curve.error
+    error = np.asarray(error, dtype=float) if error is not None else np.zeros(len(light_curve))
+    return exposure, error
+
+
+def combine_bins(light_curve: LightCurve, starts: np.ndarray) -> LightCurve:
+    """Merge groups of consecutive bins.
+
+    Args:
+        light_curve (LightCurve): Light curve sorted by time.
+        starts (np.ndarray): First bin of every group, increasing and starting at 0.
+
+    Returns:
+        LightCurve: One bin per group spanning its bins, with the exposure-weighted
+            mean rate (and ECF) and the propagated symmetric error.
+
+    """
+    starts = np.asarray(starts, dtype=np.intp)
+    if len(light_curve) == 0:
+        return LightCurve(np.empty(0), light_curve.dtype)
+    if len(starts) == 0 or starts[0] != 0 or np.any(np.diff(starts) <= 0) or starts[-1] >= len(light_curve):
+        raise ValueError('Group starts should be increasing bin positions starting at 0')
+    stops = np.append(starts[1:], len(light_curve)) - 1
+    exposure, error = _weights(light_curve)
+    group_exposure = np.add.reduceat(exposure, starts)
+    rate = np.add.reduceat(light_curve.rate * exposure, starts) / group_exposure
+    rate_error = np.sqrt(np.add.reduceat((error * exposure) ** 2, starts)) / group_exposure
+    ecf = light_curve.ecf
+    if ecf is not None and ecf.ndim > 0:
+        ecf = np.add.reduceat(ecf * exposure, starts) / group_exposure
+
+    bin_start, bin_stop = _bin_edges(light_curve)
+    start, stop = bin_start[starts], bin_stop[stops]
+    time = (start + stop) / 2
+    return LightCurve(
+        time,
+        light_curve.dtype,
+        time_pos=stop - time,
+        time_neg=start - time,
+        rate=rate,
+        rate_pos=rate_error,
+        rate_neg=-rate_error,
+        ecf=ecf,
+    )
+
+
+def fixed_width_starts(light_curve: LightCurve, bin_size: float, origin: float | None = None) -> np.ndarray:
+    """Group the bins whose times fall in the same fixed-width bin.
+
+    Args:
+        light_curve (LightCurve): Light curve sorted by time.
+        bin_size (float): Duration of the new bins in seconds.
+        origin (float | None): Start of the first new bin, the start of the first bin if None.
+
+    """
+    if bin_size <= 0:
+        raise ValueError('Bin size should be strictly positive')
+    if len(light_curve) == 0:
+        return np.empty(0, dtype=np.intp)
+    origin = _bin_edges(light_curve)[0][0] if origin is None else origin
+    bin_number = np.floor((light_curve.time - origin) / bin_size).astype(np.int64)
+    return np.concatenate(([0], np.flatnonzero(np.diff(bin_number)) + 1))
+
+
+def min_snr_starts(light_curve: LightCurve, min_snr: float, chunk_size: int = 64) -> np.ndarray:
+    """Group consecutive bins until they reach a minimum signal to noise ratio.
+
+    A last group below the threshold is merged into the previous one.
+
+    Args:
+        light_curve (LightCurve): Light curve sorted by time, with rate errors.
+        min_snr (float): Minimum ratio of the group fluence to its error.
+        chunk_size (int): Number of candidate ends first tested for every group,
+            multiplied by four until one reaches the threshold.
+
+    """
+    if min_snr <= 0:
+        raise ValueError('Minimum SNR should be strictly positive')
+    if light_curve.error is None:
+        raise ValueError('Minimum SNR binning needs rate errors')
+    nb_bins = len(light_curve)
+    exposure, error = _weights(light_curve)
+    fluence = np.concatenate(([0.0], np.cumsum(light_curve.rate * exposure)))
+    variance = np.concatenate(([0.0], np.cumsum((error * exposure) ** 2)))
+
+    stops: list[int] = []
+    start = 0
+    while start < nb_bins:
+        size = chunk_size
+        while True:
+            ends = np.arange(start + 1, min(start + size, nb_bins) + 1)
+            signal = fluence[ends] - fluence[start]
+            reached = signal >= min_snr * np.sqrt(variance[ends] - variance[start])
+            if reached.any() or ends[-1] == nb_bins:
+                break
+            size *= 4
+        if not reached.any():
+            break
+        start = int(ends[np.argmax(reached)])
+        stops.append(start)
+    if not stops:
+        return np.zeros(min(nb_bins, 1), dtype=np.intp)
+    return np.array([0, *stops[:-1]], dtype=np.intp)
+
+
+def bayesian_blocks_starts(light_curve: LightCurve, p0: float = 0.05, ncp_prior: float | None = None) -> np.ndarray:
+    """Optimal segmentation of the light curve into constant-rate blocks.
+
+    Dynamic programming of Scargle et al. (2013) with the fitness of point
+    measures with Gaussian errors, evaluated for every candidate block from
+    prefix sums of the weights.
+
+    Args:
+        light_curve (LightCurve): Light curve sorted by time, with strictly positive rate errors.
+        p0 (float): False alarm probability of a change point, used if ``ncp_prior`` is None.
+        ncp_prior (float | None): Penalty of every additional block.
+
+    """
+    error = light_curve.error
+    if error is None or np.any(np.asarray(error) <= 0):
+        raise ValueError('Bayesian Blocks need strictly positive rate errors')
+    nb_bins = len(light_curve)
+    if nb_bins == 0:
+        return np.empty(0, dtype=np.intp)
+    if ncp_prior is None:
+        ncp_prior = 4 - np.log(73.53 * p0 * nb_bins**-0.478)
+    weight = 1 / np.asarray(error, dtype=float) ** 2
+    weight_sum = np.concatenate(([0.0], np.cumsum(weight)))
+    weighted_rate_sum = np.concatenate(([0.0], np.cumsum(light_curve.rate * weight)))
+
+    best = np.zeros(nb_bins)
+    last = np.zeros(nb_bins, dtype=np.intp)
+    for stop in range(nb_bins):
+        a = 0.5 * (weight_sum[stop + 1] - weight_sum[:stop + 1])
+        b = weighted_rate_sum[stop + 1] - weighted_rate_sum[:stop + 1]
+        fitness = b**2 / (4 * a) - ncp_prior
+        fitness[1:] += best[:stop]
+        last[stop] = np.argmax(fitness)
+        best[stop] = fitness[last[stop]]
+
+    starts = []
+    stop = nb_bins
+    while stop > 0:
+        starts.append(last[stop - 1])
+        stop = last[stop - 1]
+    return np.array(starts[::-1], dtype=np.intp)
+
+
+def rebin(
+        light_curve: LightCurve,
+        method: RebinMethod,
+        *,
+        bin_size: float | None = None,
+        min_snr: float | None = None,
+        p0: float = 0.05,
+        time_scale: tuple[float, float] | None = None,
+    ) -> LightCurve:
+    """Rebin a light curve.
+
+    Args:
+        light_curve (LightCurve): Light curve, usually the finest binning available.
+        method (RebinMethod): Rebinning method.
+        bin_size (float | None): Duration of the new bins in seconds, ``RebinMethod.Fixed`` only.
+        min_snr (float | None): Minimum signal to noise ratio of every bin, ``RebinMethod.Min_SNR`` only.
+        p0 (float): False alarm probability of a change point, ``RebinMethod.Bayesian_Blocks`` only.
+        time_scale (tuple[float, float] | None): Time window (start, stop) to rebin.
+
+    Returns:
+        LightCurve: Rebinned light curve.
+
+    """
+    light_curve = light_curve.window(time_scale)
+    if method == RebinMethod.Fixed:
+        if bin_size is None:
+            raise ValueError('Fixed binning needs a bin size')
+        starts = fixed_width_starts(light_curve, bin_size)
+    elif method == RebinMethod.Min_SNR:
+        if min_snr is None:
+            raise ValueError('Minimum SNR binning needs a minimum SNR')
+        starts = min_snr_starts(light_curve, min_snr)
+    elif method == RebinMethod.Bayesian_Blocks:
+        starts = bayesian_blocks_starts(light_curve, p0)
+    else:
+        raise ValueError(f'Unknown rebin method {method}')
+    return combine_bins(light_curve, starts)
@@ -0,0 +1,348 @@
+"""Headless rendering of the BurstAnalyser and XRT plots to files.
+
+The plotting methods of :class:`BurstAnalyser`, :class:`XRTLightCurve` and
+:class:`XRTSpectra` draw onto the axes (or figure) they are given and only
+fall back to the global pyplot state when called interactively. This module
+uses that to render plots onto explicit :class:`matplotlib.figure.Figure`
+objects with the non-interactive Agg backend, one GRB at a time or for many
+GRBs across a process pool.
+
+matplotlib is only imported when something is drawn, so the analysis
+modules can be imported without it.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gamma_burst.eumerations import ObservationMode
+
+if TYPE_CHECKING:
+    import numpy as np
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+    from gamma_burst.burst_analyser import BurstAnalyser
+    from gamma_burst.data_source import DataSource
+    from gamma_burst.light_curve import XRTLightCurve
+    from gamma_burst.spectra import XRTSpectra
+
+RENDER_FORMATS = ('png', 'svg', 'pdf')
+DEFAULT_FIGSIZE = (10, 6)
+
+
+def get_axes(ax: Axes | None = None, figsize: tuple[float, float] | None = None) -> tuple[Axes, bool]:
+    """Axes to draw on, a new pyplot figure if none is given.
+
+    Args:
+        ax (Axes | None): Axes given by the caller.
+        figsize (tuple[float, float] | None): Size of the new figure in inches.
+
+    Returns:
+        tuple[Axes, bool]: Axes, and whether the caller owns it and should show it.
+
+    """
+    if ax is not None:
+        return ax, False
+    from matplotlib import pyplot as plt  # noqa: PLC0415
+    figure = plt.figure(figsize=figsize)
+    return figure.add_subplot(), True
+
+
+def get_subplots(
+        fig: Figure | None,
+        nrows: int,
+        ncols: int,
+        figsize: tuple[float, float] | None = None
+    ) -> tuple[Figure, np.ndarray, bool]:
+    """Grid of axes to draw on, in a new pyplot figure if none is given.
+
+    Args:
+        fig (Figure | None): Figure given by the caller.
+        nrows (int): Number of rows of the grid.
+        ncols (int): Number of columns of the grid.
+        figsize (tuple[float, float] | None): Size of the figure in inches.
+
+    Returns:
+        tuple[Figure, np.ndarray, bool]: Figure, flat array of axes, and whether the caller should show it.
+
+    """
+    show = fig is None
+    if fig is None:
+        from matplotlib import pyplot as plt  # noqa: PLC0415
+        fig = plt.figure(figsize=figsize)
+    elif figsize is not None:
+        fig.set_size_inches(figsize)
+    axs = fig.subplots(nrows, ncols, squeeze=False)
+    return fig, axs.flatten(), show
+
+
+def show_figures() -> None:
+    """Show the pyplot figures, for plots drawn without explicit axes."""
+    from matplotlib import pyplot as plt  # noqa: PLC0415
+    plt.show()
+
+
+class GRBProducts:
+    """Products of a GRB, each one recovered on first use."""
+
+    def __init__(self, grb_name: str, client: DataSource | None = None) -> None:
+        """Create the products holder.
+
+        Args:
+            grb_name (str): GRB's name.
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+
+        """
+        self.grb_name = grb_name
+        self.client = client
+
+    def _client_kwargs(self) -> dict:
+        return {'client': self.client} if self.client is not None else {}
+
+    @cached_property
+    def burst_analyser(self) -> BurstAnalyser:
+        """Burst Analyser products of the GRB."""
+        from gamma_burst.burst_analyser import BurstAnalyser  # noqa: PLC0415
+        return BurstAnalyser(self.grb_name, **self._client_kwargs())
+
+    @cached_property
+    def light_curve(self) -> XRTLightCurve:
+        """XRT light curves of the GRB."""
+        from gamma_burst.light_curve import XRTLightCurve  # noqa: PLC0415
+        return XRTLightCurve(self.grb_name, **self._client_kwargs())
+
+    @cached_property
+    def spectra(self) -> XRTSpectra:
+        """XRT spectra of the GRB."""
+        from gamma_burst.spectra import XRTSpectra  # noqa: PLC0415
+        return XRTSpectra(self.grb_name, **self._client_kwargs())
+
+
+def _on_axes(draw: Callable[[GRBProducts, Axes], Any]) -> Callable[[GRBProducts, Figure], None]:
+    def render(products: GRBProducts, figure: Figure) -> None:
+        figure.set_size_inches(DEFAULT_FIGSIZE)
+        draw(products, figure.add_subplot())
+    return render
+
+
+def _first_snr(products: GRBProducts) -> str:
+    snrs = products.burst_analyser.key_index.snr
+    if not snrs:
+        raise ValueError('No SNR binning available')
+    return snrs[0]
+
+
+PLOT_TYPES: dict[str, Callable[[GRBProducts, Figure], None]] = {
+    'bat_binning_lc': lambda products, figure: products.burst_analyser.subplot_all_binning_lc(fig=figure),
+    'bat_snr_lc': lambda products, figure: products.burst_analyser.subplot_all_snr_lc(fig=figure),
+    'bat_hr': _on_axes(lambda products, ax: products.burst_analyser.plot_light_curve_hr(ax=ax)),
+    'bat_gamma': _on_axes(lambda products, ax: products.burst_analyser.plot_light_curve_gamma(ax=ax)),
+    'bat_cumulated_flux': _on_axes(
+        lambda products, ax: products.burst_analyser.plot_time_and_cumulated_flux(_first_snr(products), ax=ax)
+    ),
+    'xrt_wt_lc': _on_axes(lambda products, ax: products.light_curve.plot_light_curve(ObservationMode.WT_Mode, ax=ax)),
+    'xrt_pc_lc': _on_axes(lambda products, ax: products.light_curve.plot_light_curve(ObservationMode.PC_Mode, ax=ax)),
+    'xrt_wt_hr': _on_axes(
+        lambda products, ax: products.light_curve.plot_light_curve_HR(ObservationMode.WT_Mode, ax=ax)
+    ),
+    'xrt_pc_hr': _on_axes(
+        lambda products, ax: products.light_curve.plot_light_curve_HR(ObservationMode.PC_Mode, ax=ax)
+    ),
+    'xrt_wt_spectra': _on_axes(
+        lambda products, ax: products.spectra.plot_spectra(ObservationMode.WT_Mode, (0.3, 10), ax=ax)
+    ),
+    'xrt_pc_spectra': _on_axes(
+        lambda products, ax: products.spectra.plot_spectra(ObservationMode.PC_Mode, (0.3, 10), ax=ax)
+    ),
+}
+
+
+@dataclass
+class RenderResult:
+    """Outcome of the rendering of one plot of one GRB."""
+
+    grb_name: str
+    plot_type: str
+    paths: list[Path]
+    duration: float
+    error: str | None = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the plot was rendered."""
+        return self.error is None
+
+
+@dataclass
+class RenderReport:
+    """Summary of a batch rendering."""
+
+    results: list[RenderResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> list[RenderResult]:
+        """Results of the plots rendered."""
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> list[RenderResult]:
+        """Results of the plots in error."""
+        return [result for result in self.results if not result.success]
+
+    def summary(self) -> str:
+        """Human readable summary of the batch."""
+        lines = [f'Rendered {len(self.succeeded)}/{len(self.results)} plots in {self.duration:.1f}s']
+        lines.extend(f'  FAILED {result.grb_name} {result.plot_type}: {result.error}' for result in self.failed)
+        return '\n'.join(lines)
+
+
+def file_stem(grb_name: str, plot_type: str) -> str:
+    """Name of the files of a plot, without extension."""
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', grb_name)}_{plot_type}"
+
+
+def print_progress(result: RenderResult) -> None:
+    """Progress callback printing each rendered plot, for :func:`render_many`."""
+    status = 'ok' if result.success else f'FAILED ({result.error})'
+    print(f'{result.grb_name} {result.plot_type}: {status} ({result.duration:.1f}s)')
+
+
+def _check_render_args(plot_types: Iterable[str], formats: Iterable[str]) -> tuple[list[str], list[str]]:
+    plot_types = list(plot_types)
+    formats = list(formats)
+    unknown = [plot_type for plot_type in plot_types if plot_type not in PLOT_TYPES]
+    if unknown:
+        raise ValueError(f'Unknown plot types {unknown}, should be in {list(PLOT_TYPES)}')
+    unsupported = [file_format for file_format in formats if file_format not in RENDER_FORMATS]
+    if unsupported:
+        raise ValueError(f'Unsupported formats {unsupported}, should be in {list(RENDER_FORMATS)}')
+    return plot_types, formats
+
+
+def render_grb(
+        grb_name: str,
+        plot_types: Iterable[str] = tuple(PLOT_TYPES),
+        output_dir: Path = Path('.'),
+        formats: Iterable[str] = ('png',),
+        *,
+        figure: Figure | None = None,
+        client: DataSource | None = None,
+    ) -> list[RenderResult]:
+    """Render plots of a GRB to files.
+
+    Every plot is drawn on the same figure, cleared in between, and a plot
+    that fails (e.g. a mode without data) does not stop the others.
+
+    Args:
+        grb_name (str): GRB's name.
+        plot_types (Iterable[str]): Keys of :data:`PLOT_TYPES` to render.
+        output_dir (Path): Folder of the rendered files.
+        formats (Iterable[str]): File formats, among :data:`RENDER_FORMATS`.
+        figure (Figure | None): Figure to draw on, a new one if None.
+        client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+
+    Returns:
+        list[RenderResult]: Result of every plot.
+
+    """
+    plot_types, formats = _check_render_args(plot_types, formats)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if figure is None:
+        from matplotlib.figure import Figure  # noqa: PLC0415
+        figure = Figure()
+    products = GRBProducts(grb_name, client)
+
+    results = []
+    for plot_type in plot_types:
+        start = time.monotonic()
+        figure.clear()
+        try:
+            PLOT_TYPES[plot_type](products, figure)
+            paths = []
+            for file_format in formats:
+                path = output_dir / f'{file_stem(grb_name, plot_type)}.{file_format}'
+                figure.savefig(path, format=file_format)
+                paths.append(path)
+            results.append(RenderResult(grb_name, plot_type, paths, time.monotonic() - start))
+        except Exception as error:
+            results.append(RenderResult(grb_name, plot_type, [], time.monotonic() - start, repr(error)))
+    figure.clear()
+    return results
+
+
+_worker_figure: Figure | None = None
+
+
+def _init_worker() -> None:
+    global _worker_figure  # noqa: PLW0603
+    import matplotlib  # noqa: PLC0415
+    from matplotlib.figure import Figure  # noqa: PLC0415
+    matplotlib.use('Agg')
+    _worker_figure = Figure()
+
+
+def _render_in_worker(
+        grb_name: str,
+        plot_types: list[str],
+        output_dir: Path,
+        formats: list[str],
+        client: DataSource | None
+    ) -> list[RenderResult]:
+    return render_grb(grb_name, plot_types, output_dir, formats, figure=_worker_figure, client=client)
+
+
+def render_many(
+        grb_names: Iterable[str],
+        plot_types: Iterable[str] = tuple(PLOT_TYPES),
+        output_dir: Path = Path('.'),
+        formats: Iterable[str] = ('png',),
+        *,
+        max_workers: int | None = None,
+        client: DataSource | None = None,
+        progress: Callable[[RenderResult], None] | None = None,
+    ) -> RenderReport:
+    """Render plots of several GRBs to files across a process pool.
+
+    Each worker uses the Agg backend and draws every plot it is given on a
+    single figure, so the figure setup is paid once per worker.
+
+    Args:
+        grb_names (Iterable[str]): GRBs' names.
+        plot_types (Iterable[str]): Keys of :data:`PLOT_TYPES` to render for every GRB.
+        output_dir (Path): Folder of the rendered files.
+        formats (Iterable[str]): File formats, among :data:`RENDER_FORMATS`.
+        max_workers (int | None): Number of worker processes, the number of CPUs if None.
+        client (DataSource | None): Picklable source of the UKSSDC products,
+            :func:`data_source.get_data_source` of every worker if None.
+        progress (Callable | None): Called with each result.
+
+    Returns:
+        RenderReport: Result of every plot.
+
+    """
+    plot_types, formats = _check_render_args(plot_types, formats)
+    output_dir = Path(output_dir)
+    report = RenderReport()
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = [
+            executor.submit(_render_in_worker, grb_name, plot_types, output_dir, formats, client)
+            for grb_name in grb_names
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                report.results.append(result)
+                if progress is not None:
+                    progress(result)
+    report.duration = time.monotonic() - start
+    return report
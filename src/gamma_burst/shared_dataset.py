@@ -0,0 +1,386 @@
+"""Light curves and spectral series shared by the worker processes of a node.
+
+A :class:`SharedDataset` copies the arrays of several series (light curves,
+spectral series, joint flux series or plain arrays) once into a single
+block of shared memory, or of a memory-mapped temporary file. Workers
+receive a small picklable :class:`SharedDatasetHandle` instead of the
+data, attach to the block by name and rebuild the series as read-only
+NumPy views of it, without copy nor deserialisation.
+
+The publishing dataset owns the block: closing it (or leaving its ``with``
+statement) removes the block once every process has closed its views.
+Attached datasets only close their own mapping. Every array is handed out
+as a view of a memoryview of the mapping, so a mapping whose arrays are
+still referenced refuses to close instead of leaving them dangling. :func:`map_shared` runs a
+function on several entries across a process pool, each worker attaching
+once to the block.
+"""
+
+import math
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import TypeVar
+from uuid import uuid4
+
+import numpy as np
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import JointFluxSeries, LightCurve, SpectralSeries, _ArraySeries
+from gamma_burst.eumerations import Instrument, SharedBackend
+
+ALIGNMENT = 64
+SERIES_TYPES: dict[str, type[_ArraySeries]] = {
+    series_type.__name__: series_type for series_type in (LightCurve, SpectralSeries, JointFluxSeries)
+}
+ARRAY_KIND = 'ndarray'
+
+Entry = _ArraySeries | np.ndarray
+_T = TypeVar('_T')
+
+_unreleased: list[shared_memory.SharedMemory] = []
+_tracker_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ArrayLayout:
+    """Position of one array in the block."""
+
+    offset: int
+    dtype: str
+    shape: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class EntryLayout:
+    """Arrays of one entry: ``time`` and the columns of a series, ``values`` for a plain array."""
+
+    kind: str
+    arrays: dict[str, ArrayLayout]
+
+
+@dataclass(frozen=True)
+class SharedDatasetHandle:
+    """Picklable reference to a shared block, sent to the workers instead of the data.
+
+    ``name`` is the shared memory name or the path of the memory-mapped file.
+    """
+
+    name: str
+    backend: SharedBackend
+    size: int
+    layout: dict[str, EntryLayout]
+
+
+def _entry_arrays(entry: Entry) -> tuple[str, dict[str, np.ndarray]]:
+    if isinstance(entry, np.ndarray):
+        return ARRAY_KIND, {'values': entry}
+    kind = type(entry).__name__
+    if kind not in SERIES_TYPES:
+        raise ValueError(f'Cannot share a {kind}, should be an array or one of {list(SERIES_TYPES)}')
+    arrays = {'time': entry.time}
+    arrays.update({name: getattr(entry, name) for name in entry._fields if getattr(entry, name) is not None})
+    return kind, arrays
+
+
+def _plan(entries: Mapping[str, Entry]) -> tuple[dict[str, EntryLayout], list[tuple[ArrayLayout, np.ndarray]], int]:
+    """Layout of the entries in the block, every array aligned on :data:`ALIGNMENT` bytes."""
+    layout = {}
+    copies = []
+    size = 0
+    for key, entry in entries.items():
+        kind, arrays = _entry_arrays(entry)
+        array_layouts = {}
+        for name, value in arrays.items():
+            array = np.asarray(value)
+            if array.dtype.hasobject:
+                raise ValueError(f'Array {name} of {key} holds Python objects and cannot be shared')
+            array_layouts[name] = ArrayLayout(size, array.dtype.str, array.shape)
+            copies.append((array_layouts[name], array))
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        layout[str(key)] = EntryLayout(kind, array_layouts)
+    return layout, copies, size
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block without registering it to the resource tracker of this process.
+
+    Before Python 3.13 an attaching process registers the block as its own,
+    and its resource tracker removes it when the process exits. Unregistering
+    it afterwards would also drop the registration of the publisher, which
+    shares the tracker of its worker processes, so registration is disabled
+    while attaching. The patch is process-wide: blocks of this module are
+    only created under the same lock.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedDataset(Mapping[str, Entry]):
+    """Read-only series of a shared block, by key.
+
+    Use :meth:`publish` to create a block and :meth:`attach` to open it in
+    another process.
+    """
+
+    def __init__(self, handle: SharedDatasetHandle, owner: bool = False) -> None:
+        """Open the block of a handle, see :meth:`publish` and :meth:`attach`.
+
+        Args:
+            handle (SharedDatasetHandle): Reference to the block.
+            owner (bool): Whether closing the dataset removes the block.
+
+        """
+        self.handle = handle
+        self.owner = owner
+        self._entries: dict[str, Entry] = {}
+        self._shared_memory: shared_memory.SharedMemory | None = None
+        self._mmap: mmap.mmap | None = None
+        self._buffer: memoryview | None
+        if handle.backend == SharedBackend.SharedMemory:
+            if owner:
+                with _tracker_lock:
+                    self._shared_memory = shared_memory.SharedMemory(name=handle.name)
+            else:
+                self._shared_memory = _attach_shared_memory(handle.name)
+            self._buffer = self._shared_memory.buf
+        else:
+            with open(handle.name, 'rb') as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        self._mapped = True
+
+    @classmethod
+    def publish(
+            cls,
+            entries: Mapping[str, Entry],
+            backend: SharedBackend = SharedBackend.SharedMemory,
+            directory: Path | None = None
+        ) -> 'SharedDataset':
+        """Copy series and arrays into a new shared block, owned by the returned dataset.
+
+        Args:
+            entries (Mapping[str, Entry]): Light curves, spectral series, joint flux series or arrays by key.
+            backend (SharedBackend): Shared memory, or a memory-mapped file (e.g. when ``/dev/shm`` is small).
+            directory (Path | None): Folder of the memory-mapped file, the temporary folder if None.
+
+        Returns:
+            SharedDataset: Dataset owning the block.
+
+        """
+        layout, copies, size = _plan(entries)
+        size = max(size, 1)
+        block: shared_memory.SharedMemory | mmap.mmap
+        buffer: memoryview | None
+        if backend == SharedBackend.SharedMemory:
+            with _tracker_lock:
+                block = shared_memory.SharedMemory(create=True, size=size)
+            name, buffer = block.name, block.buf
+        else:
+            directory = Path(directory) if directory is not None else Path(tempfile.gettempdir())
+            name = str(directory / f'gamma_burst_{os.getpid()}_{uuid4().hex}.bin')
+            with open(name, 'w+b') as file:
+                file.truncate(size)
+                block = mmap.mmap(file.fileno(), size)
+            buffer = memoryview(block)
+        try:
+            for array_layout, array in copies:
+                target = np.ndarray(array_layout.shape, array_layout.dtype, buffer=buffer, offset=array_layout.offset)
+                target[...] = array
+            dataset = cls(SharedDatasetHandle(name, backend, size, layout), owner=True)
+        except BaseException:
+            if isinstance(block, shared_memory.SharedMemory):
+                block.unlink()
+            else:
+                Path(name).unlink(missing_ok=True)
+            raise
+        finally:
+            if buffer is not None:
+                buffer.release()
+            block.close()
+        return dataset
+
+    @classmethod
+    def attach(cls, handle: SharedDatasetHandle) -> 'SharedDataset':
+        """Open the block of a handle published by another process, without owning it."""
+        return cls(handle, owner=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared block."""
+        return self.handle.size
+
+    @property
+    def closed(self) -> bool:
+        """Whether the dataset was closed, its mapping staying open while its arrays are referenced."""
+        return self._buffer is None
+
+    def _array(self, buffer: memoryview, array_layout: ArrayLayout) -> np.ndarray:
+        # frombuffer keeps a view of the buffer, an export of the mapping which then cannot be closed under it
+        count = math.prod(array_layout.shape)
+        array = np.frombuffer(buffer, array_layout.dtype, count, array_layout.offset).reshape(array_layout.shape)
+        array.flags.writeable = False
+        return array
+
+    def __getitem__(self, key: str) -> Entry:
+        """Entry of a key, as read-only views of the block."""
+        buffer = self._buffer
+        if buffer is None:
+            raise ValueError('Shared dataset is closed')
+        if key not in self._entries:
+            entry_layout = self.handle.layout[key]
+            arrays = {name: self._array(buffer, array_layout) for name, array_layout in entry_layout.arrays.items()}
+            if entry_layout.kind == ARRAY_KIND:
+                self._entries[key] = arrays['values']
+            else:
+                self._entries[key] = SERIES_TYPES[entry_layout.kind].from_arrays(**arrays)
+        return self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Keys of the entries."""
+        return iter(self.handle.layout)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.handle.layout)
+
+    def __repr__(self) -> str:
+        """Name, size and ownership of the block."""
+        return (
+            f'{type(self).__name__}(name={self.handle.name!r}, nb_entries={len(self)}, '
+            f'nbytes={self.nbytes}, owner={self.owner})'
+        )
+
+    def close(self) -> None:
+        """Remove the block if owned, then close the mapping of this process.
+
+        The dataset stops serving entries even if the mapping stays open: close
+        it again once its arrays are deleted.
+
+        Raises:
+            ValueError: If arrays of the dataset are still referenced outside of it,
+                the mapping staying open (the block is removed anyway).
+
+        """
+        if not self._mapped:
+            return
+        self._entries.clear()
+        if self.owner:
+            if self._shared_memory is not None:
+                self._shared_memory.unlink()
+            else:
+                Path(self.handle.name).unlink(missing_ok=True)
+            self.owner = False
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        try:
+            if self._shared_memory is not None:
+                self._shared_memory.close()
+            elif self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            raise ValueError(
+                'Arrays of the shared dataset are still referenced, delete them and close it again'
+            ) from None
+        self._mapped = False
+
+    def __del__(self) -> None:
+        """Close the dataset, keeping the block alive while arrays still use it."""
+        if not getattr(self, '_mapped', False):
+            return
+        try:
+            self.close()
+        except ValueError:
+            # SharedMemory closes its mapping again when collected, keep it while arrays use it
+            if self._shared_memory is not None:
+                _unreleased.append(self._shared_memory)
+
+    def __enter__(self) -> 'SharedDataset':
+        """Return the dataset, closed on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the dataset."""
+        self.close()
+
+
+def burst_entries(
+        analyser: BurstAnalyser,
+        filters: Iterable[str] = ('TimeBins_64ms',),
+        instrument: Instrument = Instrument.BAT_Sensor,
+        dtype: type = np.float64
+    ) -> dict[str, Entry]:
+    """Light curves and spectral series of a burst, keyed ``'<GRB>/<filter>/<kind>'``.
+
+    ``<kind>`` is ``light_curve`` or ``spectral_series``.
+
+    Args:
+        analyser (BurstAnalyser): Burst analyser of the GRB.
+        filters (Iterable[str]): Binnings (e.g. ``'TimeBins_64ms'`` or ``'SNR4'``).
+        instrument (Instrument): ``Instrument.BAT_Sensor`` or ``Instrument.BAT_Sensor_NoEvolution``,
+            only the evolving data have spectral series.
+        dtype (type): Precision of the columns other than time.
+
+    """
+    entries: dict[str, Entry] = {}
+    for filter in filters:
+        entries[f'{analyser.grb_name}/{filter}/light_curve'] = analyser.light_curve(filter, instrument, dtype)
+        if instrument == Instrument.BAT_Sensor:
+            entries[f'{analyser.grb_name}/{filter}/spectral_series'] = analyser.spectral_series(filter, dtype)
+    return entries
+
+
+_attached: dict[str, SharedDataset] = {}
+
+
+def _apply_shared(function: Callable[[Entry], _T], handle: SharedDatasetHandle, key: str) -> _T:
+    """Run a function on an entry in a worker, attaching once per worker to each block."""
+    dataset = _attached.get(handle.name)
+    if dataset is None or dataset.closed:
+        dataset = _attached[handle.name] = SharedDataset.attach(handle)
+    return function(dataset[key])
+
+
+def map_shared(
+        function: Callable[[Entry], _T],
+        dataset: SharedDataset,
+        keys: Iterable[str] | None = None,
+        max_workers: int | None = None
+    ) -> dict[str, _T]:
+    """Run a function on entries of a shared dataset across a process pool.
+
+    Only the handle of the dataset and the keys are sent to the workers.
+
+    Args:
+        function (Callable[[Entry], _T]): Picklable function of one entry (e.g. a module-level
+            function or a ``functools.partial``), its result should be picklable too.
+        dataset (SharedDataset): Published dataset, kept open until the workers are done.
+        keys (Iterable[str] | None): Keys of the entries, every key if None.
+        max_workers (int | None): Number of worker processes, the number of CPUs if None.
+
+    Returns:
+        dict[str, _T]: Results by key.
+
+    """
+    keys = list(dataset) if keys is None else list(keys)
+    unknown = [key for key in keys if key not in dataset.handle.layout]
+    if unknown:
+        raise ValueError(f'Unknown shared entries {unknown}')
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(_apply_shared, function, dataset.handle, key) for key in keys}
+        return {key: future.result() for key, future in futures.items()}
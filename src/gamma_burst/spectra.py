@@ -1,55 +1,79 @@
 """Spectra class."""
 
-from pathlib import Path
-from matplotlib import pyplot as plt
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
-import swifttools.ukssdc.data.GRB as udg
-import pickle
 
-from gamma_burst.eumerations import ObservationMode
+from gamma_burst import metrics
+from gamma_burst.cache_manager import CacheManager, get_cache_manager
+from gamma_burst.cache_policy import CachePolicy, load_pickle, save_pickle
+from gamma_burst.data_source import DataSource, cache_params, get_data_source
+from gamma_burst.eumerations import ObservationMode, ProductType
+from gamma_burst.rendering import get_axes, show_figures
+from gamma_burst.spectral_models import cutoff_power_law, energy_grid, power_law
+from gamma_burst.uncertainty import ErrorBand, power_law_error_band
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 class XRTSpectra:
 
-    def __init__(self, grb_name: str) -> None:
+    def __init__(
+            self,
+            grb_name: str,
+            client: DataSource | None = None,
+            policy: CachePolicy | None = None,
+            cache: CacheManager | None = None
+        ) -> None:
+        """Create a spectra and recover its data.
+
+        Args:
+            grb_name (str): GRB's name.
+            client (DataSource | None): Source of the UKSSDC products, :func:`data_source.get_data_source` if None.
+            policy (CachePolicy | None): Cache freshness policy, read from the environment if None.
+            cache (CacheManager | None): Cache of the downloaded products, the default one if None.
+
+        """
         self.grb_name: str = grb_name
+        self.client = client if client is not None else get_data_source()
+        self.policy = policy
+        self.cache = cache if cache is not None else get_cache_manager()
         self.s_data = self.recover_spectra()
         pass
 
+    def request_params(self) -> dict:
+        """Parameters of the spectra request, which identify its cache entry."""
+        return {'GRBName': self.grb_name, 'returnData': True, 'saveData': True}
+
+    def cache_entry(self) -> str:
+        """Version of the cached data, see :meth:`CacheManager.entry_version`."""
+        params = cache_params(self.request_params(), self.client)
+        return self.cache.entry_version(ProductType.Spectra, params, 'spectra_data.pkl')
+
     def recover_spectra(self) -> dict:
         """Recover spectra data.
 
         Args:
             grb_name (str): GRB's name.
         """
-        home_path = Path.home().joinpath(".gamma_burst")
-        if not home_path.exists():
-            home_path.mkdir(parents=True, exist_ok=True)
-        
-        folder_path = home_path.joinpath(self.grb_name).joinpath('spectra')
-        
-        cache_file = folder_path / 'spectra_data.pkl'
-        
-        if not cache_file.exists():
-            folder_path.mkdir(parents=True, exist_ok=True)
-            
-            spectra_data = udg.getSpectra(
-                GRBName=self.grb_name,
-                returnData=True,
-                saveData=True,
-                silent=False
-            )
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(spectra_data, f)
-        else:
-            with open(cache_file, 'rb') as f:
-                spectra_data = pickle.load(f)
-
+        params = self.request_params()
+
+        spectra_data = self.cache.load_or_fetch(
+            product=ProductType.Spectra,
+            params=cache_params(params, self.client),
+            file_name='spectra_data.pkl',
+            fetch=lambda entry_path: self.client.getSpectra(**params, destDir=str(entry_path), silent=False),
+            load=load_pickle,
+            save=save_pickle,
+            policy=self.policy,
+        )
         self.s_data = spectra_data
         return spectra_data
 
     def print_fields(self):
+        import pandas as pd  # noqa: PLC0415
         for key in self.s_data:
             data = self.s_data[key]
             if isinstance(data, pd.DataFrame):
@@ -57,54 +81,131 @@ class XRTSpectra:
             else:
                 print(f"{key} : {data}")
 
-    def plot_spectra(self, mode: ObservationMode, energy_scale : tuple[float, float], delta_e: float = 1, plot_error: bool = False):
+    def compute_error_band(
+            self,
+            mode: ObservationMode,
+            energy: np.ndarray,
+            nb_samples: int = 1000,
+            confidence: float = 0.6827,
+            seed: int | None = None
+        ) -> ErrorBand:
+        """Propagate the power law errors of a mode to its spectrum by Monte Carlo.
+
+        Args:
+            mode (ObservationMode): ``ObservationMode.PC_Mode`` or ``ObservationMode.WT_Mode``.
+            energy (np.ndarray): Energies in keV.
+            nb_samples (int): Number of Monte Carlo samples.
+            confidence (float): Probability of the central interval.
+            seed (int | None): Seed of the random generator.
+
+        """
+        power_law_fit = self.s_data['interval0'][mode]['PowerLaw']
+        return power_law_error_band(
+            energy,
+            power_law_fit['Gamma'],
+            power_law_fit['GammaPos'],
+            power_law_fit['GammaNeg'],
+            power_law_fit['ObsFlux'],
+            power_law_fit['ObsFluxPos'],
+            power_law_fit['ObsFluxNeg'],
+            nb_samples=nb_samples,
+            confidence=confidence,
+            seed=seed,
+        )
+
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_spectra(
+            self,
+            mode: ObservationMode,
+            energy_scale : tuple[float, float],
+            *,
+            nb_points: int = 200,
+            plot_error: bool = False,
+            nb_samples: int = 1000,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot the power law spectrum fitted in a mode.
+
+        Args:
+            mode (ObservationMode): ``ObservationMode.PC_Mode`` or ``ObservationMode.WT_Mode``.
+            energy_scale (tuple[float, float]): Energy range in keV.
+            nb_points (int): Number of log-spaced energies.
+            plot_error (bool): Whether to shade the Monte Carlo error band.
+            nb_samples (int): Number of Monte Carlo samples of the error band.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
+
+        """
         if mode not in [ObservationMode.PC_Mode, ObservationMode.WT_Mode]:
             raise ValueError("Mode should be ObservationMode.PC_Mode or ObservationMode.WT_Mode")
         gamma = self.s_data['interval0'][mode]['PowerLaw']['Gamma']
         obs_flux = self.s_data['interval0'][mode]['PowerLaw']['ObsFlux']
 
-        energy = np.arange(energy_scale[0], energy_scale[1], delta_e)
-        flux = [obs_flux * (energy_value/50) ** -gamma for energy_value in energy]
+        energy = energy_grid(energy_scale[0], energy_scale[1], nb_points)
+        flux = power_law(energy, obs_flux, -gamma)
         
+        ax, show = get_axes(ax)
+        ax.plot(energy, flux, label=mode)
         if plot_error:
-            gamma_pos_err = self.s_data['interval0'][mode]['PowerLaw']['GammaNeg'] + gamma
-            gamma_neg_err = self.s_data['interval0'][mode]['PowerLaw']['GammaPos'] + gamma
-            obs_flux_pos_err = self.s_data['interval0'][mode]['PowerLaw']['ObsFluxPos'] + gamma
-            obs_flux_neg_err = self.s_data['interval0'][mode]['PowerLaw']['ObsFluxNeg'] + gamma
-
-            flux_error_neg = [obs_flux_neg_err * energy_value ** gamma_neg_err for energy_value in energy]
-            flux_error_pos = [obs_flux_pos_err * energy_value ** gamma_pos_err for energy_value in energy]
-
-            error = []
-            for flux_value, error_pos, error_neg in zip(flux, flux_error_pos, flux_error_neg):
-                error.append(abs((error_pos+error_neg)/2-flux_value))
-            plt.errorbar(energy, flux, yerr=error, fmt='o-', label=mode)
-        else:
-            plt.plot(energy, flux)
-        plt.xlabel('Energy (kev)')
-        plt.ylabel('Flux (erg/cm2/s)')
-        plt.xscale('log')
-        plt.yscale('log')
-        plt.title(f'Flux for {self.grb_name} in {mode}')
-        plt.legend()
-        plt.show()
+            band = self.compute_error_band(mode, energy, nb_samples)
+            ax.fill_between(energy, band.lower, band.upper, alpha=0.3, label=f'{mode} {band.confidence:.0%} interval')
+        ax.set_xlabel('Energy (kev)')
+        ax.set_ylabel('Flux (erg/cm2/s)')
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_title(f'Flux for {self.grb_name} in {mode}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
     
-    def plot_spectra_band(self, alpha_PL: float, K_PL:float, alpha_CPL: float, K_CPL:float, Epeak:float, energy_scale : tuple[float, float], delta_e: float = 1):
+    @metrics.timed('gamma_burst_plot_seconds')
+    def plot_spectra_band(
+            self,
+            alpha_PL: float,
+            K_PL:float,
+            alpha_CPL: float,
+            K_CPL:float,
+            Epeak:float,
+            *,
+            energy_scale : tuple[float, float],
+            nb_points: int = 200,
+            ax: Axes | None = None,
+        ) -> Axes:
+        """Plot a power law and a cutoff power law, normalised at 50 keV.
 
-        energy = np.arange(energy_scale[0], energy_scale[1], delta_e)
-        flux_PL = [K_PL * (energy_value/50) ** alpha_PL for energy_value in energy]
+        Args:
+            alpha_PL (float): Index of the power law.
+            K_PL (float): Normalisation of the power law.
+            alpha_CPL (float): Index of the cutoff power law.
+            K_CPL (float): Normalisation of the cutoff power law.
+            Epeak (float): Peak energy of the cutoff power law in keV.
+            energy_scale (tuple[float, float]): Energy range in keV.
+            nb_points (int): Number of log-spaced energies.
+            ax (Axes | None): Axes to draw on, a new figure shown at the end if None.
+
+        Returns:
+            Axes: The axes drawn on.
 
-        flux_CPL = [K_CPL * (energy_value/50) ** alpha_CPL*np.exp(-energy_value*(2+alpha_CPL)/Epeak) for energy_value in energy]
+        """
+        energy = energy_grid(energy_scale[0], energy_scale[1], nb_points)
+        flux_PL = power_law(energy, K_PL, alpha_PL)
+        flux_CPL = cutoff_power_law(energy, K_CPL, alpha_CPL, Epeak)
         
-        plt.plot(energy, flux_PL, label='Power Law')
-        plt.plot(energy, flux_CPL, label='Cutoff Power Law')
-        plt.xlabel('Energy (kev)')
-        plt.ylabel('Flux (cts/s/cm2/kev)')
-        plt.xscale('log')
-        plt.yscale('log')
-        plt.title(f'Powerlaw modelizations for {self.grb_name}')
-        plt.legend()
-        plt.show()
+        ax, show = get_axes(ax)
+        ax.plot(energy, flux_PL, label='Power Law')
+        ax.plot(energy, flux_CPL, label='Cutoff Power Law')
+        ax.set_xlabel('Energy (kev)')
+        ax.set_ylabel('Flux (cts/s/cm2/kev)')
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_title(f'Powerlaw modelizations for {self.grb_name}')
+        ax.legend()
+        if show:
+            show_figures()
+        return ax
 
 
 if __name__ == '__main__':
@@ -117,5 +218,5 @@ if __name__ == '__main__':
         alpha_CPL=-1.44935,
         K_CPL=3.39882E-04,
         Epeak=57.0008,
-        energy_scale=(0,1e4),
-    )
\ No newline at end of file
+        energy_scale=(1,1e4),
+    )
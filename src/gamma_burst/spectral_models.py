@@ -0,0 +1,205 @@
+"""Photon spectral models evaluated over energy grids and parameter batches.
+
+Every model takes energies in keV of shape (nb_energies,) and parameters
+that are scalars or arrays of any shape (...). Parameter arrays broadcast
+together and the result has shape (..., nb_energies), so a whole table of
+parameter sets (e.g. every row of a ``BATBand`` table) is evaluated in one
+call. Spectra are photon spectra N(E) in the unit of the amplitude.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+KEV_TO_ERG = 1.602176634e-9
+BLACKBODY_NORM = 8.0525  # XSPEC bbody: amplitude = L39 / D10**2
+
+
+def energy_grid(e_min: float, e_max: float, nb_points: int = 200) -> np.ndarray:
+    """Log spaced energies in keV.
+
+    Args:
+        e_min (float): Lowest energy in keV, strictly positive.
+        e_max (float): Highest energy in keV.
+        nb_points (int): Number of energies.
+
+    Returns:
+        np.ndarray: Energies, shape (nb_points,).
+
+    """
+    if e_min <= 0 or e_max <= e_min:
+        raise ValueError('Energies should satisfy 0 < e_min < e_max')
+    return np.geomspace(e_min, e_max, nb_points)
+
+
+def _expand(*params: float | np.ndarray) -> list[np.ndarray]:
+    """Add a trailing energy axis to the parameters."""
+    return [np.expand_dims(np.asarray(param, dtype=float), -1) for param in params]
+
+
+def power_law(
+        energy: np.ndarray,
+        amplitude: float | np.ndarray,
+        index: float | np.ndarray,
+        pivot: float = 50.0
+    ) -> np.ndarray:
+    """Power law ``A * (E / pivot) ** index``.
+
+    A photon index ``Gamma`` as given by the UKSSDC corresponds to ``index = -Gamma``.
+
+    Args:
+        energy (np.ndarray): Energies in keV.
+        amplitude (float | np.ndarray): Value at the pivot energy.
+        index (float | np.ndarray): Spectral index.
+        pivot (float): Pivot energy in keV.
+
+    """
+    amplitude, index = _expand(amplitude, index)
+    return amplitude * (energy / pivot) ** index
+
+
+def cutoff_power_law(
+        energy: np.ndarray,
+        amplitude: float | np.ndarray,
+        alpha: float | np.ndarray,
+        epeak: float | np.ndarray,
+        pivot: float = 50.0
+    ) -> np.ndarray:
+    """Cutoff power law ``A * (E / pivot) ** alpha * exp(-E * (2 + alpha) / Epeak)``.
+
+    Args:
+        energy (np.ndarray): Energies in keV.
+        amplitude (float | np.ndarray): Amplitude.
+        alpha (float | np.ndarray): Low energy spectral index.
+        epeak (float | np.ndarray): Peak energy of the E**2 N(E) spectrum in keV.
+        pivot (float): Pivot energy in keV.
+
+    """
+    amplitude, alpha, epeak = _expand(amplitude, alpha, epeak)
+    return amplitude * (energy / pivot) ** alpha * np.exp(-energy * (2 + alpha) / epeak)
+
+
+def band(
+        energy: np.ndarray,
+        amplitude: float | np.ndarray,
+        alpha: float | np.ndarray,
+        beta: float | np.ndarray,
+        epeak: float | np.ndarray,
+        *,
+        pivot: float = 100.0
+    ) -> np.ndarray:
+    """Band function: a cutoff power law smoothly joined to a power law of index ``beta``.
+
+    Args:
+        energy (np.ndarray): Energies in keV.
+        amplitude (float | np.ndarray): Amplitude.
+        alpha (float | np.ndarray): Low energy spectral index.
+        beta (float | np.ndarray): High energy spectral index, lower than ``alpha``.
+        epeak (float | np.ndarray): Peak energy of the E**2 N(E) spectrum in keV.
+        pivot (float): Pivot energy in keV.
+
+    """
+    amplitude, alpha, beta, epeak = _expand(amplitude, alpha, beta, epeak)
+    e_break = (alpha - beta) * epeak / (2 + alpha)
+    low = (energy / pivot) ** alpha * np.exp(-energy * (2 + alpha) / epeak)
+    high = (e_break / pivot) ** (alpha - beta) * np.exp(beta - alpha) * (energy / pivot) ** beta
+    return amplitude * np.where(energy < e_break, low, high)
+
+
+def blackbody(energy: np.ndarray, amplitude: float | np.ndarray, kt: float | np.ndarray) -> np.ndarray:
+    """Blackbody photon spectrum, normalised as the XSPEC ``bbody`` model.
+
+    Args:
+        energy (np.ndarray): Energies in keV.
+        amplitude (float | np.ndarray): Luminosity in 1e39 erg/s over the squared distance in 10 kpc.
+        kt (float | np.ndarray): Temperature in keV.
+
+    """
+    amplitude, kt = _expand(amplitude, kt)
+    with np.errstate(over='ignore'):  # exp(E / kT) overflows to inf far in the Wien tail, giving 0
+        return amplitude * BLACKBODY_NORM * energy**2 / (kt**4 * np.expm1(energy / kt))
+
+
+def power_law_integral(
+        e_min: float,
+        e_max: float,
+        amplitude: float | np.ndarray,
+        index: float | np.ndarray,
+        *,
+        pivot: float = 50.0,
+        energy_flux: bool = False
+    ) -> np.ndarray:
+    """Analytic integral of :func:`power_law` between two energies.
+
+    Args:
+        e_min (float): Lower bound in keV.
+        e_max (float): Upper bound in keV.
+        amplitude (float | np.ndarray): Value at the pivot energy.
+        index (float | np.ndarray): Spectral index.
+        pivot (float): Pivot energy in keV.
+        energy_flux (bool): Integrate E N(E) (keV flux) instead of N(E) (photon flux).
+
+    Returns:
+        np.ndarray: Integrated flux, shape of the broadcast parameters.
+
+    """
+    amplitude = np.asarray(amplitude, dtype=float)
+    exponent = np.asarray(index, dtype=float) + 1 + energy_flux
+    scale = pivot ** (1 + energy_flux)
+    ratio_min, ratio_max = e_min / pivot, e_max / pivot
+    is_log = np.isclose(exponent, 0)
+    safe_exponent = np.where(is_log, 1.0, exponent)
+    integral = np.where(
+        is_log,
+        np.log(ratio_max / ratio_min),
+        (ratio_max**safe_exponent - ratio_min**safe_exponent) / safe_exponent,
+    )
+    return amplitude * scale * integral
+
+
+def band_ratio(
+        gamma: float | np.ndarray,
+        source_band: tuple[float, float],
+        target_band: tuple[float, float],
+    ) -> np.ndarray:
+    """Energy flux in a target band over the energy flux in a source band, for power laws of photon index ``gamma``."""
+    index = -np.asarray(gamma, dtype=float)
+    return (
+        power_law_integral(*target_band, 1.0, index, energy_flux=True)
+        / power_law_integral(*source_band, 1.0, index, energy_flux=True)
+    )
+
+
+def integrated_flux(
+        model: Callable[..., np.ndarray],
+        e_min: float,
+        e_max: float,
+        *params: float | np.ndarray,
+        energy_flux: bool = False,
+        nb_points: int = 256,
+        **kwargs: float
+    ) -> np.ndarray:
+    """Integral of a model between two energies.
+
+    Power laws are integrated analytically, other models with a trapezoidal
+    rule in log energy evaluated for every parameter set at once.
+
+    Args:
+        model (Callable): One of the models of this module.
+        e_min (float): Lower bound in keV.
+        e_max (float): Upper bound in keV.
+        *params (float | np.ndarray): Model parameters, after the energies.
+        energy_flux (bool): Integrate E N(E) (keV flux) instead of N(E) (photon flux).
+        nb_points (int): Number of energies of the quadrature.
+        **kwargs (float): Other keyword arguments of the model (e.g. ``pivot``).
+
+    Returns:
+        np.ndarray: Integrated flux, shape of the broadcast parameters.
+
+    """
+    if model is power_law:
+        return power_law_integral(e_min, e_max, *params, energy_flux=energy_flux, **kwargs)
+    energy = energy_grid(e_min, e_max, nb_points)
+    # N(E) dE = E N(E) dln(E)
+    integrand = model(energy, *params, **kwargs) * energy ** (1 + energy_flux)
+    return 0.5 * np.sum((integrand[..., 1:] + integrand[..., :-1]) * np.diff(np.log(energy)), axis=-1)
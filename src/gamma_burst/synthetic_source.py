@@ -0,0 +1,350 @@
+"""Synthetic stand-in for the UKSSDC.
+
+:class:`SyntheticDataSource` serves realistic products generated locally,
+with the shapes of the ``swifttools.ukssdc.data.GRB`` ones and configurable
+latency and failures, to test the throughput of the fetch, cache and API
+layers offline. It is selected with ``GAMMA_BURST_DATA_SOURCE=synthetic``
+(see :func:`data_source.get_data_source`).
+
+The products are built with the analysis modules (rebinning, spectral
+models), which :mod:`gamma_burst.data_source` itself does not depend on.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from gamma_burst.containers import LightCurve
+from gamma_burst.eumerations import RebinMethod
+from gamma_burst.fitting import BAND_ENERGIES
+from gamma_burst.rebinning import rebin
+from gamma_burst.spectral_models import band_ratio
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LATENCY_ENV = 'GAMMA_BURST_SYNTHETIC_LATENCY'
+FAILURE_RATE_ENV = 'GAMMA_BURST_SYNTHETIC_FAILURE_RATE'
+SEED_ENV = 'GAMMA_BURST_SYNTHETIC_SEED'
+
+TIME_BINNINGS = {'TimeBins_4ms': 0.004, 'TimeBins_64ms': 0.064, 'TimeBins_1s': 1.0, 'TimeBins_10s': 10.0}
+SNR_LEVELS = (4, 5, 6, 7)
+
+
+def _bat_band(rng: np.random.Generator, time: np.ndarray, width: np.ndarray, pulse: dict) -> pd.DataFrame:
+    """BATBand table of a FRED pulse over Gaussian background noise."""
+    import pandas as pd  # noqa: PLC0415
+    since_start = np.maximum(time - pulse['start'], 1e-9)
+    flux = pulse['amplitude'] * np.exp(2 * np.sqrt(pulse['rise'] / pulse['decay']))
+    shape = np.exp(-pulse['rise'] / since_start - since_start / pulse['decay'])
+    flux = np.where(time > pulse['start'], flux * shape, 0.0)
+    error = pulse['noise'] * np.sqrt(0.064 / width)
+    gamma = pulse['gamma'] + 0.3 * np.log1p(since_start / pulse['decay']) + rng.normal(0, 0.05, len(time))
+    gamma = np.clip(gamma, 0.5, 3.5)
+    return pd.DataFrame({
+        'Time': time,
+        'TimePos': width / 2,
+        'TimeNeg': -width / 2,
+        'Flux': flux + rng.normal(0, 1, len(time)) * error,
+        'FluxPos': error,
+        'FluxNeg': -error,
+        'BadBin': np.zeros(len(time), dtype=bool),
+        'Gamma': gamma,
+        'GammaPos': np.full(len(time), 0.2),
+        'GammaNeg': np.full(len(time), -0.2),
+        'ECF': 2.5e-7 * (gamma / 1.5) ** 0.5,
+    })
+
+
+def _bat_datasets(bat_band: pd.DataFrame) -> dict:
+    """Datasets of a Burst Analyser binning: the BAT band and its extrapolation to the XRT band."""
+    ratio = band_ratio(bat_band['Gamma'].to_numpy(), BAND_ENERGIES['BATBand'], BAND_ENERGIES['XRTBand'])
+    xrt_band = bat_band.copy()
+    for column in ('Flux', 'FluxPos', 'FluxNeg', 'ECF'):
+        xrt_band[column] = bat_band[column] * ratio
+    return {'Datasets': ['BATBand', 'XRTBand'], 'BATBand': bat_band, 'XRTBand': xrt_band}
+
+
+def _xrt_band(table: pd.DataFrame, hardness: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Soft and hard band tables splitting a rate table with its hardness ratio."""
+    hard_fraction = hardness['HR'] / (1 + hardness['HR'])
+    bands = {}
+    for band, fraction in (('Soft', 1 - hard_fraction), ('Hard', hard_fraction)):
+        band_table = table.copy()
+        band_table['Rate'] = table['Rate'] * fraction
+        band_table['RatePos'] = table['RatePos'] * np.sqrt(fraction)
+        band_table['RateNeg'] = table['RateNeg'] * np.sqrt(fraction)
+        bands[band] = band_table
+    return bands
+
+
+def _xrt_tables(
+        rng: np.random.Generator,
+        start: float,
+        stop: float,
+        nb_bins: int,
+        amplitude: float,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Rate and hardness ratio tables of a power law decay, with logarithmic bins."""
+    import pandas as pd  # noqa: PLC0415
+    edges = np.geomspace(start, stop, nb_bins + 1)
+    time = np.sqrt(edges[:-1] * edges[1:])
+    rate = amplitude * (time / start) ** -1.2
+    error = np.sqrt(rate / np.diff(edges)) + 1e-3
+    measured = np.abs(rate + rng.normal(0, 1, nb_bins) * error)
+    hr = np.clip(1.0 + 0.1 * np.log10(time / start) + rng.normal(0, 0.05, nb_bins), 0.1, None)
+    timing = {'Time': time, 'TimePos': edges[1:] - time, 'TimeNeg': edges[:-1] - time}
+    rates = pd.DataFrame({
+        **timing,
+        'Rate': measured,
+        'RatePos': error,
+        'RateNeg': -error,
+        'FracExp': np.ones(nb_bins),
+        'BGrate': np.full(nb_bins, 1e-3),
+        'BGerr': np.full(nb_bins, 1e-4),
+        'CorrFact': np.full(nb_bins, 1.1),
+        'Exposure': np.diff(edges),
+    })
+    hardness = pd.DataFrame({**timing, 'HR': hr, 'HRPos': np.full(nb_bins, 0.1), 'HRNeg': np.full(nb_bins, -0.1)})
+    return rates, hardness
+
+
+class SyntheticDataSource:
+    """Local stand-in for the UKSSDC, serving synthetic products with the UKSSDC shapes.
+
+    Products are drawn from a generator seeded by the GRB name, so a GRB
+    always gets the same products. Every call can be delayed and can fail
+    with a ``ConnectionError``; rebin jobs go through the ``Queued``,
+    ``Running`` and ``Complete`` (or ``Failed``) statuses.
+    """
+
+    def __init__(
+            self,
+            *,
+            latency: float | tuple[float, float] = 0.0,
+            failure_rate: float = 0.0,
+            rebin_queue_time: float = 0.0,
+            rebin_run_time: float = 0.0,
+            rebin_failure_rate: float = 0.0,
+            duration: float = 200.0,
+            seed: int = 0,
+        ) -> None:
+        """Create a synthetic data source.
+
+        Args:
+            latency (float | tuple[float, float]): Delay of every call in seconds,
+                uniformly drawn in a (min, max) range if a tuple.
+            failure_rate (float): Probability that a call raises a ``ConnectionError``.
+            rebin_queue_time (float): Time a rebin job stays queued in seconds.
+            rebin_run_time (float): Time a rebin job runs in seconds.
+            rebin_failure_rate (float): Probability that a rebin job ends as ``Failed``.
+            duration (float): Duration of the Burst Analyser light curves in seconds.
+            seed (int): Seed of the products and of the injected latencies and failures.
+
+        """
+        if not 0 <= failure_rate <= 1 or not 0 <= rebin_failure_rate <= 1:
+            raise ValueError('Failure rates should be between 0 and 1')
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rebin_queue_time = rebin_queue_time
+        self.rebin_run_time = rebin_run_time
+        self.rebin_failure_rate = rebin_failure_rate
+        self.duration = duration
+        self.seed = seed
+        self.calls: Counter[str] = Counter()
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._jobs: dict[int, dict] = {}
+
+    @classmethod
+    def from_env(cls) -> SyntheticDataSource:
+        """Source configured by the environment.
+
+        ``GAMMA_BURST_SYNTHETIC_LATENCY`` is ``'0.2'`` or ``'0.1,0.5'``, next to
+        ``GAMMA_BURST_SYNTHETIC_FAILURE_RATE`` and ``GAMMA_BURST_SYNTHETIC_SEED``.
+        """
+        latency = [float(value) for value in os.environ.get(LATENCY_ENV, '0').split(',')]
+        return cls(
+            latency=latency[0] if len(latency) == 1 else (latency[0], latency[1]),
+            failure_rate=float(os.environ.get(FAILURE_RATE_ENV, '0')),
+            seed=int(os.environ.get(SEED_ENV, '0')),
+        )
+
+    @property
+    def source_id(self) -> str:
+        """Identity of the source, which keeps its products apart from the UKSSDC ones in the cache."""
+        return f'synthetic/seed={self.seed}/duration={self.duration:g}'
+
+    def __getstate__(self) -> dict:
+        """State sent to worker processes, without the jobs and the call counters."""
+        # Sent to worker processes (e.g. ``render_many``): jobs and counters stay in this process.
+        state = self.__dict__.copy()
+        for name in ('_lock', '_job_ids', '_jobs', 'calls'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state, with no job and no call counted."""
+        self.__dict__.update(state)
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._jobs = {}
+
+    def _call(self, name: str) -> None:
+        """Count a call, then inject its latency and failure."""
+        with self._lock:
+            self.calls[name] += 1
+            if isinstance(self.latency, tuple):
+                delay = self._random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            failed = self._random.random() < self.failure_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise ConnectionError(f'Synthetic failure of {name}')
+
+    def _rng(self, grb_name: str, product: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(f'{grb_name}/{product}'.encode())])
+
+    def _pulse(self, grb_name: str) -> dict:
+        rng = self._rng(grb_name, 'pulse')
+        return {
+            'start': rng.uniform(-2, 2),
+            'rise': 10 ** rng.uniform(-1, 0.5),
+            'decay': 10 ** rng.uniform(0, 1.5),
+            'amplitude': 10 ** rng.uniform(-7.5, -6),
+            'noise': 10 ** rng.uniform(-8.5, -7.5),
+            'gamma': rng.uniform(1.0, 2.0),
+        }
+
+    def _bat_binnings(self, grb_name: str, instrument: str) -> dict:
+        rng = self._rng(grb_name, instrument)
+        pulse = self._pulse(grb_name)
+        binnings = {}
+        for binning, bin_size in TIME_BINNINGS.items():
+            time = np.arange(-self.duration / 4, self.duration, bin_size) + bin_size / 2
+            binnings[binning] = _bat_band(rng, time, np.full(len(time), bin_size), pulse)
+        finest = LightCurve.from_bat_band(binnings['TimeBins_64ms'])
+        for snr in SNR_LEVELS:
+            rebinned = rebin(finest, RebinMethod.Min_SNR, min_snr=snr)
+            binnings[f'SNR{snr}'] = _bat_band(rng, rebinned.time, rebinned.width, pulse)
+        return binnings
+
+    def getBurstAnalyser(self, **kwargs: object) -> dict:
+        """Burst Analyser product shaped like ``udg.getBurstAnalyser`` with ``returnData=True``."""
+        import pandas as pd  # noqa: PLC0415
+        self._call('getBurstAnalyser')
+        grb_name = kwargs['GRBName']
+        data: dict[str, Any] = {'Instruments': ['BAT', 'BAT_NoEvolution']}
+        for instrument in data['Instruments']:
+            binnings = self._bat_binnings(grb_name, instrument)
+            data[instrument] = {
+                'Binning': list(binnings),
+                **{binning: _bat_datasets(table) for binning, table in binnings.items()},
+            }
+        hr = data['BAT']['TimeBins_1s']['BATBand']
+        data['BAT']['HRData'] = pd.DataFrame({
+            'Time': hr['Time'],
+            'TimePos': hr['TimePos'],
+            'TimeNeg': hr['TimeNeg'],
+            'HR': 2 ** (2 - hr['Gamma']),
+            'HRErr': np.full(len(hr), 0.05),
+            'Gamma': hr['Gamma'],
+        })
+        data['BAT_NoEvolution']['ECFs'] = {'ObservedFlux': 2.5e-7, 'UnabsorbedFlux': 2.7e-7}
+        return data
+
+    def _light_curves(self, grb_name: str, bin_factor: float = 1.0) -> dict:
+        rng = self._rng(grb_name, 'light_curves')
+        amplitude = 10 ** rng.uniform(1, 3)
+        wt, wt_hr = _xrt_tables(rng, 60.0, 600.0, int(200 / bin_factor), amplitude)
+        pc, pc_hr = _xrt_tables(rng, 600.0, 1e6, int(150 / bin_factor), amplitude * 10**-1.2)
+        tables = {'WT': wt, 'WTHR': wt_hr, 'PC': pc, 'PCHR': pc_hr}
+        for mode, table, hardness in (('WT', wt, wt_hr), ('PC', pc, pc_hr)):
+            tables.update({mode + band: band_table for band, band_table in _xrt_band(table, hardness).items()})
+        data: dict[str, Any] = {'Datasets': [], 'TimeFormat': 'TDB', 'T0': 0.0}
+        for name, table in tables.items():
+            for dataset in (name, f'{name}_incbad'):
+                data['Datasets'].append(dataset)
+                data[dataset] = table.copy()
+        return data
+
+    def getLightCurves(self, **kwargs: object) -> dict:
+        """XRT light curves shaped like ``udg.getLightCurves`` with ``returnData=True``."""
+        self._call('getLightCurves')
+        return self._light_curves(kwargs['GRBName'])
+
+    def getSpectra(self, **kwargs: object) -> dict:
+        """XRT spectra fits shaped like ``udg.getSpectra`` with ``returnData=True``."""
+        self._call('getSpectra')
+        rng = self._rng(kwargs['GRBName'], 'spectra')
+        interval: dict[str, Any] = {'Start': 60.0, 'Stop': 1e6, 'Modes': ['WT', 'PC']}
+        for mode in interval['Modes']:
+            gamma, flux = rng.uniform(1.5, 2.5), 10 ** rng.uniform(-11, -9)
+            interval[mode] = {
+                'Models': ['PowerLaw'],
+                'PowerLaw': {
+                    'NH': 10 ** rng.uniform(20, 22),
+                    'Gamma': gamma, 'GammaPos': 0.1, 'GammaNeg': -0.1,
+                    'ObsFlux': flux, 'ObsFluxPos': 0.1 * flux, 'ObsFluxNeg': -0.1 * flux,
+                    'Cstat': 500.0, 'Dof': 480,
+                },
+            }
+        return {'rnames': ['interval0'], 'T0': 0.0, 'interval0': interval}
+
+    def rebinLightCurve(self, **kwargs: object) -> int:
+        """Submit a rebin job, returning its id."""
+        self._call('rebinLightCurve')
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._jobs[job_id] = {
+                'grb_name': kwargs['GRBName'],
+                'bin_factor': max(float(kwargs.get('pcMaxGap', 1.0)), 1.0) ** 0.25,
+                'submitted': time.monotonic(),
+                'fails': self._random.random() < self.rebin_failure_rate,
+                'cancelled': False,
+            }
+        return job_id
+
+    def _status(self, job: dict) -> str:
+        elapsed = time.monotonic() - job['submitted']
+        if job['cancelled']:
+            return 'Cancelled'
+        if elapsed < self.rebin_queue_time:
+            return 'Queued'
+        if elapsed < self.rebin_queue_time + self.rebin_run_time:
+            return 'Running'
+        return 'Failed' if job['fails'] else 'Complete'
+
+    def checkRebinStatus(self, JobID: int, **kwargs: object) -> dict:
+        """Status of a rebin job, as ``{'statusCode': ..., 'statusText': ...}``."""
+        self._call('checkRebinStatus')
+        status = self._status(self._jobs[JobID])
+        codes = {'Queued': 1, 'Running': 2, 'Complete': 4, 'Failed': -1, 'Cancelled': -2}
+        return {'statusCode': codes[status], 'statusText': status}
+
+    def getRebinnedLightCurve(self, JobID: int, **kwargs: object) -> dict | None:
+        """Light curves of a complete rebin job, None otherwise."""
+        self._call('getRebinnedLightCurve')
+        job = self._jobs[JobID]
+        if self._status(job) != 'Complete':
+            return None
+        return self._light_curves(job['grb_name'], job['bin_factor'])
+
+    def cancelRebin(self, JobID: int, **kwargs: object) -> bool:
+        """Cancel a rebin job."""
+        self._call('cancelRebin')
+        self._jobs[JobID]['cancelled'] = True
+        return True
@@ -0,0 +1,137 @@
+"""Time index answering window queries on light curve tables.
+
+The table is sorted by time once (most UKSSDC tables already are), then
+every window is located with a binary search and returned as a slice of
+the sorted table, without building a mask over the whole light curve.
+Aggregates over many windows use prefix sums, so a sliding-window scan
+costs O(1) per window whatever the window width.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class TimeIndex:
+    """Sorted light curve table with window queries."""
+
+    def __init__(self, table: pd.DataFrame, time_column: str = 'Time') -> None:
+        """Index a table by time.
+
+        Args:
+            table (pd.DataFrame): Light curve table.
+            time_column (str): Column holding the times.
+
+        """
+        time = table[time_column].to_numpy(dtype=float)
+        if len(time) > 1 and np.any(time[1:] < time[:-1]):
+            table = table.iloc[np.argsort(time, kind='stable')]
+            time = table[time_column].to_numpy(dtype=float)
+        self.table = table
+        self.time = time
+        self.time_column = time_column
+        self._columns: dict[str, np.ndarray] = {time_column: time}
+        self._prefix_sums: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.time)
+
+    def column(self, name: str, time_scale: tuple[float, float] | None = None) -> np.ndarray:
+        """Values of a column in a time window, as a view of the sorted column.
+
+        Args:
+            name (str): Column name.
+            time_scale (tuple[float, float] | None): Time window (start, stop), bounds included.
+
+        """
+        if name not in self._columns:
+            self._columns[name] = self.table[name].to_numpy()
+        start, stop = self.bounds(time_scale)
+        return self._columns[name][start:stop]
+
+    def bounds(self, time_scale: tuple[float, float] | None = None) -> tuple[int, int]:
+        """Positions (start, stop) of the rows of a time window, bounds included."""
+        if time_scale is None:
+            return 0, len(self.time)
+        start = int(np.searchsorted(self.time, time_scale[0], side='left'))
+        stop = int(np.searchsorted(self.time, time_scale[1], side='right'))
+        return start, max(start, stop)
+
+    def window(self, time_scale: tuple[float, float] | None = None) -> pd.DataFrame:
+        """Rows of a time window, as a slice of the sorted table."""
+        start, stop = self.bounds(time_scale)
+        return self.table.iloc[start:stop]
+
+    def windows_bounds(
+            self,
+            starts: Sequence[float] | np.ndarray,
+            stops: Sequence[float] | np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """Positions of the rows of many time windows at once.
+
+        Args:
+            starts (Sequence[float] | np.ndarray): Start of every window.
+            stops (Sequence[float] | np.ndarray): Stop of every window, included.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: First and past-the-end row of every window.
+
+        """
+        first = np.searchsorted(self.time, np.asarray(starts, dtype=float), side='left')
+        last = np.searchsorted(self.time, np.asarray(stops, dtype=float), side='right')
+        return first, np.maximum(first, last)
+
+    def sliding_windows(
+            self,
+            width: float,
+            step: float,
+            time_scale: tuple[float, float] | None = None
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Regularly spaced windows covering a time range.
+
+        Args:
+            width (float): Duration of every window.
+            step (float): Delay between the starts of two windows.
+            time_scale (tuple[float, float] | None): Range to cover, the whole light curve if None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Start time, first and past-the-end row of every window.
+
+        """
+        if width <= 0 or step <= 0:
+            raise ValueError('Width and step should be strictly positive')
+        if len(self.time) == 0:
+            return np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=int)
+        low, high = time_scale if time_scale is not None else (self.time[0], self.time[-1])
+        nb_windows = int(np.floor(max(0.0, high - width - low) / step + 1e-9)) + 1
+        starts = low + step * np.arange(nb_windows)
+        first, last = self.windows_bounds(starts, starts + width)
+        return starts, first, last
+
+    def window_sums(self, name: str, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """Sum of a column over many windows, from a prefix sum computed once.
+
+        Args:
+            name (str): Column name.
+            first (np.ndarray): First row of every window.
+            last (np.ndarray): Past-the-end row of every window.
+
+        """
+        if name not in self._prefix_sums:
+            values = self.column(name).astype(float)
+            self._prefix_sums[name] = np.concatenate(([0.0], np.cumsum(values)))
+        prefix = self._prefix_sums[name]
+        return prefix[last] - prefix[first]
+
+    def window_means(self, name: str, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """Mean of a column over many windows, NaN for empty windows."""
+        counts = last - first
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, self.window_sums(name, first, last) / counts, np.nan)
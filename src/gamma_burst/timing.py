@@ -0,0 +1,378 @@
+"""Power spectra of light curves.
+
+Uniformly sampled light curves go through a real FFT, optionally averaged
+over (overlapping, windowed) segments following Bartlett or Welch. Gapped
+light curves go through the classical Lomb-Scargle periodogram, scaled so
+that both methods share the same normalisations. On a regular frequency
+grid, long light curves use the fast method of Press & Rybicki (1989): the
+rates are extirpolated onto a regular time grid whose FFT gives the sums over
+the bins at every frequency in O(N log N). Small batches are evaluated
+exactly with NumPy matrix products.
+
+Every function takes a single light curve of shape (nb_bins,) or a batch of
+light curves sharing the same times, of shape (nb_curves, nb_bins).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from gamma_burst.eumerations import PSDNormalisation
+from gamma_burst.rendering import get_axes, show_figures
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+WINDOWS = {'hann': np.hanning, 'hamming': np.hamming, 'blackman': np.blackman}
+MIN_SEGMENT_SIZE = 2
+MIN_NB_BINS = 4
+LOMB_SCARGLE_CHUNK_SIZE = 1 << 22  # elements of the (frequency, time) matrices evaluated at once
+FAST_LOMB_SCARGLE_MIN_SIZE = 1 << 20  # bins times frequencies from which the fast periodogram is used
+EXTIRPOLATION_ORDER = 6  # grid points each rate is spread over
+EXTIRPOLATION_OVERSAMPLING = 16  # grid points per frequency
+
+
+@dataclass
+class PowerSpectrum:
+    """Power spectrum of one or several light curves.
+
+    ``power`` and ``power_err`` have shape (..., nb_frequencies), the leading
+    axes being the ones of the input light curves.
+    """
+
+    frequency: np.ndarray
+    power: np.ndarray
+    power_err: np.ndarray
+    nb_segments: int
+    method: str
+    normalisation: PSDNormalisation
+
+
+def check_uniform_sampling(time: np.ndarray, tolerance: float = 1e-6) -> bool:
+    """Whether the time bins are evenly spaced.
+
+    Args:
+        time (np.ndarray): Sorted bin times.
+        tolerance (float): Maximum deviation of a time step from the first one.
+
+    Returns:
+        bool: True if the sampling is uniform.
+
+    """
+    delta_ts = np.diff(time)
+    return bool(np.all(np.abs(delta_ts - delta_ts[0]) < tolerance))
+
+
+def _normalise(
+        fourier_power: np.ndarray,
+        nb_points: int,
+        dt: float,
+        mean_rate: np.ndarray,
+        normalisation: PSDNormalisation
+    ) -> np.ndarray:
+    """Normalise squared Fourier amplitudes of rates.
+
+    Args:
+        fourier_power (np.ndarray): Squared modulus of the Fourier transform of the rates.
+        nb_points (int): Number of bins transformed.
+        dt (float): Bin duration in seconds.
+        mean_rate (np.ndarray): Mean rate of each transformed light curve, broadcastable to the power.
+        normalisation (PSDNormalisation): Normalisation to apply.
+
+    """
+    absolute = 2 * dt * fourier_power / nb_points
+    match PSDNormalisation(normalisation):
+        case PSDNormalisation.Absolute:
+            return absolute
+        case PSDNormalisation.Leahy:
+            return absolute / mean_rate
+        case PSDNormalisation.Rms:
+            return absolute / mean_rate**2
+
+
+def rfft_power_spectrum(
+        rate: np.ndarray,
+        dt: float,
+        *,
+        segment_size: int | None = None,
+        overlap: float = 0.0,
+        window: str | None = None,
+        normalisation: PSDNormalisation = PSDNormalisation.Leahy,
+    ) -> PowerSpectrum:
+    """Power spectrum of uniformly sampled light curves.
+
+    Without ``segment_size`` the whole light curve is transformed at once.
+    Otherwise the power is averaged over segments, contiguous (Bartlett) or
+    overlapping and windowed (Welch, e.g. ``overlap=0.5, window='hann'``).
+
+    Args:
+        rate (np.ndarray): Rates in counts/s, shape (..., nb_bins).
+        dt (float): Bin duration in seconds.
+        segment_size (int | None): Number of bins of each averaged segment.
+        overlap (float): Fraction of a segment shared with the next one, in [0, 1).
+        window (str | None): Window applied to each segment, among :data:`WINDOWS`.
+        normalisation (PSDNormalisation): Normalisation of the power.
+
+    Returns:
+        PowerSpectrum: Power at the non zero Fourier frequencies.
+
+    """
+    rate = np.asarray(rate, dtype=float)
+    nb_bins = rate.shape[-1]
+    segment_size = segment_size or nb_bins
+    if not MIN_SEGMENT_SIZE <= segment_size <= nb_bins:
+        raise ValueError(f'Segment size should be between {MIN_SEGMENT_SIZE} and {nb_bins} bins')
+    if not 0 <= overlap < 1:
+        raise ValueError('Overlap should be in [0, 1)')
+    if window is not None and window not in WINDOWS:
+        raise ValueError(f'Unknown window {window}, should be in {list(WINDOWS)}')
+
+    step = max(1, round(segment_size * (1 - overlap)))
+    segments = sliding_window_view(rate, segment_size, axis=-1)[..., ::step, :]
+    mean_rate = segments.mean(axis=-1, keepdims=True)
+    centered = segments - mean_rate
+    weight = 1.0
+    if window is not None:
+        taper = WINDOWS[window](segment_size)
+        centered = centered * taper
+        weight = np.mean(taper**2)
+
+    fourier_power = np.abs(np.fft.rfft(centered, axis=-1)[..., 1:]) ** 2 / weight
+    power = _normalise(fourier_power, segment_size, dt, mean_rate, normalisation)
+    nb_segments = segments.shape[-2]
+    mean_power = power.mean(axis=-2)
+    return PowerSpectrum(
+        frequency=np.fft.rfftfreq(segment_size, d=dt)[1:],
+        power=mean_power,
+        power_err=mean_power / np.sqrt(nb_segments),
+        nb_segments=nb_segments,
+        method='rfft',
+        normalisation=PSDNormalisation(normalisation),
+    )
+
+
+def _lomb_scargle(time: np.ndarray, centered: np.ndarray, frequency: np.ndarray) -> np.ndarray:
+    """Lomb-Scargle periodogram of centered rates of shape (nb_curves, nb_bins), with unit uncertainties."""
+    time = time - time[0]
+    periodogram = np.empty((len(centered), len(frequency)))
+    step = max(1, LOMB_SCARGLE_CHUNK_SIZE // len(time))
+    for start in range(0, len(frequency), step):
+        omega = 2 * np.pi * frequency[start:start + step, None]
+        double_phase = 2 * omega * time
+        tau = np.arctan2(np.sin(double_phase).sum(axis=-1), np.cos(double_phase).sum(axis=-1)) / (2 * omega[:, 0])
+        phase = omega * (time - tau[:, None])
+        cos, sin = np.cos(phase), np.sin(phase)
+        cos_power = (centered @ cos.T) ** 2 / np.sum(cos**2, axis=-1)
+        # the sines vanish at the Nyquist frequency of uniformly sampled light curves
+        sin_norm = np.sum(sin**2, axis=-1)
+        sin_power = np.divide(
+            (centered @ sin.T) ** 2, sin_norm, out=np.zeros_like(cos_power), where=sin_norm > 1e-9 * len(time),
+        )
+        periodogram[:, start:start + step] = (cos_power + sin_power) / 2
+    return periodogram
+
+
+def _extirpolation_weights(position: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Nodes and Lagrange weights spreading values at positions of a periodic grid of ``size`` points."""
+    order = EXTIRPOLATION_ORDER
+    first = np.floor(position).astype(np.intp) - (order - 1) // 2
+    offsets = np.arange(order)
+    distance = position[:, None] - (first[:, None] + offsets)
+    weights = np.empty_like(distance)
+    for node in offsets:
+        others = offsets != node
+        weights[:, node] = np.prod(distance[:, others], axis=1) / np.prod(node - offsets[others])
+    return (first[:, None] + offsets) % size, weights
+
+
+def _trig_sums(
+        time: np.ndarray,
+        values: np.ndarray,
+        first_frequency: float,
+        step: float,
+        nb_frequencies: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the sums of values times the sines and cosines of regular frequencies, by extirpolation and FFT.
+
+    Args:
+        time (np.ndarray): Bin times starting at 0, shape (nb_bins,).
+        values (np.ndarray): Values of every bin, shape (nb_curves, nb_bins).
+        first_frequency (float): First frequency in Hz.
+        step (float): Frequency step in Hz.
+        nb_frequencies (int): Number of frequencies.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sine and cosine sums, shape (nb_curves, nb_frequencies).
+
+    """
+    size = 1 << int(np.ceil(np.log2(nb_frequencies * EXTIRPOLATION_OVERSAMPLING)))
+    shifted = values * np.exp(2j * np.pi * first_frequency * time)
+    nodes, weights = _extirpolation_weights((time * step * size) % size, size)
+    nb_curves = len(values)
+    flat_nodes = (np.arange(nb_curves)[:, None, None] * size + nodes).ravel()
+    spread = (shifted[:, :, None] * weights).ravel()
+    grid = np.bincount(flat_nodes, spread.real, nb_curves * size) + 1j * np.bincount(
+        flat_nodes, spread.imag, nb_curves * size
+    )
+    sums = size * np.fft.ifft(grid.reshape(nb_curves, size), axis=-1)[:, :nb_frequencies]
+    return sums.imag, sums.real
+
+
+def _fast_lomb_scargle(
+        time: np.ndarray,
+        centered: np.ndarray,
+        first_frequency: float,
+        step: float,
+        nb_frequencies: int,
+    ) -> np.ndarray:
+    """Lomb-Scargle periodogram of :func:`_lomb_scargle` at regularly spaced frequencies, in O(N log N)."""
+    time = time - time[0]
+    sin_rate, cos_rate = _trig_sums(time, centered, first_frequency, step, nb_frequencies)
+    sin_double, cos_double = _trig_sums(time, np.ones((1, len(time))), 2 * first_frequency, 2 * step, nb_frequencies)
+    double_phase = np.arctan2(sin_double, cos_double)
+    cos_tau, sin_tau = np.cos(double_phase / 2), np.sin(double_phase / 2)
+    cos_power = (cos_rate * cos_tau + sin_rate * sin_tau) ** 2
+    sin_power = (sin_rate * cos_tau - cos_rate * sin_tau) ** 2
+    # sums of the squared cosines and sines of the shifted phases
+    resultant = np.hypot(sin_double, cos_double)
+    cos_norm, sin_norm = (len(time) + resultant) / 2, (len(time) - resultant) / 2
+    sin_power = np.divide(sin_power, sin_norm, out=np.zeros_like(sin_power), where=sin_norm > 1e-6 * len(time))
+    return (cos_power / cos_norm + sin_power) / 2
+
+
+def _regular_step(frequency: np.ndarray) -> float | None:
+    """Step of regularly spaced increasing frequencies, None otherwise."""
+    if len(frequency) < MIN_SEGMENT_SIZE:
+        return None
+    steps = np.diff(frequency)
+    return float(steps[0]) if steps[0] > 0 and np.allclose(steps, steps[0], rtol=1e-9, atol=0) else None
+
+
+def lomb_scargle_power_spectrum(
+        time: np.ndarray,
+        rate: np.ndarray,
+        frequency: np.ndarray | None = None,
+        normalisation: PSDNormalisation = PSDNormalisation.Leahy,
+    ) -> PowerSpectrum:
+    """Power spectrum of gapped light curves with the Lomb-Scargle periodogram.
+
+    Every light curve of the batch is projected at once on the sines and
+    cosines of the shared times, by chunks of frequencies, or with the fast
+    method from :data:`FAST_LOMB_SCARGLE_MIN_SIZE` bins times frequencies
+    when the frequencies are regularly spaced. The fast periodogram matches
+    the exact one to about 1e-4 of its median power. The periodogram is scaled
+    to the squared Fourier amplitude it matches for uniform data, so that the
+    normalisations are those of :func:`rfft_power_spectrum` with the median
+    time step as bin duration.
+
+    Args:
+        time (np.ndarray): Sorted bin times in seconds, shape (nb_bins,).
+        rate (np.ndarray): Rates in counts/s, shape (..., nb_bins).
+        frequency (np.ndarray | None): Frequencies in Hz, from ``1 / duration`` to the
+            Nyquist frequency of the median time step if None.
+        normalisation (PSDNormalisation): Normalisation of the power.
+
+    Returns:
+        PowerSpectrum: Power at the requested frequencies.
+
+    """
+    time = np.asarray(time, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    nb_bins = len(time)
+    dt = float(np.median(np.diff(time)))
+    if frequency is None:
+        duration = time[-1] - time[0] + dt
+        frequency = np.arange(1, nb_bins // 2 + 1) / duration
+    frequency = np.asarray(frequency, dtype=float)
+
+    mean_rate = rate.mean(axis=-1, keepdims=True)
+    centered = (rate - mean_rate).reshape(-1, nb_bins)
+    step = _regular_step(frequency)
+    if step is not None and nb_bins * len(frequency) >= FAST_LOMB_SCARGLE_MIN_SIZE:
+        periodogram = _fast_lomb_scargle(time, centered, frequency[0], step, len(frequency))
+    else:
+        periodogram = _lomb_scargle(time, centered, frequency)
+    periodogram = periodogram.reshape(rate.shape[:-1] + frequency.shape)
+    power = _normalise(nb_bins * periodogram, nb_bins, dt, mean_rate, normalisation)
+    return PowerSpectrum(
+        frequency=frequency,
+        power=power,
+        power_err=power.copy(),
+        nb_segments=1,
+        method='lomb_scargle',
+        normalisation=PSDNormalisation(normalisation),
+    )
+
+
+def power_spectrum(
+        time: np.ndarray,
+        rate: np.ndarray,
+        *,
+        segment_size: int | None = None,
+        overlap: float = 0.0,
+        window: str | None = None,
+        normalisation: PSDNormalisation = PSDNormalisation.Leahy,
+        frequency: np.ndarray | None = None,
+        tolerance: float = 1e-6,
+    ) -> PowerSpectrum:
+    """Power spectrum of light curves, with the method matching their sampling.
+
+    Uniformly sampled light curves use :func:`rfft_power_spectrum`, gapped
+    ones :func:`lomb_scargle_power_spectrum`.
+
+    Args:
+        time (np.ndarray): Sorted bin times in seconds, shared by the light curves, shape (nb_bins,).
+        rate (np.ndarray): Rates in counts/s, shape (..., nb_bins).
+        segment_size (int | None): Number of bins of each averaged segment, uniform sampling only.
+        overlap (float): Fraction of a segment shared with the next one.
+        window (str | None): Window applied to each segment, among :data:`WINDOWS`.
+        normalisation (PSDNormalisation): Normalisation of the power.
+        frequency (np.ndarray | None): Frequencies of the Lomb-Scargle periodogram, gapped sampling only.
+        tolerance (float): Tolerance of the uniform sampling check, in seconds.
+
+    Returns:
+        PowerSpectrum: Power spectrum of every light curve.
+
+    """
+    time = np.asarray(time, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    if time.ndim != 1 or rate.shape[-1] != len(time):
+        raise ValueError('Light curves should share the same 1-D times')
+    if len(time) < MIN_NB_BINS:
+        raise ValueError('At least four bins are needed to compute a power spectrum')
+    if check_uniform_sampling(time, tolerance):
+        return rfft_power_spectrum(
+            rate,
+            time[1] - time[0],
+            segment_size=segment_size,
+            overlap=overlap,
+            window=window,
+            normalisation=normalisation,
+        )
+    if segment_size is not None:
+        raise ValueError('Segment averaging needs a uniformly sampled light curve')
+    return lomb_scargle_power_spectrum(time, rate, frequency, normalisation)
+
+
+def plot_power_spectrum(spectrum: PowerSpectrum, label: str | None = None, ax: Axes | None = None) -> Axes:
+    """Plot a single power spectrum in log-log scale, with errors if segments were averaged."""
+    ax, show = get_axes(ax, figsize=(10, 6))
+    if spectrum.nb_segments > 1:
+        ax.errorbar(spectrum.frequency, spectrum.power, yerr=spectrum.power_err, fmt='o-', markersize=2, label=label)
+    else:
+        ax.plot(spectrum.frequency, spectrum.power, label=label)
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Frequency (Hz)')
+    ax.set_ylabel(f'Power ({spectrum.normalisation})')
+    ax.set_title(f'Power spectrum ({spectrum.method}, {spectrum.nb_segments} segment(s))')
+    if label is not None:
+        ax.legend()
+    ax.grid(True)
+    if show:
+        show_figures()
+    return ax
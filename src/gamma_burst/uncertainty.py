@@ -0,0 +1,160 @@
+"""Monte Carlo propagation of parameter errors to spectral models.
+
+Parameters are drawn from split normal distributions built from the
+asymmetric errors given by the UKSSDC, every sample is evaluated on the
+energy grid in one broadcast, and the samples are reduced to percentile
+bands. The energy axis is processed in chunks so that memory stays bounded
+whatever the number of samples and of bursts.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from gamma_burst.spectral_models import power_law
+
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class ErrorBand:
+    """Median and central confidence interval of a model over an energy grid.
+
+    ``median``, ``lower`` and ``upper`` have shape (..., nb_energies), the
+    leading axes being the ones of the parameters.
+    """
+
+    energy: np.ndarray
+    median: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    confidence: float
+    nb_samples: int
+
+
+def sample_split_normal(
+        value: float | np.ndarray,
+        error_pos: float | np.ndarray,
+        error_neg: float | np.ndarray,
+        nb_samples: int,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+    """Draw samples of a parameter with asymmetric errors.
+
+    The distribution is a split normal of mode ``value``, whose standard
+    deviation is ``error_pos`` above the mode and ``|error_neg|`` below it.
+
+    Args:
+        value (float | np.ndarray): Best fit values, shape (...).
+        error_pos (float | np.ndarray): Positive 1 sigma errors.
+        error_neg (float | np.ndarray): Negative 1 sigma errors, their sign is ignored.
+        nb_samples (int): Number of samples of every value.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        np.ndarray: Samples, shape (nb_samples, ...).
+
+    """
+    value, error_pos, error_neg = np.broadcast_arrays(
+        np.asarray(value, dtype=float),
+        np.abs(np.asarray(error_pos, dtype=float)),
+        np.abs(np.asarray(error_neg, dtype=float)),
+    )
+    total = error_pos + error_neg
+    prob_pos = np.divide(error_pos, total, out=np.full(value.shape, 0.5), where=total > 0)
+    size = (nb_samples, *value.shape)
+    magnitude = np.abs(rng.standard_normal(size))
+    is_pos = rng.random(size) < prob_pos
+    return value + np.where(is_pos, magnitude * error_pos, -magnitude * error_neg)
+
+
+def error_band(
+        model: Callable[..., np.ndarray],
+        energy: np.ndarray,
+        *param_samples: np.ndarray,
+        confidence: float = 0.6827,
+        max_chunk_elements: int = MAX_CHUNK_ELEMENTS,
+        **kwargs: float,
+    ) -> ErrorBand:
+    """Reduce the model evaluated on parameter samples to a percentile band.
+
+    Args:
+        model (Callable): Model of :mod:`gamma_burst.spectral_models`.
+        energy (np.ndarray): Energies in keV, shape (nb_energies,).
+        *param_samples (np.ndarray): Samples of every model parameter, shape (nb_samples, ...).
+        confidence (float): Probability of the central interval.
+        max_chunk_elements (int): Maximum number of model values held in memory at once.
+        **kwargs (float): Other keyword arguments of the model (e.g. ``pivot``).
+
+    Returns:
+        ErrorBand: Median and confidence interval of the model.
+
+    """
+    if not 0 < confidence < 1:
+        raise ValueError('Confidence should be in (0, 1)')
+    energy = np.asarray(energy, dtype=float)
+    param_samples = np.broadcast_arrays(*[np.asarray(samples, dtype=float) for samples in param_samples])
+    nb_samples = param_samples[0].shape[0]
+    percentiles = [50, 50 * (1 - confidence), 50 * (1 + confidence)]
+
+    values = np.empty((3, *param_samples[0].shape[1:], *energy.shape))
+    chunk_size = max(1, max_chunk_elements // param_samples[0].size)
+    for start in range(0, len(energy), chunk_size):
+        stop = min(start + chunk_size, len(energy))
+        evaluated = model(energy[start:stop], *param_samples, **kwargs)
+        values[..., start:stop] = np.percentile(evaluated, percentiles, axis=0)
+    return ErrorBand(energy, values[0], values[1], values[2], confidence, nb_samples)
+
+
+def power_law_error_band(  # noqa: PLR0917 - the measured values and their errors
+        energy: np.ndarray,
+        gamma: float | np.ndarray,
+        gamma_pos: float | np.ndarray,
+        gamma_neg: float | np.ndarray,
+        amplitude: float | np.ndarray,
+        amplitude_pos: float | np.ndarray,
+        amplitude_neg: float | np.ndarray,
+        *,
+        nb_samples: int = 1000,
+        confidence: float = 0.6827,
+        pivot: float = 50.0,
+        seed: int | None = None,
+        max_chunk_elements: int = MAX_CHUNK_ELEMENTS,
+    ) -> ErrorBand:
+    """Error band of power laws ``amplitude * (E / pivot) ** -gamma``.
+
+    Photon index and amplitude are drawn independently, their correlation
+    being unknown from the UKSSDC products. Parameters may be arrays (e.g.
+    one value per burst) to compute every band in one call.
+
+    Args:
+        energy (np.ndarray): Energies in keV, shape (nb_energies,).
+        gamma (float | np.ndarray): Photon index.
+        gamma_pos (float | np.ndarray): Positive error of the photon index.
+        gamma_neg (float | np.ndarray): Negative error of the photon index.
+        amplitude (float | np.ndarray): Amplitude at the pivot energy.
+        amplitude_pos (float | np.ndarray): Positive error of the amplitude.
+        amplitude_neg (float | np.ndarray): Negative error of the amplitude.
+        nb_samples (int): Number of Monte Carlo samples.
+        confidence (float): Probability of the central interval.
+        pivot (float): Pivot energy in keV.
+        seed (int | None): Seed of the random generator.
+        max_chunk_elements (int): Maximum number of model values held in memory at once.
+
+    Returns:
+        ErrorBand: Median and confidence interval of the power law.
+
+    """
+    rng = np.random.default_rng(seed)
+    gamma_samples = sample_split_normal(gamma, gamma_pos, gamma_neg, nb_samples, rng)
+    amplitude_samples = sample_split_normal(amplitude, amplitude_pos, amplitude_neg, nb_samples, rng)
+    return error_band(
+        power_law,
+        energy,
+        amplitude_samples,
+        -gamma_samples,
+        confidence=confidence,
+        max_chunk_elements=max_chunk_elements,
+        pivot=pivot,
+    )
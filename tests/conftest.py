@@ -0,0 +1,18 @@
+"""Shared fixtures for the tests."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from gamma_burst.cache_manager import CACHE_DIR_ENV, reset_cache_manager
+
+
+@pytest.fixture
+def home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Redirect the ``~/.gamma_burst`` cache to a temporary folder."""
+    monkeypatch.setattr(Path, 'home', lambda: tmp_path)
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    reset_cache_manager()
+    yield tmp_path
+    reset_cache_manager()
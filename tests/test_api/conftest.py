@@ -0,0 +1,7 @@
+"""Shared fixtures for the API tests."""
+
+import sys
+from pathlib import Path
+
+# The API is not a package: it is imported from its folder, like ``uvicorn --app-dir src/api/``.
+sys.path.insert(0, str(Path(__file__).parents[2] / 'src' / 'api'))
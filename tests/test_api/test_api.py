@@ -0,0 +1,105 @@
+"""Testing src/api/api.py endpoints."""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from api import create_app
+from gamma_burst import metrics
+from gamma_burst.metrics import MetricsRegistry
+from tests.test_gamma_burst.data import StubSource
+
+
+@pytest.fixture
+def client(home: Path) -> TestClient:
+    """Test client of an application serving the stub source."""
+    return TestClient(create_app(StubSource(), cache_size=4))
+
+
+def test_health(client: TestClient) -> None:
+    """Test the endpoint checked by the Docker health check."""
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'ok'
+
+
+def test_content_negotiation(client: TestClient) -> None:
+    """Test JSON, gzip and NumPy responses of the same columns."""
+    url = '/grbs/GRB 101225A/light_curves/WT'
+    params = {'time_start': 10.0, 'time_stop': 19.9}
+    columns = client.get(url, params=params).json()
+    assert columns['Time'] == [10.5 + i for i in range(10)]
+    assert set(columns) == {'Time', 'TimePos', 'TimeNeg', 'Rate', 'RatePos', 'RateNeg'}
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert len(response.json()['Rate']) == 100
+
+    response = client.get(url, params=params, headers={'Accept': 'application/x-npz'})
+    assert response.headers['content-type'] == 'application/x-npz'
+    arrays = np.load(io.BytesIO(response.content))
+    np.testing.assert_array_equal(arrays['Time'], columns['Time'])
+
+
+def test_derived_quantities(client: TestClient) -> None:
+    """Test the Burst Analyser, spectra, duration and power spectrum endpoints."""
+    binning = client.get('/grbs/GRB 101225A/burst_analyser/binnings/SNR4').json()
+    np.testing.assert_allclose(binning['CountRate'], np.asarray(binning['Flux']) / 2e-7)
+    spectrum = client.get('/grbs/GRB 101225A/spectra/WT', params={'nb_points': 16, 'nb_samples': 100, 'seed': 0}).json()
+    assert len(spectrum['Energy']) == len(spectrum['Lower']) == 16
+    duration = client.get('/grbs/GRB 101225A/durations/TimeBins_64ms').json()
+    assert duration['t90'] > duration['t50'] > 0
+    assert duration['t90_err'] is None
+    power = client.get('/grbs/GRB 101225A/power_spectra/TimeBins_64ms').json()
+    assert power['Frequency'][-1] == pytest.approx(1 / (2 * 0.064))
+
+    assert client.get('/grbs/GRB 101225A/burst_analyser/binnings/SNR9').status_code == 404
+    assert client.get('/grbs/GRB 101225A/spectra/PC').status_code == 404
+    assert client.get('/grbs/GRB 101225A/light_curves/XX').status_code == 422
+
+
+def test_errors(client: TestClient) -> None:
+    """Test the errors of invalid parameters, unknown products and failing data sources."""
+    params = {'time_start': 20.0, 'time_stop': 10.0}
+    assert client.get('/grbs/GRB 101225A/light_curves/WT', params=params).status_code == 400
+    assert client.get('/grbs/GRB 101225A/light_curves/PCHard').status_code == 404
+    assert client.get('/grbs/GRB 101225A/durations/SNR9').status_code == 404
+    assert client.get('/grbs/GRB 101225A/durations/SNR4', params={'instrument': 'XRT'}).status_code == 400
+    power_spectra = '/grbs/GRB 101225A/power_spectra/TimeBins_64ms'
+    assert client.get(power_spectra, params={'window': 'gauss'}).status_code == 400
+    assert client.get(power_spectra, params={'overlap': 1.5}).status_code == 422
+    assert client.get(power_spectra, params={'segment_size': 10**6}).status_code == 400
+    assert client.get('/grbs/GRB 101225A/spectra/WT', params={'e_min': 5, 'e_max': 1}).status_code == 400
+
+    def unreachable(**kwargs: object) -> dict:
+        raise ConnectionError('UKSSDC unreachable')
+
+    client.app.state.products.client.getSpectra = unreachable
+    failing = TestClient(client.app, raise_server_exceptions=False)
+    assert failing.get('/grbs/GRB 110000A/spectra/WT').status_code == 500
+
+
+def test_warm_cache(client: TestClient) -> None:
+    """Test that concurrent requests of a GRB load its products once."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: client.get('/grbs/GRB 101225A/hardness_ratios/WT'), range(16)))
+    assert all(response.status_code == 200 for response in responses)
+    assert client.app.state.products.client.calls.total() == 1
+    client.get('/grbs/GRB 101225A/burst_analyser/hardness_ratios')
+    assert client.app.state.products.client.calls.total() == 2
+
+
+def test_metrics(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the Prometheus and JSON exports of the instrumentation."""
+    monkeypatch.setattr(metrics, 'registry', MetricsRegistry(enabled=True))
+    client.get('/grbs/GRB 101225A/light_curves/WT')
+    response = client.get('/metrics')
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'gamma_burst_fetch_seconds_count{product="light_curve"} 1' in response.text
+    report = client.get('/metrics', params={'format': 'json'}).json()
+    assert report['counters']['gamma_burst_cache_misses_total'][0]['value'] == 1
+    assert client.get('/metrics', params={'format': 'xml'}).status_code == 400
@@ -0,0 +1,173 @@
+"""Synthetic products shaped like the UKSSDC ones, and a source serving them."""
+
+import numpy as np
+import pandas as pd
+
+from gamma_burst.rebin_scheduler import RUNNING_STATUSES
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+def make_bat_band(nb_points: int, bin_size: float = 0.064) -> pd.DataFrame:
+    """Build a BATBand-like table with a single pulse."""
+    time = np.arange(nb_points) * bin_size
+    flux = 1e-7 * np.exp(-0.5 * ((time - time.mean()) / (0.1 * time.max() + bin_size)) ** 2)
+    return pd.DataFrame({
+        'Time': time,
+        'TimePos': np.full(nb_points, bin_size / 2),
+        'TimeNeg': np.full(nb_points, -bin_size / 2),
+        'Flux': flux,
+        'FluxPos': 0.1 * flux + 1e-9,
+        'FluxNeg': -0.1 * flux - 1e-9,
+        'BadBin': np.zeros(nb_points, dtype=bool),
+        'Gamma': np.full(nb_points, 1.5),
+        'GammaPos': np.full(nb_points, 0.1),
+        'GammaNeg': np.full(nb_points, -0.1),
+        'ECF': np.full(nb_points, 2e-7),
+    })
+
+
+def make_burst_analyser_data(nb_points: int = 200) -> dict:
+    """Build a dictionary shaped like ``udg.getBurstAnalyser`` output."""
+    binnings = {'TimeBins_64ms': 0.064, 'TimeBins_1s': 1.0, 'SNR4': 0.5}
+    bat = {'Binning': list(binnings)}
+    no_evolution = {'Binning': list(binnings), 'ECFs': {'ObservedFlux': 2e-7}}
+    for binning, bin_size in binnings.items():
+        nb = max(int(nb_points * 0.064 / bin_size), 8)
+        bat[binning] = {'Datasets': ['BATBand'], 'BATBand': make_bat_band(nb, bin_size)}
+        no_evolution[binning] = {'Datasets': ['BATBand'], 'BATBand': make_bat_band(nb, bin_size)}
+    hr_time = np.linspace(0, 10, 20)
+    bat['HRData'] = pd.DataFrame({'Time': hr_time, 'HR': np.full(20, 0.8), 'Gamma': np.full(20, 1.5)})
+    return {'Instruments': ['BAT', 'BAT_NoEvolution'], 'BAT': bat, 'BAT_NoEvolution': no_evolution}
+
+
+def make_light_curves(nb_points: int) -> dict:
+    """Build a dictionary shaped like ``udg.getLightCurves`` output, observed up to ``nb_points`` seconds."""
+    time = np.arange(nb_points, dtype=float) + 0.5
+    rate = pd.DataFrame({
+        'Time': time,
+        'TimePos': np.full(nb_points, 0.5),
+        'TimeNeg': np.full(nb_points, -0.5),
+        'Rate': np.full(nb_points, 10.0),
+        'RatePos': np.full(nb_points, 1.0),
+        'RateNeg': np.full(nb_points, -1.0),
+        'ObsID': ['00000000001'] * nb_points,
+    })
+    hr = pd.DataFrame({'Time': time, 'HR': np.full(nb_points, 0.5)})
+    return {'Datasets': ['WT_incbad', 'WTHR_incbad'], 'WT_incbad': rate, 'WTHR_incbad': hr}
+
+
+def make_spectra() -> dict:
+    """Build a dictionary shaped like ``udg.getSpectra`` output, with a single WT power law fit."""
+    power_law_fit = {
+        'Gamma': 2.0, 'GammaPos': 0.1, 'GammaNeg': -0.2,
+        'ObsFlux': 1e-10, 'ObsFluxPos': 1e-11, 'ObsFluxNeg': -1e-11,
+    }
+    return {'rnames': ['interval0'], 'interval0': {'WT': {'PowerLaw': power_law_fit}}}
+
+
+class StubSource(SyntheticDataSource):
+    """Synthetic source serving the small products of this module instead of realistic ones.
+
+    Calls are counted, delayed and failed like those of the synthetic source,
+    rebin jobs included. On top of that, the first ``failures`` calls fail, the
+    XRT light curves grow by ``xrt_growth`` points at every call, ``xrt=False``
+    fails the XRT products like a GRB without XRT data, and the peak numbers of
+    calls in progress and of open rebin jobs are recorded.
+    """
+
+    def __init__(
+            self,
+            *,
+            nb_points: int = 200,
+            nb_xrt_points: int = 100,
+            xrt_growth: int = 0,
+            xrt: bool = True,
+            failures: int = 0,
+            **kwargs: object,
+        ) -> None:
+        """Create a stub source.
+
+        Args:
+            nb_points (int): Length of the finest Burst Analyser light curve.
+            nb_xrt_points (int): Length of the first XRT light curves.
+            xrt_growth (int): Number of points added to the XRT light curves at every call.
+            xrt (bool): Whether the GRB has XRT products.
+            failures (int): Number of first calls raising a ``ConnectionError``.
+            **kwargs (object): Arguments of :class:`SyntheticDataSource`.
+
+        """
+        super().__init__(**kwargs)
+        self.nb_points = nb_points
+        self.nb_xrt_points = nb_xrt_points
+        self.xrt_growth = xrt_growth
+        self.xrt = xrt
+        self.failures = failures
+        self.running = 0
+        self.max_running = 0
+        self.open_jobs: set[int] = set()
+        self.max_open_jobs = 0
+
+    @property
+    def source_id(self) -> str:
+        """Identity of the source, apart from the realistic synthetic products."""
+        return f'stub/nb_points={self.nb_points}'
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            failing = self.failures > 0
+            self.failures = max(self.failures - 1, 0)
+        try:
+            super()._call(name)
+        finally:
+            with self._lock:
+                self.running -= 1
+        if failing:
+            raise ConnectionError(f'Stub failure of {name}')
+
+    def _check_xrt(self) -> None:
+        if not self.xrt:
+            raise ConnectionError('No XRT data')
+
+    def getBurstAnalyser(self, **kwargs: object) -> dict:
+        """Burst Analyser product of :func:`make_burst_analyser_data`."""
+        self._call('getBurstAnalyser')
+        return make_burst_analyser_data(self.nb_points)
+
+    def getLightCurves(self, **kwargs: object) -> dict:
+        """XRT light curves of :func:`make_light_curves`, longer at every call if ``xrt_growth`` is set."""
+        self._call('getLightCurves')
+        self._check_xrt()
+        with self._lock:
+            nb_xrt_points = self.nb_xrt_points
+            self.nb_xrt_points += self.xrt_growth
+        return make_light_curves(nb_xrt_points)
+
+    def getSpectra(self, **kwargs: object) -> dict:
+        """XRT spectra of :func:`make_spectra`."""
+        self._call('getSpectra')
+        self._check_xrt()
+        return make_spectra()
+
+    def rebinLightCurve(self, **kwargs: object) -> int:
+        """Submit a rebin job, which stays open until it ends."""
+        job_id = super().rebinLightCurve(**kwargs)
+        with self._lock:
+            self.open_jobs.add(job_id)
+            self.max_open_jobs = max(self.max_open_jobs, len(self.open_jobs))
+        return job_id
+
+    def checkRebinStatus(self, JobID: int, **kwargs: object) -> dict:
+        """Status of a rebin job, closing it once it ends."""
+        status = super().checkRebinStatus(JobID, **kwargs)
+        if status['statusText'] not in RUNNING_STATUSES:
+            with self._lock:
+                self.open_jobs.discard(JobID)
+        return status
+
+    def cancelRebin(self, JobID: int, **kwargs: object) -> bool:
+        """Cancel and close a rebin job."""
+        with self._lock:
+            self.open_jobs.discard(JobID)
+        return super().cancelRebin(JobID, **kwargs)
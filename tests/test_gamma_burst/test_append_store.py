@@ -0,0 +1,67 @@
+"""Testing src/gamma_burst/append_store.py functions."""
+
+import math
+from pathlib import Path
+
+import pandas as pd
+
+from gamma_burst.append_store import WindowedCache, append_tables, last_times, open_append_store
+from gamma_burst.eumerations import ObservationMode, RebinMethod
+from gamma_burst.light_curve import XRTLightCurve
+from tests.test_gamma_burst.data import StubSource, make_light_curves
+
+
+def test_append_only_merge(tmp_path: Path) -> None:
+    """Test that new rows are appended, and that changed past values or rows rewrite the table."""
+    store_path = tmp_path / 'store'
+    assert append_tables(make_light_curves(100), store_path) == {'WT_incbad': -math.inf, 'WTHR_incbad': -math.inf}
+    assert append_tables(make_light_curves(100), store_path) == {}
+    assert append_tables(make_light_curves(120), store_path) == {'WT_incbad': 100.5, 'WTHR_incbad': 100.5}
+    assert last_times(store_path) == {'WT_incbad': 119.5, 'WTHR_incbad': 119.5}
+    assert len(list((store_path / 'tables' / 'WT_incbad').iterdir())) == 2
+
+    data = open_append_store(store_path)
+    expected = make_light_curves(120)
+    assert data['Datasets'] == expected['Datasets']
+    pd.testing.assert_frame_equal(data['WT_incbad'], expected['WT_incbad'])
+
+    reprocessed = make_light_curves(120)
+    reprocessed['WTHR_incbad'].loc[7, 'HR'] += 0.1
+    assert append_tables(reprocessed, store_path) == {'WTHR_incbad': -math.inf}
+    pd.testing.assert_frame_equal(open_append_store(store_path)['WTHR_incbad'], reprocessed['WTHR_incbad'])
+
+    revised = make_light_curves(130)
+    revised['WTHR_incbad'].loc[7, 'HR'] += 0.1
+    revised['WT_incbad'].loc[3, 'Rate'] = 0.0
+    revised['WT_incbad'] = revised['WT_incbad'].drop(index=5).reset_index(drop=True)
+    assert append_tables(revised, store_path) == {'WT_incbad': -math.inf, 'WTHR_incbad': 120.5}
+    pd.testing.assert_frame_equal(open_append_store(store_path)['WT_incbad'], revised['WT_incbad'])
+
+
+def test_windowed_cache() -> None:
+    """Test that only the products whose window reaches new data are invalidated."""
+    cache = WindowedCache()
+    for time_scale in [(0.0, 10.0), (0.0, 50.0), None]:
+        cache.get('WT_incbad', time_scale, 'fluence', lambda: 1.0)
+    cache.get('PC_incbad', None, 'fluence', lambda: 1.0)
+    assert cache.invalidate('WT_incbad', 20.0) == 2
+    assert len(cache) == 2
+
+
+def test_incremental_refresh(home: Path) -> None:
+    """Test that refreshing an active burst keeps the derived products of past windows."""
+    light_curve = XRTLightCurve('GRB 101225A', client=StubSource(xrt_growth=10), incremental=True)
+    early = light_curve.fluence(ObservationMode.WT_Mode, (0.0, 50.0))
+    total = light_curve.fluence(ObservationMode.WT_Mode)
+    assert total[0] == 1000.0
+    rebinned = light_curve.rebin_light_curve(ObservationMode.WT_Mode, RebinMethod.Fixed, (0.0, 50.0), bin_size=10.0)
+
+    assert light_curve.refresh() == {'WT_incbad': 100.5, 'WTHR_incbad': 100.5}
+    assert light_curve.fluence(ObservationMode.WT_Mode, (0.0, 50.0)) is early
+    again = light_curve.rebin_light_curve(ObservationMode.WT_Mode, RebinMethod.Fixed, (0.0, 50.0), bin_size=10.0)
+    assert again is rebinned
+    assert light_curve.fluence(ObservationMode.WT_Mode)[0] == 1100.0
+    assert len(light_curve.light_curve(ObservationMode.WT_Mode)) == 110
+
+    reopened = XRTLightCurve('GRB 101225A', client=StubSource(xrt_growth=10), incremental=True)
+    assert len(reopened.lc_data['WTHR_incbad']) == 110
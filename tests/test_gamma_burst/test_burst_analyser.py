@@ -0,0 +1,48 @@
+"""Testing src/gamma_burst/burst_analyser.py functions."""
+
+from pathlib import Path
+
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from tests.test_gamma_burst.data import make_burst_analyser_data
+
+
+def test_lazy_construction(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that nothing is fetched before data are needed, and only once."""
+    calls = []
+
+    def get_burst_analyser(**kwargs: object) -> dict:
+        calls.append(kwargs['GRBName'])
+        return make_burst_analyser_data()
+
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', get_burst_analyser)
+    analyser = BurstAnalyser('GRB 101225A')
+    assert calls == []
+    assert analyser.available_binning_data == ['TimeBins_64ms', 'TimeBins_1s']
+    assert analyser.available_SNR_data == ['SNR4']
+    assert calls == ['GRB 101225A']
+
+    reopened = BurstAnalyser('GRB 101225A')
+    assert reopened.available_SNR_data_no_evolution == ['SNR4']
+    assert 'burst_analyser_data' not in vars(reopened)
+    time, count_rate = reopened.retrieve_time_and_count_rate('SNR4')
+    assert len(time) == len(count_rate)
+    assert calls == ['GRB 101225A']
+
+
+def test_wrong_binning(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test binning validation."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    with pytest.raises(ValueError, match='Wrong SNR'):
+        analyser.plot_light_curve_snr('SNR99')
+
+
+def test_compute_durations(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test durations over every binning."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    durations = BurstAnalyser('GRB 101225A').compute_durations(nb_samples=10, seed=0)
+    assert list(durations) == ['TimeBins_64ms', 'TimeBins_1s', 'SNR4']
+    assert all(0 < result.t50 < result.t90 for result in durations.values())
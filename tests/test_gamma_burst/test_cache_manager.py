@@ -0,0 +1,72 @@
+"""Testing src/gamma_burst/cache_manager.py functions."""
+
+from pathlib import Path
+
+import pytest
+
+from gamma_burst.cache_manager import CACHE_DIR_ENV, CacheManager, get_cache_manager, reset_cache_manager
+from gamma_burst.cache_policy import load_pickle, save_pickle
+from gamma_burst.eumerations import ProductType
+
+
+def _get(cache: CacheManager, params: dict, payload: bytes = b'') -> dict:
+    return cache.load_or_fetch(
+        ProductType.Rebinned_Light_Curve,
+        params,
+        'lc_data.pkl',
+        fetch=lambda entry_path: {'params': params, 'payload': payload},
+        load=load_pickle,
+        save=save_pickle,
+    )
+
+
+def test_keys() -> None:
+    """Test that keys depend on every parameter but not on their order."""
+    key = CacheManager.key(ProductType.Rebinned_Light_Curve, {'GRBName': 'GRB 1', 'binSize': 1.0})
+    assert key == CacheManager.key(ProductType.Rebinned_Light_Curve, {'binSize': 1.0, 'GRBName': 'GRB 1'})
+    assert key != CacheManager.key(ProductType.Rebinned_Light_Curve, {'GRBName': 'GRB 1', 'binSize': 2.0})
+    assert key != CacheManager.key(ProductType.Light_Curve, {'GRBName': 'GRB 1', 'binSize': 1.0})
+
+
+def test_hits_and_misses(tmp_path: Path) -> None:
+    """Test that each binning gets its own entry, and the statistics."""
+    cache = CacheManager(tmp_path, max_bytes=None)
+    assert _get(cache, {'binSize': 1.0})['params'] == {'binSize': 1.0}
+    assert _get(cache, {'binSize': 2.0})['params'] == {'binSize': 2.0}
+    assert _get(cache, {'binSize': 1.0})['params'] == {'binSize': 1.0}
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.nb_entries) == (1, 2, 2)
+    assert stats.bytes_written == stats.total_bytes
+    assert stats.bytes_served > 0
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """Test that the least recently used entries are evicted first."""
+    cache = CacheManager(tmp_path, max_bytes=None)
+    for bin_size in (1.0, 2.0, 3.0):
+        _get(cache, {'binSize': bin_size}, b'x' * 10_000)
+    _get(cache, {'binSize': 1.0})
+    evicted = cache.gc(max_bytes=cache.stats().total_bytes - 1)
+    assert evicted == [CacheManager.key(ProductType.Rebinned_Light_Curve, {'binSize': 2.0})]
+    assert not cache.entry_path(ProductType.Rebinned_Light_Curve, {'binSize': 2.0}).exists()
+
+    max_bytes = cache.stats().total_bytes + 100
+    bounded = CacheManager(tmp_path, max_bytes=max_bytes)
+    _get(bounded, {'binSize': 4.0}, b'x' * 10_000)
+    stats = bounded.stats()
+    assert stats.nb_entries == 2
+    assert stats.evictions == 2
+    assert stats.total_bytes <= max_bytes
+    assert bounded.entry_path(ProductType.Rebinned_Light_Curve, {'binSize': 1.0}).exists()
+
+
+@pytest.mark.usefixtures('home')
+def test_default_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the default cache is kept until reset, and then reads the environment again."""
+    cache = get_cache_manager()
+    assert cache.root == tmp_path / '.gamma_burst'
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / 'cache'))
+    assert get_cache_manager() is cache
+    reset_cache_manager()
+    assert get_cache_manager().root == tmp_path / 'cache'
@@ -0,0 +1,79 @@
+"""Testing src/gamma_burst/cache_policy.py functions."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from gamma_burst.cache_policy import CachePolicy, load_or_fetch, load_pickle, metadata_path, save_pickle
+from gamma_burst.eumerations import CacheMode, ProductType
+
+
+class Fetcher:
+    """Count fetches and return their number."""
+
+    def __init__(self) -> None:
+        """Create a fetcher without any fetch."""
+        self.nb_calls = 0
+
+    def __call__(self) -> dict:
+        """Count a fetch and return its number."""
+        self.nb_calls += 1
+        return {'call': self.nb_calls}
+
+
+def _load(cache_file: Path, fetch: Fetcher, policy: CachePolicy, params: dict | None = None) -> dict:
+    return load_or_fetch(
+        cache_file,
+        ProductType.Light_Curve,
+        params or {'GRBName': 'GRB 1'},
+        fetch=fetch,
+        load=load_pickle,
+        save=save_pickle,
+        policy=policy,
+    )
+
+
+def test_refresh_if_stale(tmp_path: Path) -> None:
+    """Test that fresh data are served from disk and stale data refreshed."""
+    cache_file = tmp_path / 'lc' / 'lc_data.pkl'
+    fetch = Fetcher()
+    policy = CachePolicy()
+    assert _load(cache_file, fetch, policy) == {'call': 1}
+    assert _load(cache_file, fetch, policy) == {'call': 1}
+    assert json.loads(metadata_path(cache_file).read_text())['params'] == {'GRBName': 'GRB 1'}
+
+    assert _load(cache_file, fetch, policy, {'GRBName': 'GRB 1', 'incbad': 'no'}) == {'call': 2}
+    expired = CachePolicy(ttl={ProductType.Light_Curve: 0.0})
+    assert _load(cache_file, fetch, expired, {'GRBName': 'GRB 1', 'incbad': 'no'}) == {'call': 3}
+    assert _load(cache_file, fetch, CachePolicy(mode=CacheMode.Always_Refresh)) == {'call': 4}
+
+
+def test_offline(tmp_path: Path) -> None:
+    """Test that the offline mode never fetches."""
+    cache_file = tmp_path / 'lc_data.pkl'
+    fetch = Fetcher()
+    offline = CachePolicy(mode=CacheMode.Offline, ttl={ProductType.Light_Curve: 0.0})
+    with pytest.raises(FileNotFoundError):
+        _load(cache_file, fetch, offline)
+    _load(cache_file, fetch, CachePolicy())
+    assert _load(cache_file, fetch, offline) == {'call': 1}
+    assert fetch.nb_calls == 1
+
+
+def test_stale_fallback(tmp_path: Path) -> None:
+    """Test that stale data are served when the refresh fails."""
+    cache_file = tmp_path / 'lc_data.pkl'
+    _load(cache_file, Fetcher(), CachePolicy())
+
+    def failing_fetch() -> dict:
+        raise ConnectionError
+
+    with pytest.warns(UserWarning, match='stale'):
+        assert _load(cache_file, failing_fetch, CachePolicy(mode=CacheMode.Always_Refresh)) == {'call': 1}
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the environment override."""
+    monkeypatch.setenv('GAMMA_BURST_CACHE_MODE', 'offline')
+    assert CachePolicy.from_env().mode == CacheMode.Offline
@@ -0,0 +1,91 @@
+"""Testing src/gamma_burst/catalog.py functions."""
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst import catalog
+from gamma_burst.catalog import (
+    FEATURE_COLUMNS,
+    FeatureResult,
+    completed_bursts,
+    extract_catalog,
+    extract_features,
+    read_catalog,
+)
+from gamma_burst.eumerations import CatalogFormat
+from gamma_burst.synthetic_source import SyntheticDataSource
+from tests.test_gamma_burst.data import StubSource
+
+
+def test_extract_features(home: Path) -> None:
+    """Test the features of a burst, with and without XRT products."""
+    features = extract_features('GRB 101225A', client=SyntheticDataSource(duration=50.0))
+    assert set(features) == set(FEATURE_COLUMNS)
+    assert features['errors'] == ''
+    assert 0 < features['t50'] < features['t90']
+    assert features['bat_peak_rate_64ms'] > features['bat_peak_rate_10s'] > 0
+    assert 1.5 <= features['xrt_wt_gamma'] <= 2.5 and features['xrt_pc_nb_points'] > 0
+
+    features = extract_features('GRB 050509B', client=StubSource(xrt=False))
+    assert features['bat_mean_hr'] == pytest.approx(0.8)
+    assert features['bat_mean_gamma'] == pytest.approx(1.5)
+    assert features['bat_nb_points'] == 200
+    assert math.isnan(features['bat_peak_rate_10s']) and math.isnan(features['xrt_wt_gamma'])
+    assert 'spectra' in features['errors'] and 'light curves' in features['errors']
+
+
+def test_resume(home: Path) -> None:
+    """Test that an interrupted extraction keeps its results and resumes."""
+    grb_names = [f'GRB {idx}' for idx in range(5)]
+    source = SyntheticDataSource(duration=20.0)
+
+    def interrupt(result: FeatureResult, nb_done: int, nb_total: int) -> None:
+        if nb_done == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        extract_catalog(
+            grb_names,
+            home / 'catalog',
+            max_workers=1,
+            catalog_format=CatalogFormat.CSV,
+            client=source,
+            progress=interrupt,
+        )
+    done = completed_bursts(home / 'catalog')
+    assert len(done) >= 2 and done < set(grb_names)
+
+    report = extract_catalog(
+        grb_names + grb_names[:1], home / 'catalog', max_workers=2, batch_size=2,
+        catalog_format=CatalogFormat.CSV, client=source, progress=None,
+    )
+    assert set(report.skipped) == done
+    assert len(report.succeeded) == 5 - len(done)
+    table = read_catalog(home / 'catalog')
+    assert sorted(table['grb_name']) == grb_names
+    assert list(table.columns) == list(FEATURE_COLUMNS)
+    assert str(table['bat_nb_points'].dtype) == 'Int64'
+    assert (table['errors'] == '').all()
+    np.testing.assert_allclose(
+        table.set_index('grb_name').loc['GRB 4', 't90'],
+        extract_features('GRB 4', client=source)['t90'],
+    )
+
+
+def test_failures_and_formats(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that failed bursts are not written, and the Parquet requirement."""
+    report = extract_catalog(
+        ['GRB A', 'GRB B'], home / 'catalog', max_workers=1, catalog_format=CatalogFormat.CSV,
+        client=SyntheticDataSource(failure_rate=1.0), progress=None,
+    )
+    assert len(report.failed) == 2 and report.parts == []
+    assert 'FAILED GRB A' in report.summary()
+    assert read_catalog(home / 'catalog').empty
+    with pytest.raises(ValueError, match='Batch size'):
+        extract_catalog(['GRB A'], home / 'catalog', batch_size=0)
+    monkeypatch.setattr(catalog, 'pyarrow', None)
+    with pytest.raises(ValueError, match='pyarrow'):
+        extract_catalog(['GRB A'], home / 'catalog')
@@ -0,0 +1,68 @@
+"""Testing src/gamma_burst/cli.py functions."""
+
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from gamma_burst.catalog import read_catalog
+from gamma_burst.cli import main, read_grb_names
+from gamma_burst.data_source import DATA_SOURCE_ENV
+
+HEAVY_MODULES = ('matplotlib', 'pandas', 'swifttools', 'astropy')
+
+
+def imported_modules(code: str, home: Path) -> list[str]:
+    """Heavy modules imported by a fresh interpreter running some code."""
+    modules = (*HEAVY_MODULES, 'numpy', 'pydantic')
+    check = f'import sys\n{code}\nprint(sorted(m for m in {modules!r} if m in sys.modules))'
+    output = subprocess.run(
+        [sys.executable, '-c', check],
+        env={**os.environ, 'HOME': str(home)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return eval(output.splitlines()[-1])  # noqa: S307
+
+
+def test_read_grb_names(tmp_path: Path) -> None:
+    """Test names from arguments, files and stdin, in order and without duplicates."""
+    path = tmp_path / 'grbs.txt'
+    path.write_text('GRB 101225A\n\n# comment\nGRB 050509B  # short\n')
+    names = read_grb_names(['GRB 1', ' '], [str(path), '-'], stdin=io.StringIO('GRB 2\nGRB 1\n'))
+    assert names == ['GRB 1', 'GRB 101225A', 'GRB 050509B', 'GRB 2']
+
+
+def test_commands(home: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    """Test the subcommands on the synthetic data source."""
+    monkeypatch.setenv(DATA_SOURCE_ENV, 'ukssdc')
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('GRB 1\nGRB 2\n'))
+    assert main(['fetch', '--source', 'synthetic', '--products', 'spectra', '-q']) == 0
+    assert os.environ[DATA_SOURCE_ENV] == 'synthetic'
+    assert 'Fetched 2/2 products' in capsys.readouterr().out
+
+    assert main(['analyze', 'GRB 1', '-o', str(home / 'catalog'), '--format', 'csv', '-j', '1']) == 0
+    assert '[1/1] GRB 1: ok' in capsys.readouterr().out
+    assert list(read_catalog(home / 'catalog')['grb_name']) == ['GRB 1']
+
+    assert main(['render', 'GRB 1', '-o', str(home / 'plots'), '--plots', 'bat_hr', 'xrt_pc_lc', '-j', '1', '-q']) == 0
+    assert sorted(path.name for path in (home / 'plots').iterdir()) == ['GRB_1_bat_hr.png', 'GRB_1_xrt_pc_lc.png']
+    with pytest.raises(SystemExit) as error:
+        main(['render', 'GRB 1', '--plots', 'unknown'])
+    assert error.value.code == 2 and 'Unknown plot types' in capsys.readouterr().err
+
+    assert main(['cache', 'gc', '--max-bytes', '0']) == 0
+    output = capsys.readouterr().out
+    assert output.startswith('Evicted 4 entries') and 'nb_entries: 0' in output
+    assert main(['cache', 'clear']) == 0
+
+
+def test_lazy_imports(home: Path) -> None:
+    """Test that the analysis modules and the cache commands do not import the heavy dependencies."""
+    code = 'import gamma_burst.burst_analyser, gamma_burst.light_curve, gamma_burst.spectra, gamma_burst.timing'
+    assert not set(imported_modules(code, home)) & set(HEAVY_MODULES)
+    assert imported_modules('from gamma_burst.cli import main\nmain(["cache", "stats"])', home) == []
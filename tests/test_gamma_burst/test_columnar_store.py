@@ -0,0 +1,53 @@
+"""Testing src/gamma_burst/columnar_store.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gamma_burst.columnar_store import is_columnar_store, open_columnar_store, write_columnar_store
+
+
+def _burst_data() -> dict:
+    band = pd.DataFrame({
+        'Time': np.arange(5, dtype=float),
+        'Flux': np.linspace(1, 2, 5),
+        'BadBin': np.zeros(5, dtype=bool),
+        'ObsID': ['00000000001'] * 5,
+    })
+    return {
+        'Instruments': ['BAT', 'BAT_NoEvolution'],
+        'BAT': {
+            'Binning': ['SNR4'],
+            'SNR4': {'Datasets': ['BATBand'], 'BATBand': band},
+            'HRData': band.set_index('Time'),
+        },
+        'BAT_NoEvolution': {'ECFs': {'ObservedFlux': np.float64(2.5)}, 'Range': (1, 2)},
+    }
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test that a written store reads back the same data."""
+    store_path = tmp_path / 'store'
+    write_columnar_store(_burst_data(), store_path)
+    assert is_columnar_store(store_path)
+
+    data = open_columnar_store(store_path)
+    expected = _burst_data()
+    assert data['Instruments'] == expected['Instruments']
+    pd.testing.assert_frame_equal(data['BAT']['SNR4']['BATBand'], expected['BAT']['SNR4']['BATBand'])
+    pd.testing.assert_frame_equal(data['BAT']['HRData'], expected['BAT']['HRData'])
+    assert data['BAT_NoEvolution']['ECFs']['ObservedFlux'] == 2.5
+    assert data['BAT_NoEvolution']['Range'] == (1, 2)
+
+
+def test_lazy_loading(tmp_path: Path) -> None:
+    """Test that tables are only read on access, memory-mapped."""
+    store_path = tmp_path / 'store'
+    write_columnar_store(_burst_data(), store_path)
+    snr = open_columnar_store(store_path)['BAT']['SNR4']
+    assert snr.is_table('BATBand')
+    assert not snr.is_loaded('BATBand')
+    time = snr['BATBand']['Time'].to_numpy()
+    assert snr.is_loaded('BATBand')
+    assert not time.flags.writeable
@@ -0,0 +1,58 @@
+"""Testing src/gamma_burst/containers.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import LightCurve, SpectralSeries
+from tests.test_gamma_burst.data import make_bat_band, make_burst_analyser_data
+
+
+def test_light_curve_columns() -> None:
+    """Test sorting, scalar ECF and cached derived columns."""
+    light_curve = LightCurve(
+        [2.0, 0.0, 1.0], rate=[3.0, 1.0, 2.0], rate_pos=[0.3, 0.1, 0.2], rate_neg=[-0.3, -0.1, -0.2], ecf=2.0
+    )
+    np.testing.assert_array_equal(light_curve.time, [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(light_curve.count_rate, [0.5, 1.0, 1.5])
+    np.testing.assert_allclose(light_curve.count_rate_error, [0.05, 0.1, 0.15])
+    assert light_curve.count_rate is light_curve.count_rate
+    assert light_curve.width is None
+    with pytest.raises(ValueError, match='Unknown columns'):
+        LightCurve([0.0], flux=[1.0])
+    with pytest.raises(ValueError, match='has 2 values'):
+        LightCurve([0.0], rate=[1.0, 2.0])
+
+
+def test_window_and_precision() -> None:
+    """Test that windows are views and that float32 series keep float64 times."""
+    table = make_bat_band(1000)
+    light_curve = LightCurve.from_bat_band(table)
+    window = light_curve.window((1.0, 2.0))
+    mask = (table['Time'] >= 1.0) & (table['Time'] <= 2.0)
+    np.testing.assert_array_equal(window.rate, table.loc[mask, 'Flux'])
+    assert np.shares_memory(window.rate, light_curve.rate)
+
+    compact = LightCurve.from_bat_band(table, np.float32)
+    assert compact.time.dtype == np.float64 and compact.dtype == np.float32
+    np.testing.assert_allclose(compact.count_rate, light_curve.count_rate, rtol=1e-6)
+    assert compact.nbytes < table.memory_usage(deep=True).sum() / 1.5
+
+    series = SpectralSeries.from_table(table)
+    assert series.spectra(np.array([20.0, 50.0])).shape == (1000, 2)
+    np.testing.assert_allclose(series.spectra(np.array([50.0]))[:, 0], light_curve.count_rate)
+
+
+def test_burst_analyser_light_curves(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the burst analyser builds its containers once."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    assert analyser.light_curve('SNR4') is analyser.light_curve('SNR4')
+    assert analyser.light_curve('SNR4', dtype=np.float32).dtype == np.float32
+    _, count_rate = analyser.retrieve_time_and_count_rate_no_evolution('SNR4')
+    table = make_burst_analyser_data()['BAT_NoEvolution']['SNR4']['BATBand']
+    np.testing.assert_allclose(count_rate, table['Flux'] / 2e-7)
+    assert analyser.compute_spectra('SNR4', np.array([50.0]), (0.0, 5.0)).shape == (11, 1)
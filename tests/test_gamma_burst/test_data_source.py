@@ -0,0 +1,50 @@
+"""Testing src/gamma_burst/data_source.py functions."""
+
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.data_source import cache_params, get_data_source, source_id
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectra import XRTSpectra
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+def test_source_from_env(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the environment selects the default data source."""
+    assert get_data_source() is data_source.udg
+    monkeypatch.setattr(data_source, '_default_source', None)
+    monkeypatch.setenv('GAMMA_BURST_DATA_SOURCE', 'synthetic')
+    monkeypatch.setenv('GAMMA_BURST_SYNTHETIC_LATENCY', '0.001,0.002')
+    source = get_data_source()
+    assert isinstance(source, SyntheticDataSource) and source.latency == (0.001, 0.002)
+    assert XRTSpectra('GRB 101225A').client is source
+    monkeypatch.setenv('GAMMA_BURST_DATA_SOURCE', 'other')
+    with pytest.raises(ValueError, match='Unknown data source'):
+        get_data_source()
+
+
+def test_sources_do_not_share_cache(home: Path) -> None:
+    """Test that switching sources on the same home never serves the products of the other source."""
+    synthetic = SyntheticDataSource()
+    live_products = SyntheticDataSource(seed=1)
+    live = ModuleType('swifttools.ukssdc.data.GRB')
+    live.getBurstAnalyser = live_products.getBurstAnalyser
+    live.getLightCurves = live_products.getLightCurves
+    assert source_id(live) == 'ukssdc' and cache_params({'GRBName': 'GRB 1'}, live) == {'GRBName': 'GRB 1'}
+    assert source_id(synthetic) != source_id(live_products)
+
+    BurstAnalyser('GRB 101225A', client=synthetic).recover_burst_analyser_data()
+    XRTLightCurve('GRB 101225A', client=synthetic)
+    live_analyser = BurstAnalyser('GRB 101225A', client=live)
+    live_analyser.recover_burst_analyser_data()
+    XRTLightCurve('GRB 101225A', client=live)
+    assert live_products.calls == {'getBurstAnalyser': 1, 'getLightCurves': 1}
+    assert live_analyser.cache_folder() != BurstAnalyser('GRB 101225A', client=synthetic).cache_folder()
+
+    BurstAnalyser('GRB 101225A', client=live).recover_burst_analyser_data()
+    BurstAnalyser('GRB 101225A', client=synthetic).recover_burst_analyser_data()
+    assert live_products.calls['getBurstAnalyser'] == 1 and synthetic.calls['getBurstAnalyser'] == 1
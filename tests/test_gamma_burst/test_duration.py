@@ -0,0 +1,54 @@
+"""Testing src/gamma_burst/duration.py functions."""
+
+import numpy as np
+import pytest
+
+from gamma_burst.duration import compute_duration, crossing_times, cumulative_fluence
+
+
+def test_cumulative_fluence() -> None:
+    """Test that negative bins are ignored and widths applied."""
+    flux = np.array([1.0, -1.0, 2.0])
+    assert cumulative_fluence(flux).tolist() == [1.0, 1.0, 3.0]
+    assert cumulative_fluence(flux, widths=np.array([2.0, 2.0, 0.5])).tolist() == [2.0, 2.0, 3.0]
+    assert cumulative_fluence(flux, positive_only=False).tolist() == [1.0, 0.0, 2.0]
+
+
+def test_crossing_times_batch() -> None:
+    """Test interpolated crossing times on a batch of curves."""
+    time = np.array([0.0, 1.0, 2.0])
+    fraction = np.array([[0.0, 0.5, 1.0], [0.0, 1.0, 1.0]])
+    assert crossing_times(time, fraction, 0.25).tolist() == [0.5, 0.25]
+
+
+def test_flat_burst_duration() -> None:
+    """Test T90 and T50 of a constant emission."""
+    time = np.arange(1001, dtype=float)
+    flux = np.ones_like(time)
+    result = compute_duration(time, flux)
+    assert result.t90 == pytest.approx(900, abs=1)
+    assert result.t50 == pytest.approx(500, abs=1)
+    assert result.total_fluence == 1001
+
+
+def test_monte_carlo_uncertainties() -> None:
+    """Test that uncertainties grow with the flux errors."""
+    time = np.linspace(0, 10, 500)
+    flux = np.exp(-0.5 * (time - 5) ** 2)
+    small = compute_duration(time, flux, flux_err=np.full_like(flux, 0.01), nb_samples=200, seed=1)
+    large = compute_duration(time, flux, flux_err=np.full_like(flux, 0.1), nb_samples=200, seed=1)
+    assert 0 < small.t90_err < large.t90_err
+    assert np.isnan(compute_duration(time, flux).t90_err)
+
+
+def test_batch_durations() -> None:
+    """Test that a batch of light curves gives the durations of each curve."""
+    time = np.linspace(0, 10, 500)
+    flux = np.exp(-0.5 * ((time - 5) / np.array([[0.5], [1.0], [2.0]])) ** 2)
+    flux_err = np.full_like(flux, 0.05)
+    result = compute_duration(time, flux, flux_err=flux_err, nb_samples=50, seed=1)
+    assert result.t90.shape == result.total_fluence.shape == result.t90_err.shape == (3,)
+    for curve, curve_err, t90, t50 in zip(flux, flux_err, result.t90, result.t50, strict=True):
+        single = compute_duration(time, curve, flux_err=curve_err)
+        assert (single.t90, single.t50) == (pytest.approx(t90), pytest.approx(t50))
+    assert np.all(np.diff(result.t90) > 0) and np.all(result.t90_err > 0)
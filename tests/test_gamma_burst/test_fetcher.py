@@ -0,0 +1,42 @@
+"""Testing src/gamma_burst/fetcher.py functions."""
+
+import time
+from pathlib import Path
+
+from gamma_burst.cache_manager import get_cache_manager
+from gamma_burst.eumerations import ProductType
+from gamma_burst.fetcher import RateLimiter, fetch_many
+from tests.test_gamma_burst.data import StubSource
+
+
+def test_fetch_many(home: Path) -> None:
+    """Test concurrent fetch of every product."""
+    client = StubSource(latency=0.05)
+    grb_names = [f'GRB {idx}' for idx in range(6)]
+    report = fetch_many(grb_names, max_workers=4, client=client, progress=None)
+    assert len(report.succeeded) == 18
+    assert client.max_running > 1
+    assert client.max_running <= 4
+    assert get_cache_manager().stats().nb_entries == 18
+
+
+def test_fetch_many_retries(home: Path) -> None:
+    """Test retries and failure reporting."""
+    client = StubSource(failures=2)
+    report = fetch_many(['GRB 1'], [ProductType.Spectra], max_retries=3, backoff=0, client=client, progress=None)
+    assert report.results[0].success
+    assert report.results[0].attempts == 3
+
+    client = StubSource(failures=10)
+    report = fetch_many(['GRB 2'], [ProductType.Spectra], max_retries=1, backoff=0, client=client, progress=None)
+    assert report.failed[0].attempts == 2
+    assert 'FAILED GRB 2 spectra' in report.summary()
+
+
+def test_rate_limiter() -> None:
+    """Test that the limiter spaces requests."""
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
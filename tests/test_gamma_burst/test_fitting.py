@@ -0,0 +1,60 @@
+"""Testing src/gamma_burst/fitting.py functions."""
+
+from itertools import pairwise
+
+import numpy as np
+import pytest
+
+from gamma_burst.eumerations import FitStatistic
+from gamma_burst.fitting import SpectralData, fit_spectra
+from gamma_burst.spectral_models import cutoff_power_law, integrated_flux, power_law
+
+EDGES = np.geomspace(10, 1000, 21)
+
+
+def channel_fluxes(model: object, *params: np.ndarray) -> np.ndarray:
+    """Photon flux of every channel, shape (nb_spectra, nb_channels)."""
+    return np.stack([integrated_flux(model, low, high, *params) for low, high in pairwise(EDGES)], axis=-1)
+
+
+def test_cstat_cutoff_power_law() -> None:
+    """Test C-stat fits of many Poisson spectra against the true parameters."""
+    rng = np.random.default_rng(0)
+    nb_spectra = 100
+    alpha = rng.uniform(-1.5, -0.5, nb_spectra)
+    epeak = rng.uniform(100, 500, nb_spectra)
+    exposure = np.full(nb_spectra, 100.0)
+    counts = rng.poisson(channel_fluxes(cutoff_power_law, 0.05, alpha, epeak) * exposure[:, None])
+    data = SpectralData(EDGES[:-1], EDGES[1:], counts.astype(float), exposure=exposure)
+
+    result = fit_spectra(data, 'cutoff_power_law', FitStatistic.CStat, max_workers=1, seed=0)
+    assert result.params.shape == (nb_spectra, 3)
+    assert result.covariance.shape == (nb_spectra, 3, 3)
+    assert result.dof == 17
+    assert result.converged.all()
+    pulls = (result.param('alpha') - alpha) / result.errors[:, 1]
+    assert np.std(pulls) == pytest.approx(1, abs=0.25)
+    assert np.median(result.fit_statistic) == pytest.approx(17, rel=0.3)
+
+
+def test_chi2_fixed_parameter_and_pool() -> None:
+    """Test chi2 fits with a fixed parameter, in a process pool."""
+    index = np.array([-1.2, -2.0, -2.5])
+    flux = channel_fluxes(power_law, 1e-2, index)
+    data = SpectralData(EDGES[:-1], EDGES[1:], flux, errors=0.01 * flux)
+    result = fit_spectra(data, 'power_law', fixed={'amplitude': 1e-2}, nb_starts=4, max_workers=2, seed=0)
+    assert result.free_params == ('index',)
+    np.testing.assert_allclose(result.param('index'), index, rtol=1e-4)
+    assert np.isnan(result.errors[:, 0]).all()
+    np.testing.assert_allclose(result.fit_statistic, 0, atol=1e-3)
+
+def test_underdetermined() -> None:
+    """Test that fits need more channels than free parameters."""
+    edges = np.array([15.0, 50.0, 150.0])
+    flux = np.stack([integrated_flux(power_law, low, high, 1e-2, -1.5) for low, high in pairwise(edges)], axis=-1)
+    data = SpectralData(edges[:-1], edges[1:], flux[None, :], errors=0.01 * flux[None, :])
+    result = fit_spectra(data, 'power_law', fixed={'index': -1.5}, max_workers=1, seed=0)
+    assert result.dof == 1
+    np.testing.assert_allclose(result.param('amplitude'), 1e-2, rtol=1e-3)
+    with pytest.raises(ValueError, match='Underdetermined'):
+        fit_spectra(data, 'power_law', max_workers=1)
@@ -0,0 +1,117 @@
+"""Testing src/gamma_burst/hardness.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import LightCurve
+from gamma_burst.eumerations import HardnessMethod, ObservationMode
+from gamma_burst.fitting import BAND_ENERGIES
+from gamma_burst.hardness import hardness_ratio, hardness_ratios, photon_index_hardness_ratio
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.spectral_models import band_ratio
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+def make_band(rate: np.ndarray, error: np.ndarray) -> LightCurve:
+    """BAT band light curve of rates and symmetric errors over unit bins."""
+    time = np.arange(len(rate)) + 0.5
+    half_width = np.full(len(rate), 0.5)
+    return LightCurve(time, time_pos=half_width, time_neg=-half_width, rate=rate, rate_pos=error, rate_neg=-error)
+
+
+def test_hardness_ratio() -> None:
+    """Test both definitions and their propagated errors."""
+    soft, hard = np.array([2.0, 0.0]), np.array([4.0, 1.0])
+    ratio, error = hardness_ratio(soft, hard, np.array([0.2, 0.1]), np.array([0.4, 0.1]))
+    assert ratio[0] == pytest.approx(2.0) and error[0] == pytest.approx(2 * np.sqrt(0.02))
+    assert np.isnan(ratio[1]) and np.isnan(error[1])
+    ratio, error = hardness_ratio(2.0, 4.0, 0.2, 0.4, HardnessMethod.Normalised)
+    assert ratio == pytest.approx(1 / 3) and error == pytest.approx(2 * np.sqrt(1.28) / 36)
+
+    rng = np.random.default_rng(0)
+    samples = hardness_ratio(rng.normal(6.0, 0.05, 2000), rng.normal(9.0, 0.05, 2000), 0.05, 0.05)[0]
+    assert np.std(samples) == pytest.approx(hardness_ratio(6.0, 9.0, 0.05, 0.05)[1], rel=0.1)
+
+
+def test_batches_and_grouping() -> None:
+    """Test that a batch matches single pairs and that grouped bins reach the SNR."""
+    rng = np.random.default_rng(1)
+    bands = {
+        name: (make_band(rng.uniform(1, 2, nb), np.ones(nb)), make_band(rng.uniform(1, 2, nb), np.ones(nb)))
+        for name, nb in (('WT', 50), ('PC', 80))
+    }
+    batch = hardness_ratios(bands, HardnessMethod.Normalised)
+    for name, pair in bands.items():
+        single = hardness_ratios({name: pair}, HardnessMethod.Normalised)[name]
+        np.testing.assert_array_equal(batch[name].rate, single.rate)
+        np.testing.assert_array_equal(batch[name].rate_pos, single.rate_pos)
+
+    grouped = hardness_ratios(bands, min_snr=5.0, time_scale=(0.0, 40.0))
+    soft, hard = bands['WT']
+    starts, stops = grouped['WT'].time + grouped['WT'].time_neg, grouped['WT'].time + grouped['WT'].time_pos
+    for start, stop in zip(starts, stops, strict=True):
+        inside = (soft.time > start) & (soft.time < stop)
+        total = np.sum(soft.rate[inside] + hard.rate[inside])
+        assert total / np.sqrt(2 * np.sum(inside)) >= 5.0
+    assert np.sum(grouped['WT'].width) == pytest.approx(40.0)
+
+    with pytest.raises(ValueError, match='share their time bins'):
+        hardness_ratios({'WT': (bands['WT'][0], bands['PC'][1])})
+
+
+def test_xrt_hardness_ratios(home: Path) -> None:
+    """Test the XRT ratios against the UKSSDC ones, and the plotted errors."""
+    light_curve = XRTLightCurve('GRB 101225A', client=SyntheticDataSource())
+    ratios = light_curve.hardness_ratios()
+    for mode, hr in ratios.items():
+        np.testing.assert_allclose(hr.rate, light_curve.lc_data[mode + 'HR_incbad']['HR'])
+    rebinned = light_curve.hardness_ratios([ObservationMode.PC_Mode], min_snr=50.0)[ObservationMode.PC_Mode]
+    assert len(rebinned) < len(ratios[ObservationMode.PC_Mode])
+    assert np.median(rebinned.error) < np.median(ratios[ObservationMode.PC_Mode].error)
+
+    ax = light_curve.plot_light_curve_HR(ObservationMode.WT_Mode, plot_error=True, ax=Figure().add_subplot())
+    np.testing.assert_allclose(ax.containers[0].lines[0].get_ydata(), light_curve.lc_data['WTHR_incbad']['HR'])
+    ax = light_curve.plot_light_curve_HR(
+        ObservationMode.PC_Mode, plot_error=True, min_snr=50.0, ax=Figure().add_subplot()
+    )
+    assert len(ax.containers[0].lines[0].get_ydata()) == len(rebinned)
+    with pytest.raises(ValueError, match='Mode should be'):
+        light_curve.hardness_ratios([ObservationMode.WT_Hard_Mode])
+
+
+def test_photon_index_hardness_ratio() -> None:
+    """Test that the errors are the ratios at the bounds of the photon index interval."""
+    soft_band, hard_band = BAND_ENERGIES['XRTBand'], BAND_ENERGIES['BATBand']
+    ratio, ratio_pos, ratio_neg = photon_index_hardness_ratio(
+        np.array([1.0, 2.0]), np.array([0.2, 0.1]), np.array([-0.1, -0.3]), soft_band, hard_band
+    )
+    np.testing.assert_allclose(ratio, band_ratio(np.array([1.0, 2.0]), soft_band, hard_band))
+    np.testing.assert_allclose(ratio + ratio_pos, band_ratio(np.array([0.9, 1.7]), soft_band, hard_band))
+    np.testing.assert_allclose(ratio + ratio_neg, band_ratio(np.array([1.2, 2.1]), soft_band, hard_band))
+    normalised = photon_index_hardness_ratio(2.0, 0.0, 0.0, soft_band, hard_band, method=HardnessMethod.Normalised)[0]
+    assert normalised == pytest.approx((ratio[1] - 1) / (ratio[1] + 1))
+
+
+def test_bat_hardness_ratios(home: Path) -> None:
+    """Test the BAT to XRT band ratio of several binnings, derived from their photon index."""
+    analyser = BurstAnalyser('GRB 101225A', client=SyntheticDataSource(duration=50.0))
+    ratios = analyser.hardness_ratios(['TimeBins_1s', 'SNR5'])
+    for binning, hr in ratios.items():
+        series = analyser.spectral_series(binning)
+        np.testing.assert_allclose(
+            hr.rate, 1 / band_ratio(series.gamma, BAND_ENERGIES['BATBand'], BAND_ENERGIES['XRTBand'])
+        )
+        expected = photon_index_hardness_ratio(
+            series.gamma, series.gamma_pos, series.gamma_neg, BAND_ENERGIES['XRTBand'], BAND_ENERGIES['BATBand']
+        )
+        np.testing.assert_allclose(hr.rate_pos, expected[1])
+        np.testing.assert_allclose(hr.rate_neg, expected[2])
+    assert len(ratios['SNR5']) < len(ratios['TimeBins_1s'])
+
+    grouped = analyser.hardness_ratios(['TimeBins_1s'], min_snr=20.0)['TimeBins_1s']
+    assert len(grouped) < len(ratios['TimeBins_1s'])
+    assert np.all(grouped.rate_pos > 0) and np.all(grouped.rate_neg < 0)
@@ -0,0 +1,114 @@
+"""Testing src/gamma_burst/joint_light_curve.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst.cache_manager import CacheManager
+from gamma_burst.containers import LightCurve
+from gamma_burst.eumerations import GridScale
+from gamma_burst.fitting import BAND_ENERGIES
+from gamma_burst.joint_light_curve import JointLightCurve, resample, time_grid
+from gamma_burst.spectral_models import band_ratio
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+def make_light_curve(time: np.ndarray, width: np.ndarray, rate: np.ndarray, error: np.ndarray) -> LightCurve:
+    """Light curve of symmetric time and rate errors."""
+    return LightCurve(time, time_pos=width / 2, time_neg=-width / 2, rate=rate, rate_pos=error, rate_neg=-error)
+
+
+def test_resample() -> None:
+    """Test that resampling keeps the fluence, averages errors and leaves gaps empty."""
+    rng = np.random.default_rng(0)
+    width = rng.uniform(0.5, 1.5, 100)
+    stops = np.cumsum(width)
+    light_curve = make_light_curve(stops - width / 2, width, rng.uniform(1, 2, 100), np.full(100, 0.1))
+    edges = np.linspace(0, stops[-1], 13)
+    rate, error, exposure = resample(light_curve, edges)
+    np.testing.assert_allclose(exposure, np.diff(edges))
+    np.testing.assert_allclose(np.sum(rate * exposure), np.sum(light_curve.rate * width))
+    assert np.all(error < 0.1)
+
+    constant = make_light_curve(np.arange(10) + 0.5, np.ones(10), np.full(10, 3.0), np.full(10, 0.4))
+    rate, error, exposure = resample(constant, np.array([0.0, 4.0, 8.0, 12.0, 16.0]))
+    np.testing.assert_allclose(rate[:3], 3.0)
+    np.testing.assert_allclose(error[:2], 0.2)
+    np.testing.assert_allclose(exposure, [4.0, 4.0, 2.0, 0.0])
+    assert np.isnan(rate[3]) and np.isnan(error[3])
+
+
+def test_grids_and_bands() -> None:
+    """Test the grid edges and the band conversions."""
+    np.testing.assert_allclose(time_grid(1.0, 1e4, 4), [1.0, 10.0, 100.0, 1e3, 1e4])
+    np.testing.assert_allclose(time_grid(-2.0, 2.0, 4, GridScale.Linear), [-2.0, -1.0, 0.0, 1.0, 2.0])
+    with pytest.raises(ValueError, match='positive start'):
+        time_grid(-1.0, 10.0, 4)
+    with pytest.raises(ValueError, match='after its start'):
+        time_grid(10.0, 1.0, 4, GridScale.Linear)
+    xrt_band, bat_band = BAND_ENERGIES['XRTBand'], BAND_ENERGIES['BATBand']
+    np.testing.assert_allclose(band_ratio(1.7, bat_band, bat_band), 1.0)
+    np.testing.assert_allclose(band_ratio(2.0, bat_band, xrt_band), np.log(10 / 0.3) / np.log(10))
+    round_trip = band_ratio([1.5, 2.5], xrt_band, bat_band) * band_ratio([1.5, 2.5], bat_band, xrt_band)
+    np.testing.assert_allclose(round_trip, 1.0)
+
+
+def test_joint_light_curve(home: Path) -> None:
+    """Test BAT and XRT fluxes on a common grid, converted with the XRT ECFs."""
+    source = SyntheticDataSource(duration=50.0)
+    joint = JointLightCurve('GRB 101225A', client=source)
+    series = joint.resample(nb_bins=40, scale=GridScale.Log, time_scale=(1.0, 1e6))
+    assert series is joint.resample(nb_bins=40, scale=GridScale.Log, time_scale=(1.0, 1e6))
+    assert len(series) == 40
+    np.testing.assert_allclose(series.time + series.time_pos, np.geomspace(1.0, 1e6, 41)[1:])
+    early, late = series.time < 50, series.time > 600
+    assert np.all(np.isfinite(series.bat_flux[early])) and np.all(np.isnan(series.bat_flux[late]))
+    assert np.all(np.isfinite(series.xrt_flux[late])) and np.all(series.xrt_exposure[series.time < 40] == 0)
+    both = np.isfinite(series.bat_flux) & np.isfinite(series.xrt_flux)
+    assert np.all(series.flux_error[both] <= np.minimum(series.bat_flux_error, series.xrt_flux_error)[both])
+    np.testing.assert_allclose(series.flux[late], series.xrt_flux[late])
+
+    interval = joint.xrt_spectra.s_data['interval0']
+    xrt = joint.resample(nb_bins=25, time_scale=(60.0, 1e6))
+    expected = interval['WT']['PowerLaw']['ObsFlux'] * 540 + interval['PC']['PowerLaw']['ObsFlux'] * (1e6 - 600)
+    np.testing.assert_allclose(np.nansum(xrt.xrt_flux * xrt.xrt_exposure), expected)
+    ecf, ecf_error = joint.xrt_ecf('WT')
+    assert ecf_error == pytest.approx(0.1 * ecf)
+
+    start, stop = joint.default_time_range('TimeBins_1s', GridScale.Log)
+    assert 0 < start < 1 and stop == pytest.approx(1e6)
+    assert len(joint.resample(nb_bins=10, scale=GridScale.Linear)) == 10
+
+
+def test_joint_light_curve_errors(home: Path) -> None:
+    """Test that the ECF error is systematic, not averaged down by resampling."""
+    joint = JointLightCurve('GRB 101225A', client=SyntheticDataSource(duration=50.0))
+    series = joint.resample(nb_bins=4, time_scale=(1e3, 1e6))
+    assert np.all(series.xrt_flux_error >= 0.1 * series.xrt_flux)
+
+    pc = joint.xrt_light_curve.light_curve('PC')
+    ecf, ecf_error = joint.xrt_ecf('PC')
+    flux, error, _ = resample(pc, time_grid(1e3, 1e6, 4), pc.rate * ecf, pc.error * ecf)
+    np.testing.assert_allclose(series.xrt_flux, flux)
+    np.testing.assert_allclose(series.xrt_flux_error, np.hypot(error, flux * ecf_error / ecf))
+
+
+def test_joint_light_curve_cache(home: Path) -> None:
+    """Test that resampled series are cached with the versions of their source products."""
+    source = SyntheticDataSource(duration=50.0)
+    cache = CacheManager()
+    series = JointLightCurve('GRB 101225A', client=source, cache=cache).resample(nb_bins=20, time_scale=(1.0, 1e6))
+    hits = cache.stats().hits
+    joint = JointLightCurve('GRB 101225A', client=source, cache=cache)
+    cached = joint.resample(nb_bins=20, time_scale=(1.0, 1e6))
+    assert cache.stats().hits == hits + 4
+    np.testing.assert_array_equal(cached.xrt_flux, series.xrt_flux)
+    np.testing.assert_array_equal(cached.time_neg, series.time_neg)
+
+    joint.xrt_light_curve.refresh()
+    misses = cache.stats().misses
+    joint.resample(nb_bins=20, time_scale=(1.0, 1e6))
+    assert cache.stats().misses == misses + 1
+    other = JointLightCurve('GRB 101225A', client=SyntheticDataSource(seed=1, duration=50.0), cache=cache)
+    assert other.source_entries()['spectra'] != joint.source_entries()['spectra']
@@ -0,0 +1,105 @@
+"""Testing src/gamma_burst/metrics.py functions."""
+
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import pytest
+from matplotlib.figure import Figure
+
+from gamma_burst import metrics
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.cache_manager import CacheManager
+from gamma_burst.eumerations import ObservationMode
+from gamma_burst.graph_recover import recover_rebinned_light_curves
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.metrics import MetricsRegistry
+from gamma_burst.rebin_scheduler import RebinScheduler
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> MetricsRegistry:
+    """Record the metrics in an enabled registry of the test only."""
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+def _value(report: dict, section: str, name: str, /, **labels: str) -> dict:
+    return next(entry for entry in report[section][name] if entry['labels'] == labels)
+
+
+def test_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a disabled registry records nothing."""
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    assert isinstance(metrics.timer('gamma_burst_fetch_seconds'), nullcontext)
+    metrics.increment('gamma_burst_cache_hits_total', product='spectra')
+    assert metrics.timed('gamma_burst_plot_seconds')(lambda x: 2 * x)(3) == 6
+    assert metrics.report() == {'counters': {}, 'histograms': {}}
+    assert metrics.to_prometheus() == '\n'
+    metrics.enable()
+    metrics.increment('gamma_burst_cache_hits_total', product='spectra')
+    metrics.disable()
+    assert registry.report()['counters']['gamma_burst_cache_hits_total'][0]['value'] == 1
+
+
+def test_exports(registry: MetricsRegistry) -> None:
+    """Test the Prometheus text and the JSON report."""
+    registry.increment('gamma_burst_cache_bytes_served_total', 100, product='spectra')
+    registry.increment('gamma_burst_cache_bytes_served_total', 50, product='spectra')
+    registry.observe('gamma_burst_fetch_seconds', 0.02, product='spectra')
+    registry.observe('gamma_burst_fetch_seconds', 2.0, product='spectra')
+    with registry.timer('gamma_burst_plot_seconds', function='plot "fft"'):
+        time.sleep(0.01)
+
+    report = registry.report()
+    assert _value(report, 'counters', 'gamma_burst_cache_bytes_served_total', product='spectra')['value'] == 150
+    fetch = _value(report, 'histograms', 'gamma_burst_fetch_seconds', product='spectra')
+    assert (fetch['count'], fetch['sum'], fetch['buckets']['0.05'], fetch['buckets']['5.0']) == (2, 2.02, 1, 2)
+    assert _value(report, 'histograms', 'gamma_burst_plot_seconds', function='plot "fft"')['sum'] >= 0.01
+
+    text = registry.to_prometheus()
+    assert '# TYPE gamma_burst_cache_bytes_served_total counter' in text
+    assert 'gamma_burst_cache_bytes_served_total{product="spectra"} 150.0' in text
+    assert 'gamma_burst_fetch_seconds_bucket{product="spectra",le="0.05"} 1' in text
+    assert 'gamma_burst_fetch_seconds_bucket{product="spectra",le="+Inf"} 2' in text
+    assert 'gamma_burst_fetch_seconds_count{product="spectra"} 2' in text
+    assert 'function="plot \\"fft\\""' in text
+    registry.reset()
+    assert registry.report() == {'counters': {}, 'histograms': {}}
+
+
+def test_hot_paths(home: Path, registry: MetricsRegistry) -> None:
+    """Test that fetches, cache accesses, conversions and plots are recorded."""
+    source = SyntheticDataSource(duration=50.0)
+    assert 'BAT' in BurstAnalyser('GRB 101225A', client=source).burst_analyser_data
+    analyser = BurstAnalyser('GRB 101225A', client=source)
+    analyser.plot_light_curve_binning('TimeBins_1s', ax=Figure().add_subplot())
+    XRTLightCurve('GRB 101225A', client=source).light_curve(ObservationMode.WT_Mode)
+
+    report = registry.report()
+    assert _value(report, 'histograms', 'gamma_burst_fetch_seconds', product='burst_analyser')['count'] == 1
+    assert _value(report, 'histograms', 'gamma_burst_cache_save_seconds', product='burst_analyser')['count'] == 1
+    assert _value(report, 'histograms', 'gamma_burst_cache_load_seconds', product='burst_analyser')['count'] == 1
+    assert _value(report, 'counters', 'gamma_burst_cache_misses_total', product='burst_analyser')['value'] == 1
+    assert _value(report, 'counters', 'gamma_burst_cache_hits_total', product='burst_analyser')['value'] == 1
+    assert _value(report, 'counters', 'gamma_burst_cache_bytes_served_total', product='burst_analyser')['value'] > 0
+    assert _value(report, 'histograms', 'gamma_burst_conversion_seconds', kind='light_curve')['count'] == 2
+    plot = _value(report, 'histograms', 'gamma_burst_plot_seconds', function='BurstAnalyser.plot_light_curve_binning')
+    assert plot['count'] == 1
+
+
+def test_rebin_waits(home: Path, registry: MetricsRegistry) -> None:
+    """Test that rebin jobs record their requests and their wait by final status."""
+    source = SyntheticDataSource(rebin_queue_time=0.02, rebin_run_time=0.02)
+    with RebinScheduler(source, min_interval=0.02, verbose=False) as scheduler:
+        recover_rebinned_light_curves(
+            'GRB 101225A', 10.0, 3.0, 0.3, 1.5, 1.5, 10.0, cache=CacheManager(home / 'cache'), scheduler=scheduler
+        )
+    report = registry.report()
+    wait = _value(report, 'histograms', 'gamma_burst_rebin_wait_seconds', status='Complete')
+    assert wait['count'] == 1 and wait['sum'] >= 0.04
+    assert _value(report, 'histograms', 'gamma_burst_rebin_call_seconds', call='checkRebinStatus')['count'] >= 2
+    assert _value(report, 'histograms', 'gamma_burst_rebin_call_seconds', call='getRebinnedLightCurve')['count'] == 1
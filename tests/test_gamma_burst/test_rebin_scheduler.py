@@ -0,0 +1,62 @@
+"""Testing src/gamma_burst/rebin_scheduler.py functions."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from gamma_burst.cache_manager import CacheManager
+from gamma_burst.graph_recover import recover_many_rebinned_light_curves
+from gamma_burst.rebin_scheduler import RebinRequest, RebinScheduler
+from tests.test_gamma_burst.data import StubSource
+
+# The synthetic rebinned light curves have ``200 / bin_size ** 0.25`` WT bins.
+BIN_SIZES = {1.0: 200, 16.0: 100, 81.0: 66, 256.0: 50, 625.0: 40, 1296.0: 33}
+
+
+def _request(bin_size: float) -> RebinRequest:
+    return RebinRequest('GRB 1', bin_size, 3.0, 0.3, 1.5, 1.5, 10.0)
+
+
+def test_concurrent_jobs() -> None:
+    """Test that jobs run concurrently up to the cap and resolve their futures."""
+    client = StubSource(rebin_run_time=0.03)
+    with RebinScheduler(client, max_concurrent=3, min_interval=0.01, max_interval=0.02, verbose=False) as scheduler:
+        futures = [scheduler.submit(_request(bin_size)) for bin_size in BIN_SIZES]
+        start = time.monotonic()
+        results = [future.result(timeout=5) for future in futures]
+    assert [len(result['WT']) for result in results] == list(BIN_SIZES.values())
+    assert client.max_open_jobs == 3
+    assert time.monotonic() - start < 1
+
+
+def test_failed_job() -> None:
+    """Test that a job in error fails its future."""
+    client = StubSource(rebin_failure_rate=1.0)
+    with (
+        RebinScheduler(client, min_interval=0.01, verbose=False) as scheduler,
+        pytest.raises(ValueError, match='Failed'),
+    ):
+        scheduler.submit(_request(3)).result(timeout=5)
+
+
+def test_submit_async() -> None:
+    """Test awaiting a rebin request."""
+    with RebinScheduler(StubSource(), min_interval=0.01, verbose=False) as scheduler:
+        result = asyncio.run(scheduler.submit_async(_request(16.0)))
+    assert len(result['WT']) == BIN_SIZES[16.0]
+
+
+def test_sweep_is_cached(tmp_path: Path) -> None:
+    """Test a parameter sweep through the cache."""
+    client = StubSource()
+    cache = CacheManager(tmp_path, max_bytes=None)
+    with RebinScheduler(client, min_interval=0.01, verbose=False) as scheduler:
+        requests = [_request(bin_size) for bin_size in (1.0, 16.0, 81.0)]
+        results = recover_many_rebinned_light_curves(requests, cache, scheduler)
+        assert [len(result['WT']) for result in results] == [200, 100, 66]
+        again = recover_many_rebinned_light_curves(requests, cache, scheduler, max_workers=1)
+        assert [len(result['WT']) for result in again] == [200, 100, 66]
+    assert client.calls['rebinLightCurve'] == 3
+    assert cache.stats().hits == 3
@@ -0,0 +1,71 @@
+"""Testing src/gamma_burst/rebinning.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import LightCurve
+from gamma_burst.eumerations import RebinMethod
+from gamma_burst.rebinning import rebin
+from tests.test_gamma_burst.data import make_burst_analyser_data
+
+
+def make_light_curve(rate: np.ndarray, error: np.ndarray, bin_size: float = 0.064) -> LightCurve:
+    """Light curve of contiguous bins starting at 0."""
+    time = (np.arange(len(rate)) + 0.5) * bin_size
+    half_width = np.full(len(rate), bin_size / 2)
+    return LightCurve(time, time_pos=half_width, time_neg=-half_width, rate=rate, rate_pos=error, rate_neg=-error)
+
+
+def test_fixed_width() -> None:
+    """Test fixed-width rebinning against a direct computation."""
+    rng = np.random.default_rng(0)
+    rate = rng.normal(10, 1, 1000)
+    light_curve = make_light_curve(rate, np.ones(1000))
+    rebinned = rebin(light_curve, RebinMethod.Fixed, bin_size=1.024)
+    assert len(rebinned) == 63
+    np.testing.assert_allclose(rebinned.rate, [*rate[:992].reshape(62, 16).mean(axis=1), rate[992:].mean()])
+    np.testing.assert_allclose(rebinned.error[:-1], 0.25)
+    np.testing.assert_allclose(rebinned.width[:-1], 1.024)
+    np.testing.assert_allclose(np.sum(rebinned.rate * rebinned.width), np.sum(rate * 0.064))
+    with pytest.raises(ValueError, match='bin size'):
+        rebin(light_curve, RebinMethod.Fixed)
+
+
+def test_min_snr() -> None:
+    """Test that every bin reaches the minimum SNR and that the fluence is kept."""
+    rng = np.random.default_rng(1)
+    rate = rng.normal(1, 1, 2000)
+    light_curve = make_light_curve(rate, np.ones(2000))
+    rebinned = rebin(light_curve, RebinMethod.Min_SNR, min_snr=5)
+    assert np.all(rebinned.rate / rebinned.error >= 5)
+    np.testing.assert_allclose(np.sum(rebinned.rate * rebinned.width), np.sum(rate * 0.064))
+    assert len(rebin(light_curve, RebinMethod.Min_SNR, min_snr=1e3)) == 1
+
+
+def test_bayesian_blocks() -> None:
+    """Test that Bayesian Blocks find the change points of a step light curve."""
+    rng = np.random.default_rng(2)
+    truth = np.repeat([1.0, 5.0, 2.0], [300, 100, 200])
+    light_curve = make_light_curve(truth + rng.normal(0, 0.5, 600), np.full(600, 0.5))
+    rebinned = rebin(light_curve, RebinMethod.Bayesian_Blocks)
+    assert len(rebinned) == 3
+    edges = rebinned.time + rebinned.time_pos
+    np.testing.assert_allclose(edges, [300 * 0.064, 400 * 0.064, 600 * 0.064], atol=3 * 0.064)
+    np.testing.assert_allclose(rebinned.rate, [1.0, 5.0, 2.0], atol=0.15)
+    flat = make_light_curve(rng.normal(1, 0.5, 600), np.full(600, 0.5))
+    assert len(rebin(flat, RebinMethod.Bayesian_Blocks)) == 1
+
+
+def test_burst_analyser_rebin(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test local rebinning of the finest burst analyser binning."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    fine = analyser.light_curve('TimeBins_64ms')
+    rebinned = analyser.rebin_light_curve(RebinMethod.Fixed, bin_size=1.024, time_scale=(0.0, 6.0))
+    assert len(rebinned) == 6
+    np.testing.assert_allclose(rebinned.count_rate[0], fine.count_rate[:16].mean())
+    assert len(analyser.rebin_light_curve(RebinMethod.Bayesian_Blocks)) > 1
@@ -0,0 +1,46 @@
+"""Testing src/gamma_burst/rendering.py functions."""
+
+from pathlib import Path
+
+import pytest
+from matplotlib.figure import Figure
+
+from gamma_burst.rendering import render_grb, render_many
+from tests.test_gamma_burst.data import StubSource
+
+
+def test_render_grb(home: Path) -> None:
+    """Test rendering on a reused figure, failures being reported per plot."""
+    figure = Figure()
+    results = render_grb(
+        'GRB 101225A',
+        ['bat_snr_lc', 'bat_hr', 'bat_cumulated_flux', 'xrt_wt_lc'],
+        home / 'plots',
+        formats=('png', 'svg'),
+        figure=figure,
+        client=StubSource(xrt=False),
+    )
+    assert [result.success for result in results] == [True, True, True, False]
+    assert 'No XRT data' in results[-1].error
+    assert sorted(path.name for path in (home / 'plots').iterdir()) == [
+        f'GRB_101225A_{plot_type}.{file_format}'
+        for plot_type in ('bat_cumulated_flux', 'bat_hr', 'bat_snr_lc')
+        for file_format in ('png', 'svg')
+    ]
+    assert figure.axes == []
+
+
+def test_render_many(home: Path) -> None:
+    """Test batch rendering across worker processes."""
+    grb_names = [f'GRB {idx}' for idx in range(3)]
+    report = render_many(grb_names, ['bat_binning_lc', 'bat_gamma'], home, max_workers=2, client=StubSource(xrt=False))
+    assert len(report.succeeded) == 6
+    assert all(path.stat().st_size > 0 for result in report.results for path in result.paths)
+
+
+def test_unknown_plot_type(home: Path) -> None:
+    """Test argument validation."""
+    with pytest.raises(ValueError, match='Unknown plot types'):
+        render_grb('GRB 101225A', ['bat_nothing'], home)
+    with pytest.raises(ValueError, match='Unsupported formats'):
+        render_grb('GRB 101225A', ['bat_hr'], home, formats=('bmp',))
@@ -0,0 +1,105 @@
+"""Testing src/gamma_burst/shared_dataset.py functions."""
+
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.containers import LightCurve, SpectralSeries
+from gamma_burst.duration import compute_duration
+from gamma_burst.eumerations import SharedBackend
+from gamma_burst.shared_dataset import SharedDataset, burst_entries, map_shared
+from gamma_burst.synthetic_source import SyntheticDataSource
+from tests.test_gamma_burst.data import make_bat_band
+
+
+def t90(light_curve: LightCurve) -> float:
+    """T90 of a light curve."""
+    return float(compute_duration(light_curve.time, light_curve.rate, widths=light_curve.width).t90)
+
+
+@pytest.mark.parametrize('backend', list(SharedBackend))
+def test_publish_and_attach(backend: SharedBackend, tmp_path: Path) -> None:
+    """Test that attached entries are read-only views equal to the published series."""
+    table = make_bat_band(500)
+    light_curve = LightCurve.from_bat_band(table, ecf=2.0)
+    spectral_series = SpectralSeries.from_table(table, np.float32)
+    entries = {'lc': light_curve, 'spectral': spectral_series, 'counts': np.arange(12).reshape(3, 4)}
+
+    with SharedDataset.publish(entries, backend, directory=tmp_path) as published:
+        assert sorted(published) == ['counts', 'lc', 'spectral']
+        assert published.nbytes >= light_curve.nbytes + spectral_series.nbytes
+        with SharedDataset.attach(published.handle) as attached:
+            shared = attached['lc']
+            assert isinstance(shared, LightCurve) and shared.ecf == 2.0
+            np.testing.assert_array_equal(shared.rate, light_curve.rate)
+            np.testing.assert_array_equal(shared.count_rate, light_curve.count_rate)
+            assert not shared.rate.flags.writeable and not np.shares_memory(shared.rate, light_curve.rate)
+            with pytest.raises(ValueError, match='read-only'):
+                shared.rate[0] = 0.0
+            assert attached['spectral'].dtype == np.float32 and attached['spectral'].time.dtype == np.float64
+            np.testing.assert_array_equal(attached['spectral'].gamma, spectral_series.gamma)
+            np.testing.assert_array_equal(attached['counts'], entries['counts'])
+            assert attached['lc'] is shared
+            del shared
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('backend', list(SharedBackend))
+def test_lifecycle(backend: SharedBackend, tmp_path: Path) -> None:
+    """Test that the owner removes the block and that referenced views prevent closing."""
+    light_curve = LightCurve.from_bat_band(make_bat_band(100))
+    published = SharedDataset.publish({'lc': light_curve}, backend, tmp_path)
+    attached = SharedDataset.attach(published.handle)
+    rate = attached['lc'].rate[10:]
+    with pytest.raises(ValueError, match='still referenced'):
+        attached.close()
+    assert attached.closed
+    np.testing.assert_array_equal(rate, light_curve.rate[10:])
+    del rate
+    attached.close()
+    attached.close()
+    assert attached.closed
+    with pytest.raises(ValueError, match='closed'):
+        attached['lc']
+
+    published.close()
+    with pytest.raises(FileNotFoundError):
+        SharedDataset.attach(published.handle)
+    with pytest.raises(ValueError, match='Cannot share'):
+        SharedDataset.publish({'table': make_bat_band(10)}, SharedBackend.MemoryMap, tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_concurrent_attach() -> None:
+    """Test that threads attaching at once restore the resource tracker."""
+    register = resource_tracker.register
+    with SharedDataset.publish({'counts': np.arange(10)}) as published:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            datasets = list(executor.map(lambda _: SharedDataset.attach(published.handle), range(64)))
+        assert resource_tracker.register is register
+        for dataset in datasets:
+            np.testing.assert_array_equal(dataset['counts'], np.arange(10))
+            dataset.close()
+
+
+def test_map_shared(home: Path) -> None:
+    """Test durations computed by workers attached to the light curves of a burst."""
+    analyser = BurstAnalyser('GRB 101225A', client=SyntheticDataSource(duration=30.0))
+    entries = burst_entries(analyser, ['TimeBins_64ms', 'TimeBins_1s'])
+    assert set(entries) == {
+        f'GRB 101225A/{binning}/{kind}'
+        for binning in ('TimeBins_64ms', 'TimeBins_1s')
+        for kind in ('light_curve', 'spectral_series')
+    }
+    with SharedDataset.publish(entries) as dataset:
+        keys = [key for key in dataset if key.endswith('light_curve')]
+        results = map_shared(t90, dataset, keys, max_workers=2)
+        assert results == {key: pytest.approx(t90(entries[key])) for key in keys}
+        with SharedDataset.attach(dataset.handle) as attached:
+            assert len(attached[keys[0]]) == len(entries[keys[0]])
+        with pytest.raises(ValueError, match='Unknown shared entries'):
+            map_shared(t90, dataset, ['GRB 101225A/SNR4/light_curve'])
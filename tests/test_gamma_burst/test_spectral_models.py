@@ -0,0 +1,64 @@
+"""Testing src/gamma_burst/spectral_models.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.spectral_models import (
+    band,
+    blackbody,
+    cutoff_power_law,
+    energy_grid,
+    integrated_flux,
+    power_law,
+)
+from tests.test_gamma_burst.data import make_burst_analyser_data
+
+
+def test_broadcast_over_parameter_sets() -> None:
+    """Test that models evaluate every parameter set on the energy grid in one call."""
+    energy = energy_grid(1, 1e4, 50)
+    amplitude = np.array([1.0, 2.0, 3.0])
+    alpha = np.array([-1.0, -1.5, -0.5])
+    spectra = cutoff_power_law(energy, amplitude, alpha, 300.0)
+    assert spectra.shape == (3, 50)
+    np.testing.assert_allclose(spectra[1], 2.0 * (energy / 50) ** -1.5 * np.exp(-energy * 0.5 / 300))
+    assert power_law(energy, 1.0, -2.0).shape == (50,)
+    assert blackbody(energy, np.ones((2, 4)), np.full((2, 4), 5.0)).shape == (2, 4, 50)
+    with pytest.raises(ValueError, match='0 < e_min'):
+        energy_grid(0, 1e4)
+
+
+def test_band_continuity_and_peak() -> None:
+    """Test that the Band function is continuous at its break and E**2 N(E) peaks at Epeak."""
+    alpha, beta, epeak = -1.0, -2.5, 300.0
+    e_break = (alpha - beta) * epeak / (2 + alpha)
+    below, above = band(np.array([e_break * (1 - 1e-9), e_break]), 1.0, alpha, beta, epeak)
+    assert below == pytest.approx(above, rel=1e-6)
+    energy = energy_grid(10, 1e4, 2000)
+    assert energy[np.argmax(energy**2 * band(energy, 1.0, alpha, beta, epeak))] == pytest.approx(epeak, rel=0.01)
+
+
+def test_integrated_flux() -> None:
+    """Test analytic and quadrature integrals against each other."""
+    index = np.array([-2.0, -1.0, -1.5])
+    analytic = integrated_flux(power_law, 15, 150, 1.0, index)
+    quadrature = integrated_flux(cutoff_power_law, 15, 150, 1.0, index, np.inf, nb_points=4096)
+    np.testing.assert_allclose(analytic, quadrature, rtol=1e-5)
+    assert analytic[1] == pytest.approx(50 * np.log(10))
+    energy_flux = integrated_flux(power_law, 15, 150, 1.0, -2.0, energy_flux=True)
+    assert energy_flux == pytest.approx(2500 * np.log(10))
+
+
+def test_burst_analyser_spectra(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the spectra of every bin of a binning."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    energy = energy_grid(15, 150, 20)
+    spectra = analyser.compute_spectra('SNR4', energy)
+    table = analyser.burst_analyser_data['BAT']['SNR4']['BATBand']
+    assert spectra.shape == (len(table), 20)
+    np.testing.assert_allclose(spectra[:, 0], table['Flux'] / table['ECF'] * 0.3 ** -1.5)
@@ -0,0 +1,79 @@
+"""Testing src/gamma_burst/synthetic_source.py functions."""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.cache_manager import CacheManager
+from gamma_burst.eumerations import ObservationMode, ProductType
+from gamma_burst.fetcher import fetch_many
+from gamma_burst.graph_recover import recover_rebinned_light_curves
+from gamma_burst.light_curve import XRTLightCurve
+from gamma_burst.rebin_scheduler import RebinScheduler
+from gamma_burst.spectra import XRTSpectra
+from gamma_burst.synthetic_source import SyntheticDataSource
+
+
+def test_synthetic_products(home: Path) -> None:
+    """Test that synthetic products go through every product class, identically for a GRB."""
+    source = SyntheticDataSource(duration=50.0)
+    analyser = BurstAnalyser('GRB 101225A', client=source)
+    assert {'TimeBins_64ms', 'TimeBins_1s'} <= set(analyser.available_binning_data)
+    assert {'SNR4', 'SNR7'} <= set(analyser.available_SNR_data)
+    result = analyser.compute_duration('TimeBins_64ms')
+    assert 0 < result.t50 < result.t90
+    snr = analyser.light_curve('SNR4')
+    assert np.median(snr.rate / snr.error) > 3
+
+    light_curve = XRTLightCurve('GRB 101225A', client=source)
+    assert light_curve.light_curve(ObservationMode.PC_Mode).time[0] >= 600
+    spectra = XRTSpectra('GRB 101225A', client=source)
+    assert spectra.compute_error_band(ObservationMode.WT_Mode, np.array([1.0]), seed=0).median.shape == (1,)
+
+    again = SyntheticDataSource(duration=50.0).getBurstAnalyser(GRBName='GRB 101225A')
+    np.testing.assert_array_equal(again['BAT']['SNR4']['BATBand']['Flux'], analyser.light_curve('SNR4').rate)
+    assert source.calls == {'getBurstAnalyser': 1, 'getLightCurves': 1, 'getSpectra': 1}
+
+
+def test_rebin_job_statuses(home: Path) -> None:
+    """Test that rebin jobs are queued, run and complete or fail."""
+    source = SyntheticDataSource(rebin_queue_time=0.05, rebin_run_time=60.0)
+    job_id = source.rebinLightCurve(GRBName='GRB 101225A', pcMaxGap=10.0)
+    assert source.checkRebinStatus(job_id)['statusText'] == 'Queued'
+    assert source.getRebinnedLightCurve(job_id) is None
+    time.sleep(0.06)
+    assert source.checkRebinStatus(job_id)['statusText'] == 'Running'
+    source.cancelRebin(job_id)
+    assert source.checkRebinStatus(job_id)['statusText'] == 'Cancelled'
+
+    source = SyntheticDataSource(rebin_queue_time=0.02, rebin_run_time=0.02)
+    with RebinScheduler(source, min_interval=0.02, verbose=False) as scheduler:
+        lc_data = recover_rebinned_light_curves(
+            'GRB 101225A', 10.0, 3.0, 0.3, 1.5, 1.5, 10.0, cache=CacheManager(home / 'cache'), scheduler=scheduler
+        )
+        assert 'WT_incbad' in lc_data
+        failing = SyntheticDataSource(rebin_failure_rate=1.0)
+        with (
+            RebinScheduler(failing, min_interval=0.01, verbose=False) as failing_scheduler,
+            pytest.raises(ValueError, match='Failed'),
+        ):
+            recover_rebinned_light_curves(
+                'GRB 101225A', 5.0, 3.0, 0.3, 1.5, 1.5, 10.0,
+                cache=CacheManager(home / 'cache'), scheduler=failing_scheduler
+            )
+
+
+def test_latency_and_failures(home: Path) -> None:
+    """Test that injected latencies and failures reach the fetcher."""
+    source = SyntheticDataSource(latency=(0.01, 0.02), failure_rate=1.0)
+    report = fetch_many(
+        ['GRB A', 'GRB B'], [ProductType.Spectra], max_retries=1, backoff=0, client=source, progress=None
+    )
+    assert len(report.failed) == 2
+    assert source.calls['getSpectra'] == 4
+    assert report.duration >= 0.02
+    with pytest.raises(ValueError, match='between 0 and 1'):
+        SyntheticDataSource(failure_rate=2)
@@ -0,0 +1,54 @@
+"""Testing src/gamma_burst/time_index.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gamma_burst import data_source
+from gamma_burst.burst_analyser import BurstAnalyser
+from gamma_burst.time_index import TimeIndex
+from tests.test_gamma_burst.data import make_bat_band, make_burst_analyser_data
+
+
+def test_window_queries() -> None:
+    """Test that windows match boolean masks, including on unsorted tables."""
+    table = make_bat_band(1000)
+    shuffled = table.sample(frac=1, random_state=0)
+    for index in (TimeIndex(table), TimeIndex(shuffled)):
+        for time_scale in [(1.0, 2.0), (-5.0, 0.2), (63.9, 100.0), (3.0, 2.0)]:
+            mask = (table['Time'] >= time_scale[0]) & (table['Time'] <= time_scale[1])
+            pd.testing.assert_frame_equal(
+                index.window(time_scale).reset_index(drop=True), table.loc[mask].reset_index(drop=True)
+            )
+            np.testing.assert_array_equal(index.column('Flux', time_scale), table.loc[mask, 'Flux'])
+    flux = TimeIndex(table).column('Flux', (1.0, 2.0))
+    assert np.shares_memory(flux, TimeIndex(table).column('Flux'))
+
+
+def test_sliding_windows() -> None:
+    """Test sliding-window sums and means against direct computations."""
+    table = pd.DataFrame({'Time': np.arange(100.0), 'Rate': np.arange(100.0) ** 2})
+    index = TimeIndex(table)
+    starts, first, last = index.sliding_windows(width=10, step=5)
+    np.testing.assert_array_equal(starts, np.arange(0, 90, 5))
+    expected = [table['Rate'][(table['Time'] >= start) & (table['Time'] <= start + 10)].mean() for start in starts]
+    np.testing.assert_allclose(index.window_means('Rate', first, last), expected)
+    first, last = index.windows_bounds([200.0], [300.0])
+    assert np.isnan(index.window_means('Rate', first, last)).all()
+    with pytest.raises(ValueError, match='strictly positive'):
+        index.sliding_windows(width=0, step=1)
+
+
+def test_burst_analyser_windows(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the time indexes of the burst analyser are built once."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    time, count_rate = analyser.retrieve_time_and_count_rate('TimeBins_64ms', (1.0, 2.0))
+    assert time.min() >= 1.0 and time.max() <= 2.0
+    assert len(time) == len(count_rate) == 16
+    index = analyser.time_index('BAT', 'TimeBins_64ms', 'BATBand')
+    assert analyser.time_index('BAT', 'TimeBins_64ms', 'BATBand') is index
+    time, _ = analyser.retrieve_time_and_count_rate_no_evolution('TimeBins_1s', (2.0, 5.0))
+    np.testing.assert_array_equal(time, [2.0, 3.0, 4.0, 5.0])
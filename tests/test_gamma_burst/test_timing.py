@@ -0,0 +1,115 @@
+"""Testing src/gamma_burst/timing.py functions."""
+
+import time as timer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gamma_burst import data_source, timing
+from gamma_burst.burst_analyser import BurstAnalyser, calculate_fft
+from gamma_burst.eumerations import PSDNormalisation
+from gamma_burst.timing import lomb_scargle_power_spectrum, power_spectrum, rfft_power_spectrum
+from tests.test_gamma_burst.data import make_burst_analyser_data
+
+DT = 0.064
+
+
+def poisson_light_curves(nb_curves: int, nb_bins: int, rate: float = 100.0, seed: int = 0) -> np.ndarray:
+    """Count rates of pure Poisson noise light curves."""
+    rng = np.random.default_rng(seed)
+    return rng.poisson(rate * DT, (nb_curves, nb_bins)) / DT
+
+
+def test_leahy_noise_level() -> None:
+    """Test that Poisson noise has a Leahy power of 2, for every curve of a batch."""
+    rates = poisson_light_curves(5, 4096)
+    time = np.arange(4096) * DT
+    spectrum = power_spectrum(time, rates, segment_size=256)
+    assert spectrum.method == 'rfft'
+    assert spectrum.power.shape == (5, 128)
+    assert spectrum.nb_segments == 16
+    np.testing.assert_allclose(spectrum.power.mean(axis=-1), 2, rtol=0.1)
+    np.testing.assert_allclose(spectrum.frequency[[0, -1]], [1 / (256 * DT), 1 / (2 * DT)])
+
+    welch = power_spectrum(time, rates, segment_size=256, overlap=0.5, window='hann')
+    assert welch.nb_segments == 31
+    np.testing.assert_allclose(welch.power.mean(axis=-1), 2, rtol=0.1)
+
+
+def test_normalisations() -> None:
+    """Test the relations between the normalisations."""
+    rates = poisson_light_curves(1, 1024)[0]
+    time = np.arange(1024) * DT
+    leahy = power_spectrum(time, rates).power
+    rms = power_spectrum(time, rates, normalisation=PSDNormalisation.Rms).power
+    absolute = power_spectrum(time, rates, normalisation=PSDNormalisation.Absolute).power
+    np.testing.assert_allclose(rms, leahy / rates.mean())
+    np.testing.assert_allclose(absolute, leahy * rates.mean())
+
+
+def test_lomb_scargle_gapped() -> None:
+    """Test that gapped light curves use Lomb-Scargle, with the same noise level and a detected signal."""
+    time = np.arange(4096) * DT
+    kept = (time < 80) | (time > 120)
+    time = time[kept]
+    rates = poisson_light_curves(2, len(time))
+    rates[1] += 50 * np.sin(2 * np.pi * 1.5 * time)
+    spectrum = power_spectrum(time, rates)
+    assert spectrum.method == 'lomb_scargle'
+    assert np.median(spectrum.power[0]) == pytest.approx(2 * np.log(2), rel=0.15)
+    assert spectrum.frequency[np.argmax(spectrum.power[1])] == pytest.approx(1.5, abs=0.01)
+    with pytest.raises(ValueError, match='uniformly sampled'):
+        power_spectrum(time, rates, segment_size=128)
+
+
+def test_lomb_scargle_uniform() -> None:
+    """Test that the Lomb-Scargle power of a batch matches the FFT one below the Nyquist frequency of uniform data."""
+    rates = poisson_light_curves(3, 512)
+    time = np.arange(512) * DT
+    spectrum = lomb_scargle_power_spectrum(time, rates)
+    expected = rfft_power_spectrum(rates, DT)
+    np.testing.assert_allclose(spectrum.frequency, expected.frequency)
+    np.testing.assert_allclose(spectrum.power[:, :-1], expected.power[:, :-1])
+    np.testing.assert_allclose(lomb_scargle_power_spectrum(time, rates[1]).power, spectrum.power[1])
+
+
+def gapped_times(nb_bins: int) -> np.ndarray:
+    """Return the times of a 64 ms binning missing a tenth of its bins in the middle."""
+    time = np.arange(nb_bins + nb_bins // 9) * DT
+    return time[(time < 0.3 * time[-1]) | (time > 0.4 * time[-1])][:nb_bins]
+
+
+def test_fast_lomb_scargle(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the fast periodogram of long gapped light curves matches the exact one, in O(N log N)."""
+    time = gapped_times(4096)
+    rates = poisson_light_curves(2, len(time))
+    rates[1] += 50 * np.sin(2 * np.pi * 1.5 * time)
+    fast = lomb_scargle_power_spectrum(time, rates)
+    monkeypatch.setattr(timing, 'FAST_LOMB_SCARGLE_MIN_SIZE', np.inf)
+    exact = lomb_scargle_power_spectrum(time, rates)
+    np.testing.assert_allclose(fast.power, exact.power, atol=1e-3 * np.median(exact.power))
+    monkeypatch.undo()
+
+    time = gapped_times(1 << 16)
+    rates = poisson_light_curves(1, len(time))[0]
+    start = timer.perf_counter()
+    spectrum = power_spectrum(time, rates)
+    # the exact periodogram of these 65k bins takes minutes
+    assert timer.perf_counter() - start < 2.0
+    assert spectrum.method == 'lomb_scargle' and len(spectrum.frequency) == len(time) // 2
+    assert np.median(spectrum.power) == pytest.approx(2 * np.log(2), rel=0.05)
+
+
+def test_burst_analyser_power_spectrum(home: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test power spectra and FFT of the burst analyser light curves."""
+    monkeypatch.setattr(data_source.udg, 'getBurstAnalyser', lambda **kwargs: make_burst_analyser_data())
+    analyser = BurstAnalyser('GRB 101225A')
+    spectrum = analyser.compute_power_spectrum('TimeBins_64ms', segment_size=50)
+    assert spectrum.nb_segments == 4
+    np.testing.assert_allclose(spectrum.frequency[-1], 1 / (2 * 0.064))
+
+    time, count_rate = analyser.retrieve_time_and_count_rate('TimeBins_64ms')
+    frequencies, magnitude = calculate_fft(time, count_rate)
+    assert len(frequencies) == len(magnitude) == len(time) // 2 + 1
+    assert frequencies[-1] == pytest.approx(1 / (2 * 0.064))
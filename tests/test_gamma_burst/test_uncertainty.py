@@ -0,0 +1,48 @@
+"""Testing src/gamma_burst/uncertainty.py functions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from gamma_burst.eumerations import ObservationMode
+from gamma_burst.spectra import XRTSpectra
+from gamma_burst.spectral_models import energy_grid
+from gamma_burst.uncertainty import power_law_error_band, sample_split_normal
+from tests.test_gamma_burst.data import StubSource
+
+
+def test_split_normal() -> None:
+    """Test that each side of the split normal has its own width."""
+    rng = np.random.default_rng(0)
+    samples = sample_split_normal(np.array([1.0, 5.0]), [0.1, 1.0], [-0.3, -1.0], 200_000, rng)
+    assert samples.shape == (200_000, 2)
+    assert np.mean(samples[:, 0] > 1.0) == pytest.approx(0.25, abs=0.01)
+    above, below = samples[samples[:, 0] > 1.0, 0], samples[samples[:, 0] < 1.0, 0]
+    assert np.mean(above - 1.0) == pytest.approx(0.1 * np.sqrt(2 / np.pi), rel=0.02)
+    assert np.mean(1.0 - below) == pytest.approx(0.3 * np.sqrt(2 / np.pi), rel=0.02)
+    assert np.std(samples[:, 1]) == pytest.approx(1.0, abs=0.01)
+
+
+def test_power_law_error_band_chunked() -> None:
+    """Test that chunking the energies gives the same band, for a batch of bursts."""
+    energy = energy_grid(0.3, 10, 64)
+    args = (energy, [2.0, 1.5], 0.1, -0.1, [1e-10, 2e-10], 1e-11, -1e-11)
+    band = power_law_error_band(*args, nb_samples=500, seed=1)
+    chunked = power_law_error_band(*args, nb_samples=500, seed=1, max_chunk_elements=3000)
+    assert band.median.shape == (2, 64)
+    np.testing.assert_allclose(band.upper, chunked.upper)
+    assert np.all(band.lower < band.median) and np.all(band.median < band.upper)
+    assert band.median[0, 0] == pytest.approx(1e-10 * (0.3 / 50) ** -2, rel=0.05)
+
+
+def test_plot_spectra_error(home: Path) -> None:
+    """Test the error band of an XRT spectrum and its plot."""
+    spectra = XRTSpectra('GRB 101225A', client=StubSource())
+    energy = energy_grid(0.3, 10, 32)
+    band = spectra.compute_error_band(ObservationMode.WT_Mode, energy, nb_samples=2000, seed=0)
+    assert np.all(band.lower < band.upper)
+    ax = Figure().add_subplot()
+    spectra.plot_spectra(ObservationMode.WT_Mode, (0.3, 10), plot_error=True, nb_samples=200, ax=ax)
+    assert len(ax.collections) == 1